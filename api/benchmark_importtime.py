@@ -0,0 +1,109 @@
+"""
+서버 import 시간 벤치마크 (python -X importtime)
+
+main(uvicorn 워커) / vercel_main(serverless 콜드 스타트)을 새 프로세스에서 import 하며
+-X importtime 출력으로 누적 import 시간을 잰다. eager는 크롤러 모듈까지 모두
+import 한 경우(크롤러를 시작 시 생성하던 방식의 비용)다.
+
+main / vercel_main이 처음 쓸 때 import 해야 하는 무거운 모듈(DEFERRED_MODULES)을 시작 시
+import 하면 경고를 출력하고 종료 코드 1을 반환한다.
+
+    python benchmark_importtime.py [--repeat 5] [--top 10]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+CRAWLER_MODULES = [
+    'youtube_trends',
+    'youtube_realtime_crawler',
+    'youtube_shorts_crawler',
+    'youtube_api_crawler',
+    'youtube_ytdlp_crawler',
+]
+
+# 시작 시 import 하지 않아야 하는 모듈 (크롤러 의존성, 큰 스냅샷에서만 쓰는 numpy)
+DEFERRED_MODULES = ['selenium', 'webdriver_manager', 'googleapiclient', 'yt_dlp', 'numpy']
+LAZY_TARGETS = ['main', 'vercel_main']
+
+TARGETS = {
+    'main': ['main'],
+    'vercel_main': ['vercel_main'],
+    'eager': ['main'] + CRAWLER_MODULES,
+}
+
+
+def _importtime(modules: list) -> list:
+    """새 프로세스에서 import 하고 (깊이, 자체 us, 누적 us, 모듈) 리스트 반환"""
+    statement = 'import ' + ', '.join(modules) if modules else 'pass'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, cwd=Path(__file__).parent
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        fields = line[len('import time:'):].split('|')
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2]
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((depth, self_us, cumulative_us, name.strip()))
+    return entries
+
+
+def _without(entries: list, excluded: set) -> list:
+    """excluded에 있는 최상위 import와 그 하위 import 제거 (하위 import가 먼저 출력됨)"""
+    kept, pending = [], []
+    for entry in entries:
+        pending.append(entry)
+        if entry[0] == 0:
+            if entry[3] not in excluded:
+                kept.extend(pending)
+            pending = []
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'대상':<12} | {'import(ms)':>10} | {'모듈 수':>7}")
+    print('-' * 36)
+    # 인터프리터 시작 시 import 되는 모듈 (site, encodings 등)은 제외
+    startup = {entry[3] for entry in _importtime([]) if entry[0] == 0}
+    heaviest = {}
+    eager_imports = {}
+    for target, modules in TARGETS.items():
+        try:
+            runs = [_without(_importtime(modules), startup) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{target:<12} | {'실패':>10} | {e}")
+            continue
+        best = min(runs, key=lambda entries: sum(e[2] for e in entries if e[0] == 0))
+        total_us = sum(e[2] for e in best if e[0] == 0)
+        print(f"{target:<12} | {total_us / 1000:>10.1f} | {len(best):>7}")
+        heaviest[target] = sorted((e for e in best if e[0] <= 1), key=lambda e: -e[2])[:args.top]
+        if target in LAZY_TARGETS:
+            imported = {e[3].split('.')[0] for e in best}
+            eager_imports[target] = [module for module in DEFERRED_MODULES if module in imported]
+
+    for target, entries in heaviest.items():
+        print(f"\n[{target}] 누적 import 시간 상위 {len(entries)}개 (대상 모듈과 그 직접 import)")
+        for depth, _, cumulative_us, name in entries:
+            print(f"  {cumulative_us / 1000:>9.1f} ms  {'  ' * depth}{name}")
+
+    failed = False
+    for target, modules in eager_imports.items():
+        if modules:
+            failed = True
+            print(f"\n⚠️ {target}가 시작 시 지연 대상 모듈을 import 함: {', '.join(modules)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
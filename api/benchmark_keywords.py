@@ -0,0 +1,69 @@
+"""
+제목 키워드 추출 벤치마크 - 키워드별 re.search vs Aho-Corasick 오토마톤
+
+실제 크롤링 캐시(data/youtube_shorts_cache.json)의 제목으로 키워드 추출 비용을 잰다.
+    re.search      키워드마다 컴파일된 정규식(IGNORECASE)으로 검색 (기존 방식)
+    alternation    모든 패턴을 하나의 정규식으로 합쳐 findall (참고용)
+    automaton      KeywordMatcher (제목 한 번 훑기)
+automaton 결과가 re.search와 제목마다 같은지도 확인한다.
+
+    python benchmark_keywords.py [--repeat 20]
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from enrichment import KEYWORD_PATTERNS, KEYWORD_MATCHER
+
+SOURCE_CACHE = Path(__file__).parent / 'data' / 'youtube_shorts_cache.json'
+
+_SEARCH_RES = [(keyword, re.compile(pattern, re.IGNORECASE)) for keyword, pattern in KEYWORD_PATTERNS.items()]
+_ALTERNATION_RE = re.compile('|'.join(KEYWORD_PATTERNS.values()), re.IGNORECASE)
+
+
+def _search(title: str) -> list:
+    return [keyword for keyword, pattern in _SEARCH_RES if pattern.search(title)]
+
+
+def _alternation(title: str) -> list:
+    # 겹치는 키워드(루틴 → 자기계발/브이로그)를 구분하지 못하므로 시간 비교용
+    return _ALTERNATION_RE.findall(title)
+
+
+METHODS = {
+    're.search': _search,
+    'alternation': _alternation,
+    'automaton': KEYWORD_MATCHER.match,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(SOURCE_CACHE, 'r', encoding='utf-8') as f:
+        titles = [video.get('title', '') for video in json.load(f)['videos']]
+
+    mismatches = [title for title in titles if KEYWORD_MATCHER.match(title) != _search(title)]
+    print(f"제목 {len(titles)}개 (평균 {sum(map(len, titles)) / len(titles):.0f}자), "
+          f"automaton 결과 불일치 {len(mismatches)}개")
+    for title in mismatches[:5]:
+        print(f"  ❌ {title!r}: {_search(title)} != {KEYWORD_MATCHER.match(title)}")
+
+    print(f"\n{'방식':<12} | {'제목당(us)':>10} | {'전체(ms)':>9}")
+    print('-' * 38)
+    for name, method in METHODS.items():
+        best = float('inf')
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for title in titles:
+                method(title)
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:<12} | {best / len(titles) * 1e6:>10.2f} | {best * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
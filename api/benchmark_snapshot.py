@@ -0,0 +1,118 @@
+"""
+영상 캐시 로드 벤치마크 - JSON vs 바이너리 스냅샷(.vsnap)
+
+실제 크롤링 캐시(data/youtube_shorts_cache.json)의 영상을 video_id만 바꿔 복제해
+500 / 10k / 100k개 캐시를 만들고, 각 방식의 로드 시간과 RSS 증가량을 잰다.
+측정은 방식마다 새 프로세스에서 한다.
+
+    python benchmark_snapshot.py [--sizes 500,10000,100000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from video_store import VideoSnapshot, write_json_atomic
+from snapshot_file import read_snapshot_file
+
+SOURCE_CACHE = Path(__file__).parent / 'data' / 'youtube_shorts_cache.json'
+
+MODES = {
+    'json.load': '캐시 파일 json.load만 (기존 요청마다 하던 일)',
+    'json+index': 'json.load + VideoSnapshot 인덱스 빌드',
+    'vsnap+index': 'mmap 바이너리 스냅샷 + 열 배열에서 인덱스 빌드',
+}
+
+
+def _rss_kb() -> int:
+    """현재 RSS (KB)"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _child(mode: str, json_path: str, vsnap_path: str):
+    """한 방식으로 로드하고 (초, RSS 증가 KB) 출력"""
+    before = _rss_kb()
+    started = time.perf_counter()
+    if mode == 'json.load':
+        with open(json_path, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+    elif mode == 'json+index':
+        with open(json_path, 'r', encoding='utf-8') as f:
+            cache_data = json.load(f)
+        loaded = VideoSnapshot(cache_data['videos'])
+        loaded.top(set(loaded.positions_by_id.values()), 'trend_score', 20)
+    else:
+        loaded = VideoSnapshot.from_file(read_snapshot_file(vsnap_path))
+        loaded.top(set(loaded.positions_by_id.values()), 'trend_score', 20)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"seconds": elapsed, "rss_kb": _rss_kb() - before}))
+
+
+def _build_cache(size: int, directory: Path) -> tuple:
+    """실제 캐시 영상을 복제해 size개짜리 JSON과 .vsnap 생성"""
+    with open(SOURCE_CACHE, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    originals = source['videos']
+    videos = []
+    for i in range(size):
+        video = dict(originals[i % len(originals)])
+        video['video_id'] = f"{video.get('video_id')}_{i // len(originals)}"
+        videos.append(video)
+    cache_data = {
+        "last_updated": source.get('last_updated'),
+        "videos": videos,
+        "count": len(videos),
+        "source": source.get('source')
+    }
+    json_path = directory / f'cache_{size}.json'
+    vsnap_path = directory / f'cache_{size}.vsnap'
+    write_json_atomic(json_path, cache_data)
+    VideoSnapshot(videos).write_file(vsnap_path)
+    return json_path, vsnap_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='500,10000,100000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', nargs=3, metavar=('MODE', 'JSON', 'VSNAP'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print(f"{'영상 수':>8} | {'방식':<12} | {'로드(ms)':>9} | {'RSS 증가(MB)':>12} | {'파일(MB)':>8}")
+    print('-' * 62)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            json_path, vsnap_path = _build_cache(size, Path(tmp))
+            for mode in MODES:
+                runs = []
+                for _ in range(args.repeat):
+                    output = subprocess.run(
+                        [sys.executable, __file__, '--child', mode, str(json_path), str(vsnap_path)],
+                        capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+                    ).stdout
+                    runs.append(json.loads(output.strip().splitlines()[-1]))
+                best = min(runs, key=lambda run: run['seconds'])
+                file_size = os.path.getsize(vsnap_path if mode.startswith('vsnap') else json_path)
+                print(f"{size:>8} | {mode:<12} | {best['seconds'] * 1000:>9.1f} | "
+                      f"{best['rss_kb'] / 1024:>12.1f} | {file_size / 1024 / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
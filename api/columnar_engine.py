@@ -0,0 +1,176 @@
+"""
+NumPy 열 기반 필터/정렬 엔진 (선택 사항)
+스냅샷을 NumPy 배열로 들고 있으면서 필터는 불리언 마스크 연산, 상위 N개는
+argpartition으로 처리한다. 영상 dict는 반환할 페이지에 대해서만 꺼낸다.
+
+VideoSnapshot의 filter_positions / top / iter_sorted와 같은 결과를 돌려주므로 호출하는 쪽은
+columnar_for(snapshot) or snapshot 으로 엔진을 고르면 된다.
+
+numpy는 열 엔진을 처음 빌드할 때 import 한다 (작은 스냅샷만 다루는 워커와 서버리스 콜드
+스타트는 numpy import 비용을 내지 않음).
+
+VIDEO_ENGINE 환경 변수:
+    auto  (기본) numpy가 있고 영상이 COLUMNAR_MIN_VIDEOS개 이상이면 사용
+    numpy 항상 사용 (numpy가 없으면 인덱스 엔진)
+    index 사용하지 않음
+"""
+import importlib.util
+import os
+import threading
+import weakref
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterator, Optional
+
+# 설치 여부만 확인 (import는 _load_numpy에서)
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+np = None
+
+from video_store import VideoSnapshot, INDEXED_FIELDS, VIDEO_TYPE_ALIASES, TIME_FILTER_DAYS
+
+ENGINE = os.getenv('VIDEO_ENGINE', 'auto')
+
+# auto 모드에서 열 엔진을 쓰기 시작하는 영상 수 (작은 스냅샷은 집합 인덱스가 더 빠름)
+COLUMNAR_MIN_VIDEOS = int(os.getenv('COLUMNAR_MIN_VIDEOS', '2000'))
+
+if ENGINE == 'numpy' and not NUMPY_AVAILABLE:
+    print("⚠️ numpy가 설치되지 않아 열 엔진 대신 인덱스 엔진을 사용합니다")
+
+
+def _load_numpy():
+    """numpy를 처음 쓸 때 import"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+class ColumnarSnapshot:
+    """한 스냅샷의 열 배열 (스냅샷과 마찬가지로 빌드 후 변경하지 않음)"""
+
+    def __init__(self, snapshot: VideoSnapshot):
+        _load_numpy()
+        self.snapshot = snapshot
+        size = len(snapshot._records)
+
+        self.live = np.zeros(size, dtype=bool)
+        self.live[np.fromiter(snapshot._live, dtype=np.int64, count=len(snapshot._live))] = True
+
+        # 범주형 열: 값 → 코드, 위치별 코드 (-1은 빈 자리)
+        self.codes: Dict[str, Dict] = {}
+        self.columns: Dict[str, np.ndarray] = {}
+        for field in INDEXED_FIELDS:
+            codes = {}
+            column = np.full(size, -1, dtype=np.int32)
+            for code, (value, positions) in enumerate(snapshot.indexes[field].items()):
+                codes[value] = code
+                column[np.fromiter(positions, dtype=np.int64, count=len(positions))] = code
+            self.codes[field] = codes
+            self.columns[field] = column
+
+        self.views = np.fromiter((v or 0 for v in snapshot.view_counts), dtype=np.int64, count=size)
+        self.trend_scores = np.fromiter(
+            (s if s is not None else np.nan for s in snapshot.trend_scores), dtype=np.float64, count=size
+        )
+        self.seqs = np.fromiter((s or 0 for s in snapshot.seqs), dtype=np.int64, count=size)
+
+        epochs = np.fromiter(
+            (e if e is not None else np.nan for e in snapshot.crawled_epochs), dtype=np.float64, count=size
+        )
+        valid = ~np.isnan(epochs)
+        micros = np.zeros(size, dtype=np.int64)
+        micros[valid] = np.round(epochs[valid] * 1e6).astype(np.int64)
+        self.crawled_at = micros.view('datetime64[us]')
+        self.crawled_at[~valid] = np.datetime64('NaT', 'us')
+
+        # 정렬 키 (내림차순, 수집 시각이 없으면 맨 뒤)
+        self.sort_keys = {
+            'trend_score': self.trend_scores,
+            'views': self.views,
+            'crawled_at': np.where(valid, epochs, -np.inf),
+        }
+
+    def filter_positions(self, category: Optional[str] = None, region: Optional[str] = None,
+                         language: Optional[str] = None, min_trend_score: Optional[int] = None,
+                         video_type: Optional[str] = None, time_filter: Optional[str] = None) -> 'np.ndarray':
+        """필터 조건에 맞는 위치 배열 (오름차순)"""
+        mask = self.live.copy()
+        if video_type:
+            video_type = VIDEO_TYPE_ALIASES.get(video_type, video_type)
+        for field, value in (('category', category), ('region', region),
+                             ('language', language), ('video_type', video_type)):
+            if not value:
+                continue
+            code = self.codes[field].get(value.strip())
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.columns[field] == code
+        if min_trend_score:
+            mask &= self.trend_scores >= min_trend_score
+        if time_filter and time_filter in TIME_FILTER_DAYS:
+            cutoff = datetime.now() - timedelta(days=TIME_FILTER_DAYS[time_filter])
+            # crawled_at과 같은 기준(로컬 시각 epoch)으로 비교, NaT는 항상 False
+            mask &= self.crawled_at >= np.datetime64(int(round(cutoff.timestamp() * 1e6)), 'us')
+        return np.flatnonzero(mask)
+
+    def top(self, positions: 'np.ndarray', sort_by: str, limit: int) -> List[Dict]:
+        """위치 배열에서 정렬 기준 상위 limit개 (동점은 삽입 순서)"""
+        if limit <= 0 or len(positions) == 0:
+            return []
+        keys = self.sort_keys.get(sort_by)
+        if keys is None:
+            selected = positions[:limit]
+        else:
+            values = keys[positions]
+            if len(positions) > limit:
+                # 상위 limit번째 값 이상만 남김 (경계의 동점은 모두 포함해 순번으로 정렬)
+                boundary = values[np.argpartition(-values, limit - 1)[limit - 1]]
+                keep = values >= boundary
+                positions, values = positions[keep], values[keep]
+            order = np.lexsort((self.seqs[positions], -values))
+            selected = positions[order[:limit]]
+        records = self.snapshot._records
+        return [records[p] for p in selected.tolist()]
+
+    def iter_sorted(self, positions: 'np.ndarray', sort_by: str, after: Optional[int] = None,
+                    chunk_size: int = 256) -> Iterator[Dict]:
+        """위치 배열을 정렬 순서대로 하나씩 반환 (after 위치의 영상 다음부터, 동점은 삽입 순서)"""
+        if len(positions) == 0:
+            return
+        keys = self.sort_keys.get(sort_by)
+        if keys is None:
+            if after is not None:
+                positions = positions[positions > after]
+        else:
+            values = keys[positions]
+            seqs = self.seqs[positions]
+            if after is not None:
+                # 정렬 순서상 after 영상 뒤에 오는 항목만 남긴 뒤 정렬 (뒤 페이지일수록 정렬할 양이 적음)
+                after_value, after_seq = keys[after], self.seqs[after]
+                keep = (values < after_value) | ((values == after_value) & (seqs > after_seq))
+                positions, values, seqs = positions[keep], values[keep], seqs[keep]
+            positions = positions[np.lexsort((seqs, -values))]
+        records = self.snapshot._records
+        for start in range(0, len(positions), chunk_size):
+            for position in positions[start:start + chunk_size].tolist():
+                yield records[position]
+
+
+# 스냅샷 → 열 배열 (스냅샷이 교체되어 버려지면 함께 정리)
+_columnar: 'weakref.WeakKeyDictionary[VideoSnapshot, ColumnarSnapshot]' = weakref.WeakKeyDictionary()
+_columnar_lock = threading.Lock()
+
+
+def columnar_for(snapshot: Optional[VideoSnapshot]) -> Optional[ColumnarSnapshot]:
+    """스냅샷의 열 엔진 (스냅샷마다 한 번 빌드) - 쓰지 않는 경우 None"""
+    if snapshot is None or not NUMPY_AVAILABLE or ENGINE == 'index':
+        return None
+    if ENGINE != 'numpy' and len(snapshot) < COLUMNAR_MIN_VIDEOS:
+        return None
+    columnar = _columnar.get(snapshot)
+    if columnar is None:
+        with _columnar_lock:
+            columnar = _columnar.get(snapshot)
+            if columnar is None:
+                columnar = _columnar[snapshot] = ColumnarSnapshot(snapshot)
+    return columnar
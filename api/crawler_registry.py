@@ -0,0 +1,63 @@
+"""
+크롤러 레지스트리 (지연 생성)
+크롤러 모듈은 selenium / webdriver_manager / googleapiclient / yt_dlp 를 import
+하므로 서버 시작 시 모두 불러오면 캐시만 읽는 요청도 그 비용을 치러야 한다.
+이름 → (모듈, 클래스)만 등록해 두고, 처음 get() 할 때 import 하고 생성한다.
+"""
+import importlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class CrawlerRegistry:
+    """이름 → 크롤러 인스턴스 (처음 사용할 때 import + 생성, 스레드 안전)"""
+
+    def __init__(self):
+        self._factories: Dict[str, tuple] = {}
+        self._instances: Dict[str, Any] = {}
+        self._load_ms: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, module: str, class_name: str, **kwargs):
+        """크롤러 등록 (import 하지 않음)"""
+        self._factories[name] = (module, class_name, kwargs)
+
+    def get(self, name: str) -> Any:
+        """크롤러 인스턴스 (없으면 모듈을 import 해서 생성, 실패하면 예외 전파)"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                module, class_name, kwargs = self._factories[name]
+                started = time.perf_counter()
+                try:
+                    cls = getattr(importlib.import_module(module), class_name)
+                    instance = cls(**kwargs)
+                except Exception as e:
+                    self._errors[name] = f"{type(e).__name__}: {e}"
+                    print(f"❌ 크롤러 로드 실패 [{name}]: {e}")
+                    raise
+                self._load_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+                self._errors.pop(name, None)
+                self._instances[name] = instance
+                print(f"🧩 크롤러 로드 [{name}] {module}.{class_name} ({self._load_ms[name]}ms)")
+        return instance
+
+    def loaded(self, name: str) -> Optional[Any]:
+        """이미 생성된 인스턴스 (없으면 None, 생성하지 않음)"""
+        return self._instances.get(name)
+
+    def stats(self) -> Dict:
+        return {
+            name: {
+                "module": module,
+                "loaded": name in self._instances,
+                "load_ms": self._load_ms.get(name),
+                "error": self._errors.get(name),
+            }
+            for name, (module, _, _) in self._factories.items()
+        }
@@ -0,0 +1,391 @@
+"""
+영상 정보 가공 파이프라인 (모든 크롤러 공용)
+크롤러마다 따로 구현하던 키워드 추출 / 카테고리 추정 / 조회수 포맷 / 트렌드 점수 /
+이모지를 한 곳에 모았다. 각 크롤러는 원본 항목만 만들어 넘기고, 가공은
+
+    원본 → 정규화 → 키워드 추출 → 카테고리 분류 → 언어 감지 → 점수 계산
+
+순서로 여기서 한다. 정규식은 프로세스에서 한 번만 컴파일하며, 단계별 누적 시간은
+PIPELINE.stats() 로 확인할 수 있다.
+
+원본 항목 (dict):
+    title, video_id        필수 (없으면 None 반환)
+    view_count             조회수 정수, 없으면 views 텍스트 ("1.2M views", "조회수 1.2만회")
+    duration               초 또는 ISO 8601 ("PT1M30S"), 모르면 생략
+    is_shorts              duration을 모를 때의 쇼츠 여부 (/shorts/ 링크 등)
+    category               카테고리 지정 (카테고리 검색 결과)
+    category_id            YouTube 카테고리 ID (키워드로 분류되지 않을 때 사용)
+    extra                  결과에 그대로 덧붙일 필드 (channel 등)
+"""
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# 키워드 → 제목 패턴 (순서대로 검사)
+KEYWORD_PATTERNS = {
+    '부업': r'부업|사이드|n잡|투잡|side.*hustle',
+    '재테크': r'재테크|돈|수익|벌기|money|earn',
+    '투자': r'투자|주식|부동산|코인|stock|invest',
+    'AI': r'AI|ChatGPT|인공지능|artificial',
+    '개발': r'개발|코딩|프로그래밍|coding|programming|dev',
+    '마케팅': r'마케팅|SNS|인스타|틱톡|marketing|instagram|tiktok',
+    '창업': r'창업|사업|스타트업|business|startup|entrepreneur',
+    '자기계발': r'자기계발|루틴|습관|동기부여|motivation|routine|habit',
+    '요리': r'요리|레시피|먹방|음식|cook|recipe|food',
+    '게임': r'게임|롤|배그|game|gaming|lol',
+    '운동': r'운동|헬스|다이어트|workout|fitness|diet',
+    '공부': r'공부|학습|영어|study|learn|english',
+    '브이로그': r'브이로그|일상|루틴|vlog|daily',
+    '리뷰': r'리뷰|추천|비교|review|recommend',
+    '꿀팁': r'꿀팁|비법|방법|노하우|tip|trick|hack'
+}
+MAX_KEYWORDS = 10
+DEFAULT_KEYWORDS = ['트렌드']
+
+# 키워드 → 카테고리 (순서대로 검사)
+CATEGORY_RULES = [
+    (('부업', '창업'), '창업/부업'),
+    (('재테크', '투자'), '재테크/금융'),
+    (('AI', '개발'), '과학기술'),
+    (('마케팅',), '마케팅/비즈니스'),
+    (('자기계발',), '자기계발'),
+]
+DEFAULT_CATEGORY = '일반'
+
+# YouTube 카테고리 ID → 카테고리
+YOUTUBE_CATEGORIES = {
+    '1': '영화/애니메이션',
+    '2': '자동차/차량',
+    '10': '음악',
+    '15': '반려동물/동물',
+    '17': '스포츠',
+    '19': '여행/이벤트',
+    '20': '게임',
+    '22': '인물/블로그',
+    '23': '코미디',
+    '24': '엔터테인먼트',
+    '25': '뉴스/정치',
+    '26': '노하우/스타일',
+    '27': '교육',
+    '28': '과학기술',
+    '29': '비영리/사회운동'
+}
+
+CATEGORY_EMOJIS = {
+    '창업/부업': '💼', '재테크/금융': '💰', '과학기술': '🔬',
+    '자기계발': '💪', '마케팅/비즈니스': '📱', '게임': '🎮',
+    '요리/음식': '🍳', '교육': '📚', '음악': '🎵',
+    '영화/애니메이션': '🎬', '자동차/차량': '🚗',
+    '반려동물/동물': '🐾', '스포츠': '⚽', '여행/이벤트': '✈️',
+    '인물/블로그': '👤', '코미디': '😂', '엔터테인먼트': '🎭',
+    '뉴스/정치': '📰', '노하우/스타일': '💄', '비영리/사회운동': '🤝'
+}
+DEFAULT_EMOJI = '🎬'
+
+class KeywordMatcher:
+    """
+    키워드 → 패턴 표를 Aho-Corasick 오토마톤 하나로 컴파일
+    제목을 소문자로 한 번 훑어 모든 키워드를 찾는다 (키워드마다 re.search 하던 것과 결과 동일).
+    패턴은 리터럴의 | 조합만 지원하며, 'side.*hustle' 같은 '앞.*뒤' 형태는
+    앞/뒤 리터럴을 따로 찾아 앞이 먼저 끝났는지로 판정한다 (. 은 줄바꿈 제외).
+    """
+
+    _META = set('.^$*+?{}[]\\|()')
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.keywords = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._hits: List[frozenset] = [frozenset()]      # 상태 → 키워드 인덱스
+        self._gaps: List[tuple] = [()]                    # 상태 → ((패턴 번호, 앞 여부, 길이), ...)
+        self._gap_keywords: List[int] = []               # 패턴 번호 → 키워드 인덱스
+
+        for index, pattern in enumerate(patterns.values()):
+            for term in pattern.split('|'):
+                head, gap, tail = term.partition('.*')
+                if self._META & set(head + tail) or not head or (gap and not tail):
+                    raise ValueError(f"지원하지 않는 키워드 패턴: {term!r}")
+                if gap:
+                    number = len(self._gap_keywords)
+                    self._gap_keywords.append(index)
+                    self._add(head.lower(), gap=(number, True, len(head)))
+                    self._add(tail.lower(), gap=(number, False, len(tail)))
+                else:
+                    self._add(head.lower(), keyword=index)
+        self._link()
+
+    def _add(self, term: str, keyword: Optional[int] = None, gap: Optional[tuple] = None):
+        state = 0
+        for ch in term:
+            following = self._goto[state].get(ch)
+            if following is None:
+                following = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._hits.append(frozenset())
+                self._gaps.append(())
+                self._goto[state][ch] = following
+            state = following
+        if keyword is not None:
+            self._hits[state] = self._hits[state] | {keyword}
+        if gap is not None:
+            self._gaps[state] = self._gaps[state] + (gap,)
+
+    def _link(self):
+        """실패 링크 연결 (BFS), 실패 상태의 출력을 합쳐 둠"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[following] = target if target != following else 0
+                self._hits[following] = self._hits[following] | self._hits[self._fail[following]]
+                self._gaps[following] = self._gaps[following] + self._gaps[self._fail[following]]
+
+    def match(self, text: str) -> List[str]:
+        """text에 나오는 키워드 (표 순서)"""
+        goto, fail, hits_by_state, gaps_by_state = self._goto, self._fail, self._hits, self._gaps
+        found = set()
+        for line in text.lower().split('\n'):
+            state = 0
+            head_ends = {}
+            for position, ch in enumerate(line):
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+                hits = hits_by_state[state]
+                if hits:
+                    found |= hits
+                gaps = gaps_by_state[state]
+                if gaps:
+                    for number, is_head, length in gaps:
+                        if is_head:
+                            head_ends.setdefault(number, position)
+                        elif head_ends.get(number, position) < position - length + 1:
+                            found.add(self._gap_keywords[number])
+        return [self.keywords[index] for index in sorted(found)]
+
+
+# 프로세스에서 한 번만 컴파일
+KEYWORD_MATCHER = KeywordMatcher(KEYWORD_PATTERNS)
+_HASHTAG_RE = re.compile(r'#(\w+)')
+_HANGUL_RE = re.compile(r'[가-힣]')
+_AMOUNT_RE = re.compile(r'\d+만원|\d+억')
+_PERIOD_RE = re.compile(r'\d+개월|\d+일')
+_HOWTO_RE = re.compile(r'비법|꿀팁|방법')
+_VIEW_TEXT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(천|만|억|[KMB])?', re.IGNORECASE)
+_ISO_DURATION_RE = re.compile(r'P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?$')
+
+_VIEW_UNITS = {'천': 1_000, '만': 10_000, '억': 100_000_000, 'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+
+
+def parse_view_text(text) -> int:
+    """조회수 값/텍스트를 정수로 ("1.2M views", "조회수 1.2만회", "1,234 views", 정수)"""
+    if isinstance(text, (int, float)):
+        return int(text)
+    match = _VIEW_TEXT_RE.search(str(text or ''))
+    if not match:
+        return 0
+    number = float(match.group(1).replace(',', ''))
+    unit = match.group(2)
+    return int(number * _VIEW_UNITS[unit.lower()]) if unit else int(number)
+
+
+def parse_duration(value) -> Optional[float]:
+    """영상 길이 (초 또는 ISO 8601 "PT1M30S") → 초, 모르면 None"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = _ISO_DURATION_RE.match(str(value))
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def format_views(count: int) -> str:
+    """조회수 포맷"""
+    if count >= 1000000:
+        return f"{count/1000000:.1f}M"
+    elif count >= 1000:
+        return f"{count/1000:.0f}K"
+    return str(count)
+
+
+def engagement(view_count: int) -> str:
+    """참여도"""
+    if view_count >= 1000000:
+        return "매우높음"
+    elif view_count >= 100000:
+        return "높음"
+    return "보통"
+
+
+def trend_score(view_count: int) -> int:
+    """트렌드 점수"""
+    if view_count >= 5000000:
+        return 100
+    elif view_count >= 1000000:
+        return 95
+    elif view_count >= 500000:
+        return 90
+    elif view_count >= 100000:
+        return 85
+    return 70
+
+
+def extract_keywords(title: str) -> List[str]:
+    """제목에서 키워드 추출 (패턴 키워드 + 해시태그 3개까지)"""
+    keywords = KEYWORD_MATCHER.match(title)
+
+    for tag in _HASHTAG_RE.findall(title)[:3]:
+        if len(tag) > 2 and tag not in keywords:
+            keywords.append(tag)
+
+    return keywords[:MAX_KEYWORDS] if keywords else list(DEFAULT_KEYWORDS)
+
+
+def estimate_category(keywords: List[str], category_id: Optional[str] = None) -> str:
+    """키워드 → 카테고리 (해당 없으면 YouTube 카테고리 ID, 그것도 없으면 일반)"""
+    for rule_keywords, category in CATEGORY_RULES:
+        if any(keyword in keywords for keyword in rule_keywords):
+            return category
+    return YOUTUBE_CATEGORIES.get(str(category_id), DEFAULT_CATEGORY) if category_id else DEFAULT_CATEGORY
+
+
+def category_emoji(category: str) -> str:
+    """카테고리별 이모지"""
+    return CATEGORY_EMOJIS.get(category, DEFAULT_EMOJI)
+
+
+def detect_region_language(title: str) -> tuple:
+    """제목에 한글이 있으면 (국내, 한국어), 없으면 (해외, 영어)"""
+    if _HANGUL_RE.search(title):
+        return "국내", "한국어"
+    return "해외", "영어"
+
+
+def analyze_viral(title: str, view_count: int) -> str:
+    """바이럴 요소 분석"""
+    elements = []
+
+    if view_count >= 1000000:
+        elements.append("초고조회수")
+
+    if _AMOUNT_RE.search(title):
+        elements.append("구체적 금액")
+    if _PERIOD_RE.search(title):
+        elements.append("기간 명시")
+    if _HOWTO_RE.search(title):
+        elements.append("하우투")
+
+    return " + ".join(elements) if elements else "인기 급상승"
+
+
+class EnrichmentPipeline:
+    """원본 항목 → 영상 레코드 (단계별 누적 시간 집계, 스레드 안전)"""
+
+    STAGES = ('normalize', 'keywords', 'category', 'language', 'scoring')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stage_ns = dict.fromkeys(self.STAGES, 0)
+        self.records = 0
+        self.rejected = 0
+
+    def enrich(self, raw: Dict) -> Optional[Dict]:
+        """원본 항목 하나 가공 (title/video_id가 없으면 None)"""
+        clock = time.perf_counter_ns
+        t0 = clock()
+        title = (raw.get('title') or '').strip()
+        video_id = raw.get('video_id') or ''
+        if not title or not video_id:
+            with self._lock:
+                self.rejected += 1
+            return None
+        view_count = raw.get('view_count')
+        if view_count is None:
+            view_count = parse_view_text(raw.get('views'))
+        view_count = int(view_count or 0)
+        duration = parse_duration(raw.get('duration'))
+        is_shorts = bool(duration) and duration <= 60 if duration is not None else bool(raw.get('is_shorts'))
+
+        t1 = clock()
+        keywords = extract_keywords(title)
+
+        t2 = clock()
+        category = raw.get('category') or estimate_category(keywords, raw.get('category_id'))
+
+        t3 = clock()
+        region, language = detect_region_language(title)
+
+        t4 = clock()
+        record = {
+            "title": title,
+            "category": category,
+            "views": format_views(view_count),
+            "view_count": view_count,
+            "engagement": engagement(view_count),
+            "keywords": keywords,
+            "thumbnail": category_emoji(category),
+            "why_viral": analyze_viral(title, view_count),
+            "video_id": video_id,
+            "youtube_url": f"https://www.youtube.com/watch?v={video_id}",
+            "shorts_url": f"https://www.youtube.com/shorts/{video_id}",
+            "is_shorts": is_shorts,
+            "video_type": "쇼츠" if is_shorts else "롱폼",
+            "duration": duration,
+            "region": region,
+            "language": language,
+            "trend_score": trend_score(view_count),
+            "crawled_at": datetime.now().isoformat()
+        }
+        if raw.get('extra'):
+            record.update(raw['extra'])
+        t5 = clock()
+
+        with self._lock:
+            self.records += 1
+            stage_ns = self._stage_ns
+            stage_ns['normalize'] += t1 - t0
+            stage_ns['keywords'] += t2 - t1
+            stage_ns['category'] += t3 - t2
+            stage_ns['language'] += t4 - t3
+            stage_ns['scoring'] += t5 - t4
+        return record
+
+    def enrich_many(self, entries: Iterable[Dict]) -> Iterator[Dict]:
+        """원본 항목을 받는 대로 가공해 내보냄 (가공에 실패한 항목은 건너뜀)"""
+        for raw in entries:
+            record = self.enrich(raw)
+            if record is not None:
+                yield record
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total_ns = sum(self._stage_ns.values())
+            return {
+                "records": self.records,
+                "rejected": self.rejected,
+                "total_ms": round(total_ns / 1e6, 3),
+                "us_per_record": round(total_ns / 1e3 / self.records, 2) if self.records else 0.0,
+                "stages_ms": {stage: round(ns / 1e6, 3) for stage, ns in self._stage_ns.items()},
+            }
+
+
+# 프로세스 공용 파이프라인
+PIPELINE = EnrichmentPipeline()
+
+
+def enrich(raw: Dict) -> Optional[Dict]:
+    return PIPELINE.enrich(raw)
+
+
+def enrich_many(entries: Iterable[Dict]) -> Iterator[Dict]:
+    return PIPELINE.enrich_many(entries)
@@ -0,0 +1,181 @@
+"""
+필터 옵션 패싯 (값별 영상 수)
+스냅샷마다 한 번, (카테고리, 지역, 언어, 영상 타입, 기간 창) 조합별 영상 수를 세어 둔다.
+조합 수는 영상 수보다 훨씬 적으므로 필터 UI에 보여 줄 값별 개수와, 다른 필터를 건 상태의
+교차 개수(예: region=국내일 때 카테고리별 개수)를 요청마다 영상 목록을 훑지 않고 조합
+표에서 바로 합산한다. 같은 조건의 결과는 스냅샷이 바뀔 때까지 재사용한다.
+
+각 패싯의 개수는 그 패싯 자신의 조건만 빼고 나머지 조건을 모두 적용한 값이다
+(category=게임을 골라도 다른 카테고리의 개수가 0이 되지 않음).
+
+기간 창(today / week / month)은 패싯을 만든 시점 기준이다.
+"""
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FACET_FIELDS = ('category', 'region', 'language', 'video_type')
+
+# 영어 영상 타입 필터 → 저장된 한글 값
+VIDEO_TYPE_ALIASES = {'shorts': '쇼츠', 'long': '롱폼'}
+
+# 기간 창 (짧은 순) → 기준 일수
+TIME_WINDOWS = (('today', 1), ('week', 7), ('month', 30))
+OLDER = 'older'      # 30일보다 오래됨
+UNKNOWN = ''         # crawled_at 없음
+
+# 조건 조합별 결과 캐시 크기 (스냅샷마다)
+COUNTS_CACHE_SIZE = 256
+
+
+def _normalize(value) -> str:
+    if isinstance(value, str):
+        return value.strip()
+    return value if value is not None else ''
+
+
+def _crawled_epoch(value) -> Optional[float]:
+    """crawled_at ISO 문자열 → epoch 초 (timezone 정보는 버림, 기간 필터와 같은 기준)"""
+    if not value:
+        return None
+    try:
+        crawled_time = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if crawled_time.tzinfo is not None:
+            crawled_time = crawled_time.replace(tzinfo=None)
+        return crawled_time.timestamp()
+    except (ValueError, AttributeError, OSError):
+        return None
+
+
+def time_window(epoch: Optional[float], now: float) -> str:
+    """수집 시각(epoch 초)이 속한 가장 짧은 기간 창"""
+    if epoch is None:
+        return UNKNOWN
+    for window, days in TIME_WINDOWS:
+        if epoch >= now - days * 86400:
+            return window
+    return OLDER
+
+
+class FacetSummary:
+    """조합별 영상 수 표 (만든 뒤 변경하지 않음)"""
+
+    def __init__(self, rows: Iterable[tuple], now: Optional[float] = None):
+        """rows: 영상마다 (FACET_FIELDS 순서의 값..., 수집 시각 epoch 또는 None)"""
+        now = now if now is not None else time.time()
+        cells = Counter()
+        for row in rows:
+            cells[row[:-1] + (time_window(row[-1], now),)] += 1
+        self.cells: List[Tuple[tuple, int]] = list(cells.items())
+        self.total = sum(cells.values())
+        self.computed_at = now
+        self._counts: 'OrderedDict[tuple, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[Dict], now: Optional[float] = None) -> 'FacetSummary':
+        """영상 dict 목록에서 바로 만들기"""
+        return cls((
+            tuple(_normalize(video.get(field)) for field in FACET_FIELDS) + (_crawled_epoch(video.get('crawled_at')),)
+            for video in videos
+        ), now)
+
+    def values(self, field: str) -> List[str]:
+        """필드의 고유 값 (빈 값 제외, 정렬)"""
+        index = FACET_FIELDS.index(field)
+        return sorted({key[index] for key, _ in self.cells if key[index]})
+
+    def counts(self, category: Optional[str] = None, region: Optional[str] = None,
+               language: Optional[str] = None, video_type: Optional[str] = None,
+               time_filter: Optional[str] = None) -> Dict:
+        """조건을 건 상태의 패싯별 값 개수
+
+        Returns:
+            {"total": 조건을 모두 만족하는 영상 수,
+             "facets": {필드: [{"value", "count"}, ...] (개수 많은 순), "time_filter": [...]}}
+        """
+        if video_type:
+            video_type = VIDEO_TYPE_ALIASES.get(video_type, video_type)
+        selected = tuple(_normalize(value) if value else None
+                         for value in (category, region, language, video_type))
+        windows = _windows_for(time_filter)
+        cache_key = selected + (time_filter if windows is not None else None,)
+
+        with self._lock:
+            result = self._counts.get(cache_key)
+            if result is not None:
+                self._counts.move_to_end(cache_key)
+                return result
+
+        result = self._compute(selected, windows)
+        with self._lock:
+            self._counts[cache_key] = result
+            while len(self._counts) > COUNTS_CACHE_SIZE:
+                self._counts.popitem(last=False)
+        return result
+
+    def _compute(self, selected: tuple, windows: Optional[frozenset]) -> Dict:
+        time_index = len(FACET_FIELDS)
+        facet_counts = [Counter() for _ in FACET_FIELDS]
+        window_counts = Counter()
+        total = 0
+        for key, count in self.cells:
+            # 조건에 맞지 않는 필드 (둘 이상이면 어느 패싯에도 들어가지 않음)
+            missed = None
+            for index, value in enumerate(selected):
+                if value is not None and key[index] != value:
+                    if missed is not None:
+                        break
+                    missed = index
+            else:
+                if windows is not None and key[time_index] not in windows:
+                    if missed is not None:
+                        continue
+                    missed = time_index
+                if missed is None:
+                    total += count
+                for index in range(len(FACET_FIELDS)):
+                    if (missed is None or missed == index) and key[index]:
+                        facet_counts[index][key[index]] += count
+                if missed is None or missed == time_index:
+                    window_counts[key[time_index]] += count
+
+        facets = {
+            field: [{"value": value, "count": count} for value, count in counts.most_common()]
+            for field, counts in zip(FACET_FIELDS, facet_counts)
+        }
+        # 기간 창은 누적 (week에는 today 포함)
+        facets["time_filter"] = [
+            {"value": window, "count": sum(window_counts[name] for name in _windows_for(window))}
+            for window, _ in TIME_WINDOWS
+        ] + [{"value": "all", "count": sum(window_counts.values())}]
+        return {"total": total, "facets": facets}
+
+
+def _windows_for(time_filter: Optional[str]) -> Optional[frozenset]:
+    """기간 필터에 해당하는 기간 창 집합 (필터가 없거나 all이면 None)"""
+    names = [window for window, _ in TIME_WINDOWS]
+    if time_filter not in names:
+        return None
+    return frozenset(names[:names.index(time_filter) + 1])
+
+
+# 스냅샷 → 패싯 (스냅샷이 교체되어 버려지면 함께 정리)
+_summaries: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+_summaries_lock = threading.Lock()
+
+
+def facets_for(snapshot) -> Optional[FacetSummary]:
+    """스냅샷(.facet_rows()가 있는 객체)의 패싯 - 스냅샷마다 한 번 계산"""
+    if snapshot is None:
+        return None
+    summary = _summaries.get(snapshot)
+    if summary is None:
+        with _summaries_lock:
+            summary = _summaries.get(snapshot)
+            if summary is None:
+                summary = _summaries[snapshot] = FacetSummary(snapshot.facet_rows())
+    return summary
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict
 import json
 from datetime import datetime
+from video_repository import video_view_count
 
 app = FastAPI(
     title="Methodus Shorts Planner API",
@@ -194,21 +195,21 @@ async def get_youtube_trending(
         filtered_videos = SAMPLE_VIDEOS.copy()
         
         # 카테고리 필터
-            if category:
+        if category:
             filtered_videos = [v for v in filtered_videos if v.get('category') == category]
-    
-    # 언어 필터
-    if language:
+        
+        # 언어 필터
+        if language:
             filtered_videos = [v for v in filtered_videos if v.get('language') == language]
         
         # 영상 타입 필터
-    if video_type:
-        if video_type == 'shorts':
-            video_type_filter = '쇼츠'
-        elif video_type == 'long':
-            video_type_filter = '롱폼'
-        else:
-            video_type_filter = video_type
+        if video_type:
+            if video_type == 'shorts':
+                video_type_filter = '쇼츠'
+            elif video_type == 'long':
+                video_type_filter = '롱폼'
+            else:
+                video_type_filter = video_type
             filtered_videos = [v for v in filtered_videos if v.get('video_type') == video_type_filter]
         
         # 트렌드 점수 필터
@@ -216,20 +217,10 @@ async def get_youtube_trending(
             filtered_videos = [v for v in filtered_videos if v.get('trend_score', 0) >= min_trend_score]
         
         # 정렬
-    if sort_by == "trend_score":
+        if sort_by == "trend_score":
             filtered_videos.sort(key=lambda x: x.get('trend_score', 0), reverse=True)
-    elif sort_by == "views":
-        def parse_views(views_str):
-            if 'M' in views_str:
-                return float(views_str.replace('M', '')) * 1000000
-            elif 'K' in views_str:
-                return float(views_str.replace('K', '')) * 1000
-            else:
-                try:
-                    return float(views_str.replace(',', ''))
-                except:
-                    return 0
-            filtered_videos.sort(key=lambda x: parse_views(x.get('views', '0')), reverse=True)
+        elif sort_by == "views":
+            filtered_videos.sort(key=video_view_count, reverse=True)
         
         # 개수 제한
         final_videos = filtered_videos[:count]
@@ -248,24 +239,24 @@ async def get_youtube_trending(
 @app.get("/api/youtube/filter-options")
 async def get_filter_options():
     """사용 가능한 필터 옵션 제공"""
-        return {
-            "categories": [
+    return {
+        "categories": [
             "창업/부업", "재테크/금융", "과학기술", "자기계발", "마케팅/비즈니스",
             "요리/음식", "게임", "운동/건강", "교육/학습", "음악"
-            ],
-            "regions": ["국내", "해외"],
+        ],
+        "regions": ["국내", "해외"],
         "languages": ["한국어", "영어"],
-            "sort_options": [
-                {"value": "trend_score", "label": "트렌드 점수"},
-                {"value": "views", "label": "조회수"},
-                {"value": "crawled_at", "label": "최신순"}
-            ],
-            "trend_score_range": {
-                "min": 1,
-                "max": 100,
-                "default": 50
-            }
+        "sort_options": [
+            {"value": "trend_score", "label": "트렌드 점수"},
+            {"value": "views", "label": "조회수"},
+            {"value": "crawled_at", "label": "최신순"}
+        ],
+        "trend_score_range": {
+            "min": 1,
+            "max": 100,
+            "default": 50
         }
+    }
 
 # Vercel용 핸들러
 def handler(request):
@@ -0,0 +1,111 @@
+"""
+키워드 역색인
+키워드 → 영상 위치(posting), 카테고리별 키워드 빈도를 영상을 넣고 뺄 때마다 갱신해 둔다.
+카테고리 키워드 통계와 상위 K개는 요청마다 영상을 훑어 Counter를 만드는 대신 여기서 꺼낸다.
+
+VideoSnapshot이 값 인덱스와 함께 들고 있으며, 스냅샷과 마찬가지로 copy()한 사본만 수정한다
+(집합/빈도 표는 수정할 때만 복사).
+"""
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def video_keywords(video: Dict) -> List[str]:
+    """영상의 키워드 목록 (문자열만)"""
+    keywords = video.get('keywords') or []
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    return [keyword for keyword in keywords if isinstance(keyword, str)]
+
+
+class KeywordIndex:
+    """키워드 역색인과 카테고리별 키워드 빈도 (같은 영상에 두 번 나온 키워드는 두 번 셈)"""
+
+    def __init__(self):
+        # 키워드 → 영상 위치 집합
+        self.postings: Dict[str, Set[int]] = {}
+        # 카테고리 → 키워드 빈도
+        self.category_terms: Dict[str, Counter] = {}
+        # 전체 키워드 빈도
+        self.term_counts: Counter = Counter()
+        self._owned: Set[int] = set()
+        # 카테고리(None은 전체) → 빈도 내림차순 (키워드, 빈도) 목록
+        self._rankings: Dict[Optional[str], List[Tuple[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[int, str, List[str]]]) -> 'KeywordIndex':
+        """(위치, 카테고리, 키워드 목록)으로 새로 빌드"""
+        index = cls()
+        for position, category, keywords in entries:
+            index.add(position, category, keywords)
+        index._owned = set()
+        return index
+
+    def copy(self) -> 'KeywordIndex':
+        """수정용 사본 (컨테이너는 얕은 복사, 집합/빈도 표는 수정 시에만 복사)"""
+        new = KeywordIndex()
+        new.postings = dict(self.postings)
+        new.category_terms = dict(self.category_terms)
+        new.term_counts = Counter(self.term_counts)
+        return new
+
+    def add(self, position: int, category: str, keywords: List[str]):
+        if not keywords:
+            return
+        terms = self._owned_value(self.category_terms, category, Counter)
+        for keyword in keywords:
+            self._owned_value(self.postings, keyword, set).add(position)
+            terms[keyword] += 1
+            self.term_counts[keyword] += 1
+        self._rankings.clear()
+
+    def remove(self, position: int, category: str, keywords: List[str]):
+        if not keywords:
+            return
+        terms = self._owned_value(self.category_terms, category, Counter)
+        for keyword in keywords:
+            members = self._owned_value(self.postings, keyword, set)
+            members.discard(position)
+            if not members:
+                del self.postings[keyword]
+            _decrement(terms, keyword)
+            _decrement(self.term_counts, keyword)
+        if not terms:
+            del self.category_terms[category]
+        self._rankings.clear()
+
+    def positions(self, keyword: str) -> Set[int]:
+        """키워드가 달린 영상 위치"""
+        return self.postings.get(keyword, set())
+
+    def top(self, category: Optional[str] = None, k: Optional[int] = None) -> List[Tuple[str, int]]:
+        """빈도 상위 키워드 (category가 None이면 전체) - 순위는 인덱스마다 한 번 정렬해 둠"""
+        with self._lock:
+            ranking = self._rankings.get(category)
+            if ranking is None:
+                counts = self.term_counts if category is None else self.category_terms.get(category, Counter())
+                ranking = self._rankings[category] = counts.most_common()
+        return ranking[:k] if k is not None else ranking
+
+    def categories(self) -> List[str]:
+        """키워드가 있는 카테고리"""
+        return list(self.category_terms)
+
+    def _owned_value(self, mapping: Dict, key, factory):
+        """수정 가능한 집합/빈도 표 (다른 인덱스와 공유 중이면 복사)"""
+        value = mapping.get(key)
+        if value is None:
+            value = mapping[key] = factory()
+            self._owned.add(id(value))
+        elif id(value) not in self._owned:
+            value = mapping[key] = factory(value)
+            self._owned.add(id(value))
+        return value
+
+
+def _decrement(counts: Counter, keyword: str):
+    counts[keyword] -= 1
+    if counts[keyword] <= 0:
+        del counts[keyword]
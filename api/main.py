@@ -1,15 +1,21 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Collection, Iterator
 from shorts_planner import ShortsPlannerSystem
-from youtube_trends import YouTubeTrendsAnalyzer
-from youtube_realtime_crawler import YouTubeRealtimeCrawler
-from youtube_shorts_crawler import YouTubeShortsCrawler
-from youtube_api_crawler import YouTubeAPIShortsCrawler
-from youtube_ytdlp_crawler import YouTubeYTDLPCrawler
+from crawler_registry import CrawlerRegistry
+from enrichment import PIPELINE as enrichment_pipeline
+from video_store import VideoStore, VideoSnapshot, VIDEO_TYPE_ALIASES
+from video_repository import open_repository
+from columnar_engine import columnar_for
+from facets import facets_for
+from response_cache import ResponseCache, encode_json
+from fast_json import FastJSONResponse
+from pagination import CursorError, body_etag, decode_cursor, encode_cursor, etag_matches, query_digest
 import json
-from datetime import datetime, timedelta
+from itertools import islice
+from datetime import datetime
 from pathlib import Path
 import subprocess
 import threading
@@ -31,11 +37,23 @@ app.add_middleware(
 
 # 쇼츠 플래너 초기화
 planner = ShortsPlannerSystem()
-youtube_analyzer = YouTubeTrendsAnalyzer()
-realtime_crawler = YouTubeRealtimeCrawler()
-shorts_crawler = YouTubeShortsCrawler()
-api_crawler = YouTubeAPIShortsCrawler()  # YouTube Data API v3 크롤러
-ytdlp_crawler = YouTubeYTDLPCrawler()  # yt-dlp 크롤러 (실제 급상승 영상)
+
+# 크롤러는 처음 사용할 때 import + 생성 (캐시만 읽는 요청은 selenium/yt-dlp 등을 불러오지 않음)
+crawlers = CrawlerRegistry()
+crawlers.register('youtube_analyzer', 'youtube_trends', 'YouTubeTrendsAnalyzer')
+crawlers.register('realtime', 'youtube_realtime_crawler', 'YouTubeRealtimeCrawler')
+crawlers.register('shorts', 'youtube_shorts_crawler', 'YouTubeShortsCrawler')
+crawlers.register('api', 'youtube_api_crawler', 'YouTubeAPIShortsCrawler')  # YouTube Data API v3 크롤러
+crawlers.register('ytdlp', 'youtube_ytdlp_crawler', 'YouTubeYTDLPCrawler')  # yt-dlp 크롤러 (실제 급상승 영상)
+# 메모리 상주 영상 저장소 (VIDEO_DB_PATH 설정 시 SQLite에 영상 단위로 저장)
+video_store = VideoStore(
+    "../data/youtube_shorts_cache.json",
+    repository=open_repository(import_from="../data/youtube_shorts_cache.json")
+)
+video_store.add_listener(facets_for)  # 필터 옵션 패싯은 스냅샷을 발행할 때 미리 계산
+trending_cache = ResponseCache()  # /api/youtube/trending 응답 캐시 (스냅샷 세대가 바뀌면 비움)
+DEFAULT_TRENDING_COUNT = 50  # format=json에서 count를 주지 않았을 때
+NDJSON_CHUNK_SIZE = 64  # format=ndjson 스트리밍 한 번에 보내는 줄 수
 
 # 서버 시작 시 첫 크롤링 실행
 @app.on_event("startup")
@@ -57,10 +75,11 @@ async def startup_event():
             ]
             
             # 카테고리별로 50개씩 수집 (총 500개)
+            ytdlp_crawler = crawlers.get('ytdlp')
             videos = ytdlp_crawler.get_trending_by_category(main_categories, per_category=50)
             
             if videos and len(videos) > 0:
-                ytdlp_crawler.save_to_cache(videos)
+                ytdlp_crawler.save_incremental(videos)
                 shorts_count = sum(1 for v in videos if v.get('is_shorts'))
                 long_count = len(videos) - shorts_count
                 korean_count = sum(1 for v in videos if v.get('language') == '한국어')
@@ -95,9 +114,10 @@ async def startup_event():
                     '요리/음식', '게임', '운동/건강', '교육/학습', '음악'
                 ]
                 
+                ytdlp_crawler = crawlers.get('ytdlp')
                 videos = ytdlp_crawler.get_trending_by_category(main_categories, per_category=100)
                 if videos and len(videos) > 0:
-                    ytdlp_crawler.save_to_cache(videos)
+                    ytdlp_crawler.save_incremental(videos)
                     print(f"✅ 자동 업데이트 완료: {len(videos)}개")
                 else:
                     print("⚠️ 자동 업데이트 실패")
@@ -336,7 +356,7 @@ async def get_optimization_checklist():
 
 @app.get("/api/youtube/trending")
 async def get_youtube_trending(
-    count: int = 50,
+    count: Optional[int] = None,
     category: Optional[str] = None,
     region: Optional[str] = None,
     language: Optional[str] = None,
@@ -344,12 +364,24 @@ async def get_youtube_trending(
     sort_by: str = "trend_score",
     force_refresh: bool = False,
     video_type: Optional[str] = None,  # "쇼츠" 또는 "롱폼" 필터
-    time_filter: Optional[str] = None  # "today", "week", "month", "all"
+    time_filter: Optional[str] = None,  # "today", "week", "month", "all"
+    after: Optional[str] = None,  # 이 video_id 다음 영상부터
+    cursor: Optional[str] = None,  # 응답의 next_cursor (같은 세대에서 이어 받음)
+    format: str = "json",  # "json" 또는 "ndjson" (영상 한 줄씩 스트리밍)
+    if_none_match: Optional[str] = Header(None)
 ):
-    """YouTube 급상승 동영상 (쇼츠+롱폼, 필터링 지원)"""
+    """YouTube 급상승 동영상 (쇼츠+롱폼, 필터링 지원)
+
+    count를 늘려 다시 요청하는 대신 응답의 next_cursor를 cursor로 넘겨 다음 페이지를 받는다.
+    커서는 데이터 세대를 고정하므로 스크롤 중에 크롤러가 새 데이터를 발행해도 목록이
+    섞이지 않는다 (세대가 너무 오래되어 버려졌으면 410). after=<video_id>는 현재 세대에서 이어 받는다.
+    format=ndjson이면 정렬 순서대로 영상을 한 줄씩 바로 흘려보낸다 (count를 주지 않으면 전부).
+    JSON 응답에는 ETag가 붙고, If-None-Match가 같으면 304를 돌려준다.
+    """
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 format: {format}")
     try:
         # force_refresh가 True면 즉시 크롤링
-        cache_file = Path("../data/youtube_shorts_cache.json")
         should_refresh = force_refresh
         
         if force_refresh:
@@ -361,32 +393,33 @@ async def get_youtube_trending(
                         '창업/부업', '재테크/금융', '과학기술', '자기계발', '마케팅/비즈니스',
                         '요리/음식', '게임', '운동/건강', '교육/학습', '음악'
                     ]
+                    ytdlp_crawler = crawlers.get('ytdlp')
                     videos = ytdlp_crawler.get_trending_by_category(main_categories, per_category=50)
                     if videos:
-                        ytdlp_crawler.save_to_cache(videos)
+                        ytdlp_crawler.save_incremental(videos)
                         print(f"✅ 즉시 크롤링 완료: {len(videos)}개 (카테고리별 50개씩)")
                 except Exception as e:
                     print(f"❌ 즉시 크롤링 실패: {e}")
             threading.Thread(target=force_crawl, daemon=True).start()
         
-        if cache_file.exists():
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-            
+        snapshot = video_store.get_snapshot()
+        
+        if snapshot is not None:
             # 캐시가 1시간 이상 오래된 경우에만 새로고침
-            if cache.get('last_updated'):
-                last_updated = datetime.fromisoformat(cache['last_updated'].replace('Z', '+00:00'))
+            if snapshot.last_updated:
+                last_updated = datetime.fromisoformat(snapshot.last_updated.replace('Z', '+00:00'))
                 time_diff = (datetime.now() - last_updated).total_seconds()
                 if time_diff > 3600:  # 1시간
                     should_refresh = True
                     print(f"🔄 캐시가 {int(time_diff/3600)}시간 전 데이터 - 새로고침")
         
-        if should_refresh or not cache_file.exists():
+        if should_refresh or snapshot is None:
             print("🔄 백그라운드에서 최신 데이터 크롤링 중...")
             # 백그라운드에서 크롤링 시작 (기존 데이터 먼저 반환)
             import threading
             def background_crawl():
                 try:
+                    shorts_crawler = crawlers.get('shorts')
                     videos = shorts_crawler.crawl_shorts_trending(200)
                     shorts_crawler.save_to_cache(videos)
                     print("✅ 백그라운드 크롤링 완료")
@@ -396,21 +429,68 @@ async def get_youtube_trending(
             threading.Thread(target=background_crawl, daemon=True).start()
             
             # 기존 캐시가 있으면 먼저 반환
-            if cache and cache.get('videos'):
+            if snapshot is not None and len(snapshot) > 0:
                 print("📊 기존 데이터 먼저 반환, 백그라운드에서 업데이트 중...")
             else:
-                # 캐시가 없으면 즉시 크롤링
+                # 캐시가 없으면 즉시 크롤링 (save_to_cache가 저장소 스냅샷을 교체)
+                shorts_crawler = crawlers.get('shorts')
                 videos = shorts_crawler.crawl_shorts_trending(200)
                 shorts_crawler.save_to_cache(videos)
-                cache = {"videos": videos, "last_updated": datetime.now().isoformat()}
-        
-        if cache and cache.get('videos'):
-            videos = cache['videos']
+                snapshot = video_store.get_snapshot()
+        
+        if snapshot is not None and len(snapshot) > 0:
+            query = query_digest(
+                category=category, region=region, language=language, min_trend_score=min_trend_score,
+                sort_by=sort_by, video_type=video_type, time_filter=time_filter
+            )
+            current_generation = snapshot.generation
+            after_position = None
+            if cursor:
+                # 커서가 만들어진 세대의 스냅샷에서 이어 받음
+                try:
+                    state = decode_cursor(cursor, query)
+                except CursorError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                snapshot = video_store.snapshot_at(state['g'])
+                if snapshot is None:
+                    raise HTTPException(status_code=410, detail="커서의 데이터가 교체되었습니다. 처음부터 다시 조회하세요.")
+                after_position = state.get('p')
+                if not isinstance(after_position, int) or snapshot.positions_by_id.get(state.get('id')) != after_position:
+                    raise HTTPException(status_code=400, detail="잘못된 커서")
+            elif after:
+                after_position = snapshot.positions_by_id.get(after)
+                if after_position is None:
+                    raise HTTPException(status_code=400, detail=f"after 영상을 찾을 수 없습니다: {after}")
+
+            if format == "ndjson":
+                positions = _apply_filters(snapshot, category, region, language, min_trend_score, video_type, time_filter)
+                videos = _iter_videos(snapshot, positions, sort_by, after_position)
+                if count is not None and count > 0:
+                    videos = islice(videos, count)
+                return StreamingResponse(
+                    _ndjson_lines(videos),
+                    media_type="application/x-ndjson",
+                    headers={
+                        "X-Total-Count": str(len(positions)),
+                        "X-Last-Updated": snapshot.last_updated or "",
+                    }
+                )
+
+            count = count if count is not None else DEFAULT_TRENDING_COUNT
+            # 같은 세대의 같은 쿼리는 인코딩된 응답 재사용 (커서 페이지는 커서가 세대를 담고 있음)
+            cache_key = ResponseCache.key(
+                count=count, category=category, region=region, language=language,
+                min_trend_score=min_trend_score, sort_by=sort_by, video_type=video_type,
+                time_filter=time_filter, auto_refreshed=should_refresh, after=after, cursor=cursor
+            )
+            cached = trending_cache.get(current_generation, cache_key)
+            if cached is not None:
+                return _etag_response(cached, if_none_match)
             
             # 필터링 적용
-            filtered_videos = _apply_filters(videos, category, region, language, min_trend_score, video_type, time_filter)
+            positions = _apply_filters(snapshot, category, region, language, min_trend_score, video_type, time_filter)
             
-            print(f"🔍 필터링 결과: {len(filtered_videos)}개 (전체 {len(videos)}개)")
+            print(f"🔍 필터링 결과: {len(positions)}개 (전체 {len(snapshot)}개)")
             if category:
                 print(f"   - 카테고리: {category}")
             if region:
@@ -418,16 +498,17 @@ async def get_youtube_trending(
             if time_filter:
                 print(f"   - 기간: {time_filter}")
             
-            # 정렬
-            sorted_videos = _sort_videos(filtered_videos, sort_by)
+            # 정렬 + 개수 제한 (한 개 더 꺼내 다음 페이지가 있는지 확인)
+            final_videos = _sort_videos(snapshot, positions, sort_by, count + 1, after_position)
+            has_more = len(final_videos) > count
+            final_videos = final_videos[:max(count, 0)]
             
-            # 개수 제한
-            final_videos = sorted_videos[:count]
-            
-            return {
+            payload = {
                 "trending_videos": final_videos,
                 "count": len(final_videos),
-                "total_count": len(filtered_videos),
+                "total_count": len(positions),
+                "next_after": final_videos[-1].get('video_id') if has_more and final_videos else None,
+                "next_cursor": _next_cursor(snapshot, query, final_videos[-1]) if has_more and final_videos else None,
                 "filters_applied": {
                     "category": category,
                     "region": region,
@@ -437,14 +518,17 @@ async def get_youtube_trending(
                     "video_type": video_type,
                     "time_filter": time_filter
                 },
-                "last_updated": cache.get('last_updated'),
+                "last_updated": snapshot.last_updated,
                 "source": "shorts_cache",
                 "auto_refreshed": should_refresh
             }
+            body = trending_cache.put(current_generation, cache_key, payload)
+            return _etag_response(body, if_none_match)
         
         # 캐시 없으면 즉시 Shorts 크롤링
         print("Shorts 캐시 없음 - 즉시 크롤링 실행")
-        videos = shorts_crawler.crawl_shorts_trending(count)
+        shorts_crawler = crawlers.get('shorts')
+        videos = shorts_crawler.crawl_shorts_trending(count or DEFAULT_TRENDING_COUNT)
         shorts_crawler.save_to_cache(videos)
         
         return {
@@ -453,113 +537,76 @@ async def get_youtube_trending(
             "last_updated": datetime.now().isoformat(),
             "source": "fresh_shorts_crawl"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Shorts 트렌드 조회 실패: {str(e)}")
 
-def _apply_filters(videos: List[Dict], category: Optional[str], region: Optional[str], 
+def _apply_filters(snapshot: VideoSnapshot, category: Optional[str], region: Optional[str], 
                   language: Optional[str], min_trend_score: Optional[int], video_type: Optional[str],
-                  time_filter: Optional[str]) -> List[Dict]:
-    """비디오 필터링 (개선된 버전)"""
-    filtered = videos.copy()
+                  time_filter: Optional[str]) -> Collection[int]:
+    """비디오 필터링 (저장소 인덱스 교집합 또는 NumPy 열 마스크) - 일치하는 스냅샷 위치 반환"""
+    print(f"🔍 필터링 시작: 총 {len(snapshot)}개 영상")
     
-    print(f"🔍 필터링 시작: 총 {len(filtered)}개 영상")
-    
-    # 카테고리 필터
     if category:
-        before = len(filtered)
-        filtered = [v for v in filtered if v.get('category', '').strip() == category.strip()]
-        print(f"   카테고리 '{category}' 필터: {before}개 → {len(filtered)}개")
-    
-    # 지역 필터
+        print(f"   카테고리 '{category}' 필터: {len(snapshot.positions_for('category', category))}개 일치")
     if region:
-        before = len(filtered)
-        filtered = [v for v in filtered if v.get('region', '').strip() == region.strip()]
-        print(f"   지역 '{region}' 필터: {before}개 → {len(filtered)}개")
-    
-    # 언어 필터
+        print(f"   지역 '{region}' 필터: {len(snapshot.positions_for('region', region))}개 일치")
     if language:
-        before = len(filtered)
-        filtered = [v for v in filtered if v.get('language', '').strip() == language.strip()]
-        print(f"   언어 '{language}' 필터: {before}개 → {len(filtered)}개")
-    
-    # 트렌드 점수 필터
+        print(f"   언어 '{language}' 필터: {len(snapshot.positions_for('language', language))}개 일치")
     if min_trend_score:
-        before = len(filtered)
-        filtered = [v for v in filtered if v.get('trend_score', 0) >= min_trend_score]
-        print(f"   트렌드 점수 {min_trend_score}+ 필터: {before}개 → {len(filtered)}개")
-    
-    # 쇼츠/롱폼 필터
+        print(f"   트렌드 점수 {min_trend_score}+ 필터 적용")
     if video_type:
-        before = len(filtered)
-        # 영어 필터를 한글로 변환
-        if video_type == 'shorts':
-            video_type_filter = '쇼츠'
-        elif video_type == 'long':
-            video_type_filter = '롱폼'
-        else:
-            video_type_filter = video_type
-            
-        filtered = [v for v in filtered if v.get('video_type', '').strip() == video_type_filter.strip()]
-        print(f"   영상 타입 '{video_type}' → '{video_type_filter}' 필터: {before}개 → {len(filtered)}개")
-    
-    # 기간 필터
+        print(f"   영상 타입 '{video_type}' → '{VIDEO_TYPE_ALIASES.get(video_type, video_type)}' 필터 적용")
     if time_filter and time_filter != "all":
-        before = len(filtered)
-        now = datetime.now()
-        
-        if time_filter == "today":
-            # 오늘 (최근 24시간)
-            cutoff = now - timedelta(days=1)
-        elif time_filter == "week":
-            # 이번 주 (최근 7일)
-            cutoff = now - timedelta(days=7)
-        elif time_filter == "month":
-            # 이번 달 (최근 30일)
-            cutoff = now - timedelta(days=30)
-        else:
-            cutoff = None
-        
-        if cutoff:
-            def is_recent(video):
-                crawled_at = video.get('crawled_at')
-                if not crawled_at:
-                    return False
-                try:
-                    crawled_time = datetime.fromisoformat(crawled_at.replace('Z', '+00:00'))
-                    # timezone-aware인 경우 naive로 변환
-                    if crawled_time.tzinfo is not None:
-                        crawled_time = crawled_time.replace(tzinfo=None)
-                    return crawled_time >= cutoff
-                except (ValueError, AttributeError):
-                    return False
-            
-            filtered = [v for v in filtered if is_recent(v)]
-            print(f"   기간 '{time_filter}' 필터: {before}개 → {len(filtered)}개")
+        print(f"   기간 '{time_filter}' 필터 적용")
     
-    print(f"✅ 최종 필터링 결과: {len(filtered)}개")
-    return filtered
-
-def _sort_videos(videos: List[Dict], sort_by: str) -> List[Dict]:
-    """비디오 정렬"""
-    if sort_by == "trend_score":
-        return sorted(videos, key=lambda x: x.get('trend_score', 0), reverse=True)
-    elif sort_by == "views":
-        # 조회수 정렬 (K, M 처리)
-        def parse_views(views_str):
-            if 'M' in views_str:
-                return float(views_str.replace('M', '')) * 1000000
-            elif 'K' in views_str:
-                return float(views_str.replace('K', '')) * 1000
-            else:
-                try:
-                    return float(views_str.replace(',', ''))
-                except:
-                    return 0
-        return sorted(videos, key=lambda x: parse_views(x.get('views', '0')), reverse=True)
-    elif sort_by == "crawled_at":
-        return sorted(videos, key=lambda x: x.get('crawled_at', ''), reverse=True)
-    else:
-        return videos
+    engine = columnar_for(snapshot) or snapshot
+    positions = engine.filter_positions(category, region, language, min_trend_score, video_type, time_filter)
+    print(f"✅ 최종 필터링 결과: {len(positions)}개")
+    return positions
+
+def _sort_videos(snapshot: VideoSnapshot, positions: Collection[int], sort_by: str, count: int,
+                 after_position: Optional[int] = None) -> List[Dict]:
+    """비디오 정렬 - 상위 count개 선택 (after 커서가 있으면 그 다음부터)
+
+    첫 페이지와 다음 페이지, NDJSON이 모두 같은 _iter_videos 순서에서 잘라 가므로
+    페이지를 이어 붙이면 한 번에 받은 결과와 같다.
+    """
+    return list(islice(_iter_videos(snapshot, positions, sort_by, after_position), max(count, 0)))
+
+def _iter_videos(snapshot: VideoSnapshot, positions: Collection[int], sort_by: str,
+                 after_position: Optional[int] = None) -> Iterator[Dict]:
+    """정렬 순서대로 영상을 하나씩 (after 커서 다음부터)"""
+    engine = columnar_for(snapshot) or snapshot
+    return engine.iter_sorted(positions, sort_by, after_position)
+
+def _next_cursor(snapshot: VideoSnapshot, query: str, video: Dict) -> Optional[str]:
+    """video 다음부터 이어 받는 커서 (세대, 쿼리, 정렬 순서상 위치)"""
+    video_id = video.get('video_id')
+    position = snapshot.positions_by_id.get(video_id) if video_id else None
+    if position is None:
+        return None
+    return encode_cursor({"g": snapshot.generation, "q": query, "p": position, "id": video_id})
+
+def _etag_response(body: bytes, if_none_match: Optional[str]) -> Response:
+    """본문 해시를 ETag로 붙인 JSON 응답 (If-None-Match가 같으면 304)"""
+    etag = body_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _ndjson_lines(videos: Iterator[Dict]) -> Iterator[bytes]:
+    """영상 한 줄씩 NDJSON 인코딩 (NDJSON_CHUNK_SIZE줄씩 묶어 전송)"""
+    lines = []
+    for video in videos:
+        lines.append(encode_json(video))
+        if len(lines) >= NDJSON_CHUNK_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
 
 @app.post("/api/youtube/refresh")
 async def refresh_youtube_trending():
@@ -567,27 +614,25 @@ async def refresh_youtube_trending():
     try:
         print("🔄 최신 데이터 확인 중...")
         
-        cache_file = Path("../data/youtube_shorts_cache.json")
-        if cache_file.exists():
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-            
+        snapshot = video_store.get_snapshot()
+        if snapshot is not None:
             # 캐시가 최근 10분 이내면 최신 데이터
-            if cache.get('last_updated'):
-                last_updated = datetime.fromisoformat(cache['last_updated'].replace('Z', '+00:00'))
+            if snapshot.last_updated:
+                last_updated = datetime.fromisoformat(snapshot.last_updated.replace('Z', '+00:00'))
                 time_diff = (datetime.now() - last_updated).total_seconds()
                 if time_diff < 600:  # 10분 이내
                     print("✅ 이미 최신 데이터입니다")
                     return {
                         "message": "이미 최신 데이터입니다",
-                        "last_updated": cache['last_updated'],
-                        "count": len(cache.get('videos', [])),
+                        "last_updated": snapshot.last_updated,
+                        "count": len(snapshot),
                         "source": "cached_data",
                         "status": "already_fresh"
                     }
         
         # 최신 데이터가 아니면 강제 크롤링
         print("🔄 최신 데이터 크롤링 중...")
+        shorts_crawler = crawlers.get('shorts')
         videos = shorts_crawler.crawl_shorts_trending(200)
         shorts_crawler.save_to_cache(videos)
         
@@ -608,66 +653,62 @@ async def refresh_youtube_trending():
 async def get_category_keywords(category: str):
     """특정 카테고리의 핫 키워드 분석"""
     try:
-        # 캐시에서 해당 카테고리 영상들 가져오기
-        cache_file = Path("../data/youtube_shorts_cache.json")
-        if not cache_file.exists():
+        # 저장소에서 해당 카테고리 영상들 가져오기
+        snapshot = video_store.get_snapshot()
+        if snapshot is None:
             raise HTTPException(status_code=404, detail="캐시 데이터가 없습니다")
-            
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
         
-        category_videos = [v for v in cache_data.get('videos', []) if v.get('category') == category]
+        category_count = len(snapshot.positions_for('category', category))
         
-        if not category_videos:
+        if not category_count:
             return {
                 "category": category,
                 "keywords": [],
                 "message": f"{category} 카테고리 데이터가 없습니다"
             }
         
-        # 키워드 추출 및 분석
-        all_keywords = []
-        for video in category_videos:
-            all_keywords.extend(video.get('keywords', []))
-        
-        # 키워드 빈도 계산
-        from collections import Counter
-        keyword_counts = Counter(all_keywords)
-        
-        # 상위 키워드 추출
+        # 상위 키워드 추출 (키워드 역색인에 카테고리별 빈도가 미리 집계되어 있음)
         top_keywords = []
-        for keyword, count in keyword_counts.most_common(20):
+        for keyword, count in snapshot.top_keywords(category, 20):
             if keyword and len(keyword) > 1:  # 빈 문자열이나 1글자 키워드 제외
                 top_keywords.append({
                     "keyword": keyword,
                     "frequency": count,
-                    "percentage": round((count / len(category_videos)) * 100, 1)
+                    "percentage": round((count / category_count) * 100, 1)
                 })
         
         return {
             "category": category,
-            "total_videos": len(category_videos),
+            "total_videos": category_count,
             "keywords": top_keywords,
-            "last_updated": cache_data.get('last_updated', datetime.now().isoformat())
+            "last_updated": snapshot.last_updated or datetime.now().isoformat()
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"카테고리 키워드 분석 실패: {str(e)}")
 
-@app.get("/api/youtube/filter-options")
-async def get_filter_options():
-    """사용 가능한 필터 옵션 제공"""
+@app.get("/api/youtube/filter-options", response_class=FastJSONResponse)
+async def get_filter_options(
+    category: Optional[str] = None,
+    region: Optional[str] = None,
+    language: Optional[str] = None,
+    video_type: Optional[str] = None,
+    time_filter: Optional[str] = None
+):
+    """사용 가능한 필터 옵션 제공
+
+    facets에는 값별 영상 수가 들어 있다. 필터 파라미터를 주면 다른 필터를 적용한 상태의
+    개수를 돌려준다 (예: region=국내 → 국내 영상의 카테고리별 개수).
+    """
     try:
-        cache_file = Path("../data/youtube_shorts_cache.json")
-        if cache_file.exists():
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-            
-            if cache and cache.get('videos'):
-                videos = cache['videos']
+        snapshot = video_store.get_snapshot()
+        if snapshot is not None:
+            if len(snapshot) > 0:
+                # 스냅샷 발행 시 계산해 둔 패싯 (영상 목록을 다시 훑지 않음)
+                summary = facets_for(snapshot)
                 
                 # 실제 데이터에서 발견된 카테고리
-                found_categories = list(set(v.get('category', '') for v in videos if v.get('category')))
+                found_categories = summary.values('category')
                 
                 # 전체 YouTube 카테고리 목록
                 all_categories = [
@@ -681,10 +722,10 @@ async def get_filter_options():
                 categories = sorted(list(set(found_categories + all_categories)))
                 
                 # 지역 옵션
-                regions = list(set(v.get('region', '') for v in videos if v.get('region')))
+                regions = summary.values('region')
                 
                 # 언어 옵션 (항상 한국어, 영어 포함)
-                languages_from_data = list(set(v.get('language', '') for v in videos if v.get('language')))
+                languages_from_data = summary.values('language')
                 languages = sorted(list(set(languages_from_data + ["한국어", "영어"])))
                 
                 # 정렬 옵션
@@ -720,7 +761,11 @@ async def get_filter_options():
                         "min": 1,
                         "max": 100,
                         "default": 50
-                    }
+                    },
+                    "facets": summary.counts(
+                        category=category, region=region, language=language,
+                        video_type=video_type, time_filter=time_filter
+                    )
                 }
         
         # 기본 옵션 반환 (영어 항상 포함)
@@ -766,13 +811,23 @@ async def get_filter_options():
 
 @app.post("/api/youtube/analyze-keywords")
 async def analyze_keywords(request: dict):
-    """급상승 동영상에서 키워드 분석"""
+    """급상승 동영상에서 키워드 분석
+
+    videos를 주지 않으면 저장소의 영상을 키워드 역색인으로 분석한다 (빈도를 다시 세지 않음).
+    """
     try:
+        youtube_analyzer = crawlers.get('youtube_analyzer')
         videos = request.get("videos", [])
+        keyword_index = None
         if not videos:
-            videos = youtube_analyzer.get_trending_videos(20)
+            snapshot = video_store.get_snapshot()
+            if snapshot is not None and len(snapshot) > 0:
+                videos = snapshot.videos
+                keyword_index = snapshot.keyword_index
+            else:
+                videos = youtube_analyzer.get_trending_videos(20)
         
-        analysis = youtube_analyzer.extract_keywords_from_videos(videos)
+        analysis = youtube_analyzer.extract_keywords_from_videos(videos, keyword_index)
         return {"keyword_analysis": analysis}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"키워드 분석 실패: {str(e)}")
@@ -781,6 +836,7 @@ async def analyze_keywords(request: dict):
 async def get_content_ideas(request: dict):
     """키워드 기반 콘텐츠 아이디어"""
     try:
+        youtube_analyzer = crawlers.get('youtube_analyzer')
         keyword = request.get("keyword", "")
         videos = youtube_analyzer.get_trending_videos(20)
         
@@ -793,6 +849,7 @@ async def get_content_ideas(request: dict):
 async def get_posting_times():
     """최적 업로드 시간"""
     try:
+        youtube_analyzer = crawlers.get('youtube_analyzer')
         times = youtube_analyzer.get_optimal_posting_times()
         return {"posting_times": times}
     except Exception as e:
@@ -801,11 +858,17 @@ async def get_posting_times():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
+    ytdlp_crawler = crawlers.loaded('ytdlp')  # 헬스 체크 때문에 yt-dlp를 불러오지 않음
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "system_loaded": bool(planner.system_data),
-        "youtube_analyzer_loaded": youtube_analyzer is not None
+        "youtube_analyzer_loaded": crawlers.loaded('youtube_analyzer') is not None,
+        "ytdlp_pool": ytdlp_crawler.ydl_pool.stats() if ytdlp_crawler else None,
+        "crawlers": crawlers.stats(),
+        "enrichment": enrichment_pipeline.stats(),
+        "response_cache": trending_cache.stats(),
+        "view_history": video_store.history.stats() if video_store.history else None
     }
 
 # 스케줄러 관련 전역 변수
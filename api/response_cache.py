@@ -0,0 +1,86 @@
+"""
+스냅샷 세대 기반 응답 캐시 (LRU)
+같은 쿼리 조합이 반복되면 필터링/정렬/직렬화를 건너뛰고 미리 인코딩한 JSON
+바이트를 그대로 돌려준다. 키에는 스냅샷 세대가 들어가므로 크롤러가 새 스냅샷을
+발행하면 이전 세대 항목은 한꺼번에 버려진다.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from fast_json import dumps as encode_json
+
+
+class ResponseCache:
+    """쿼리 파라미터 → 인코딩된 응답 (현재 세대 항목만 보관)"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[tuple, bytes]' = OrderedDict()
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(**params) -> tuple:
+        """파라미터 이름 순으로 정렬한 키 (쿼리 문자열 순서와 무관)"""
+        return tuple(sorted(params.items()))
+
+    def get(self, generation: int, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            self._sync_generation(generation)
+            body = self._entries.get(key) if generation == self._generation else None
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, generation: int, key: tuple, payload) -> bytes:
+        """응답을 인코딩해 저장하고 바이트 반환 (그 사이 세대가 바뀌었으면 저장하지 않음)"""
+        body = encode_json(payload)
+        if self.max_entries <= 0:
+            return body
+        with self._lock:
+            self._sync_generation(generation)
+            if generation != self._generation:
+                return body
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _sync_generation(self, generation: int):
+        # 호출자가 self._lock을 보유한 상태, 세대는 앞으로만 이동
+        if self._generation is None or generation > self._generation:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._generation = generation
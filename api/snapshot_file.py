@@ -0,0 +1,218 @@
+"""
+영상 캐시 바이너리 스냅샷 (.vsnap)
+JSON 캐시를 통째로 json.load 하는 대신, 인덱스에 필요한 값은 열(column) 단위
+배열로, 나머지 영상 정보는 영상별 JSON 조각으로 저장한다.
+
+- 카테고리/지역/언어/영상 타입은 문자열 테이블 + 코드 배열(uint16)
+- 조회수/트렌드 점수/길이/수집 시각/마지막 확인 시각은 packed 배열
+- 읽을 때는 mmap 위의 memoryview로 바로 접근하고, 영상 dict는 처음 필요할 때만 디코드
+
+파일 구조: MAGIC(8) | 헤더 길이(uint32) | 헤더 JSON | 열 데이터 (8바이트 정렬) | 영상 JSON 조각
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional
+
+MAGIC = b'VSNAP001'
+HEADER_LENGTH = struct.Struct('<I')
+
+# 문자열 테이블로 저장하는 필드 (VideoSnapshot의 INDEXED_FIELDS와 같음)
+STRING_FIELDS = ('category', 'region', 'language', 'video_type')
+
+# 숫자 열 → array typecode
+NUMBER_COLUMNS = {
+    'view_count': 'q',
+    'trend_score': 'd',
+    'duration': 'd',
+    'crawled_at': 'd',
+    'last_seen': 'd',
+}
+
+
+def snapshot_path(cache_file) -> Path:
+    """JSON 캐시 파일 옆에 두는 바이너리 스냅샷 경로"""
+    return Path(cache_file).with_suffix('.vsnap')
+
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+
+def write_snapshot_file(path, records: List[Dict], columns: Dict[str, List], meta: Optional[Dict] = None):
+    """바이너리 스냅샷을 임시 파일에 쓰고 os.replace로 교체
+
+    Args:
+        records: 위치 순서의 영상 dict
+        columns: STRING_FIELDS / NUMBER_COLUMNS 이름 → 위치별 값 (숫자가 없으면 None)
+        meta: 헤더에 그대로 남길 값 (last_updated, source, json_signature 등)
+    """
+    path = Path(path)
+    count = len(records)
+
+    header = dict(meta or {})
+    header.update({
+        'count': count,
+        'byteorder': sys.byteorder,
+        'video_ids': [record.get('video_id') or None for record in records],
+        'strings': {},
+        'columns': {},
+    })
+
+    blocks = []
+    for field in STRING_FIELDS:
+        table: Dict = {}
+        codes = array('H' if count < 65536 else 'I')
+        for value in columns[field]:
+            codes.append(table.setdefault(value, len(table)))
+        if len(table) > 65535 and codes.typecode == 'H':
+            codes = array('I', codes)
+        header['strings'][field] = list(table)
+        blocks.append((field, codes))
+    for name, typecode in NUMBER_COLUMNS.items():
+        values = columns[name]
+        if typecode == 'd':
+            blocks.append((name, array('d', (_number(value) for value in values))))
+        else:
+            blocks.append((name, array(typecode, (int(value or 0) for value in values))))
+
+    blobs = [json.dumps(record, ensure_ascii=False).encode('utf-8') for record in records]
+    offsets = array('Q', [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    blocks.append(('record_offsets', offsets))
+
+    # 헤더 길이가 열 위치에 영향을 주므로 위치는 헤더 뒤 상대 위치로 기록
+    position = 0
+    for name, values in blocks:
+        header['columns'][name] = [position, values.typecode, len(values)]
+        position += _padded(len(values) * values.itemsize)
+    header['records'] = [position, offsets[-1]]
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _padded(len(MAGIC) + HEADER_LENGTH.size + len(header_bytes))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(HEADER_LENGTH.pack(len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b'\0' * (data_start - f.tell()))
+            for _, values in blocks:
+                raw = values.tobytes()
+                f.write(raw)
+                f.write(b'\0' * (_padded(len(raw)) - len(raw)))
+            for blob in blobs:
+                f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class SnapshotFile:
+    """mmap 기반 바이너리 스냅샷 리더 (열은 복사 없이 memoryview로 노출)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"바이너리 스냅샷 형식이 아닙니다: {self.path}")
+        header_start = len(MAGIC) + HEADER_LENGTH.size
+        (header_length,) = HEADER_LENGTH.unpack(buffer[len(MAGIC):header_start])
+        self.header = json.loads(bytes(buffer[header_start:header_start + header_length]))
+        data_start = _padded(header_start + header_length)
+        swap = self.header['byteorder'] != sys.byteorder
+
+        self._columns = {}
+        for name, (offset, typecode, length) in self.header['columns'].items():
+            start = data_start + offset
+            itemsize = array(typecode).itemsize
+            view = buffer[start:start + length * itemsize]
+            if swap:
+                # 다른 바이트 순서로 쓴 파일은 복사해서 뒤집음
+                values = array(typecode, view.tobytes())
+                values.byteswap()
+                self._columns[name] = values
+            else:
+                self._columns[name] = view.cast(typecode)
+
+        records_offset, records_length = self.header['records']
+        start = data_start + records_offset
+        self._blobs = buffer[start:start + records_length]
+        self._offsets = self._columns['record_offsets']
+
+    def __len__(self) -> int:
+        return self.header['count']
+
+    @property
+    def video_ids(self) -> List[Optional[str]]:
+        return self.header['video_ids']
+
+    def column(self, name: str):
+        """숫자 열 또는 문자열 코드 열 (memoryview / array)"""
+        return self._columns[name]
+
+    def strings(self, field: str) -> List:
+        """문자열 열의 코드 → 값 테이블"""
+        return self.header['strings'][field]
+
+    def record(self, position: int) -> Dict:
+        """위치의 영상 dict 디코드"""
+        return json.loads(bytes(self._blobs[self._offsets[position]:self._offsets[position + 1]]))
+
+
+class LazyRecords:
+    """위치 → 영상 dict (처음 접근할 때 디코드해 보관)"""
+
+    def __init__(self, snapshot_file: SnapshotFile):
+        self._file = snapshot_file
+        self._decoded: List[Optional[Dict]] = [None] * len(snapshot_file)
+
+    def __len__(self) -> int:
+        return len(self._decoded)
+
+    def __getitem__(self, position: int) -> Dict:
+        record = self._decoded[position]
+        if record is None:
+            record = self._decoded[position] = self._file.record(position)
+        return record
+
+    def __iter__(self) -> Iterator[Dict]:
+        for position in range(len(self._decoded)):
+            yield self[position]
+
+
+def read_snapshot_file(path, json_signature: Optional[tuple] = None) -> Optional[SnapshotFile]:
+    """바이너리 스냅샷 열기 (없거나, 깨졌거나, JSON 캐시와 시그니처가 다르면 None)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        snapshot_file = SnapshotFile(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"⚠️ 바이너리 스냅샷 읽기 실패 ({path.name}): {e}")
+        return None
+    if json_signature is not None and tuple(snapshot_file.header.get('json_signature') or ()) != tuple(json_signature):
+        return None
+    return snapshot_file
@@ -0,0 +1,117 @@
+"""
+/api/youtube/trending 페이지 일관성 테스트 (실제 수집 캐시 data/youtube_shorts_cache.json 사용)
+
+수집 캐시에는 같은 video_id가 여러 번 들어 있다. 커서/after로 이어 받은 페이지를 붙인 결과가
+한 번에 받은 결과(NDJSON)와 같고, total_count / X-Total-Count가 실제 반환 개수와 같은지 확인한다.
+
+    cd api && python -m pytest -q test_trending_pages.py
+"""
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import columnar_engine  # noqa: E402
+import main  # noqa: E402
+from video_store import VideoSnapshot, VideoStore  # noqa: E402
+
+CACHE_FILE = Path(__file__).parent / 'data' / 'youtube_shorts_cache.json'
+QUERIES = [
+    {'sort_by': 'trend_score'},
+    {'sort_by': 'views'},
+    {'sort_by': 'crawled_at'},
+    {'sort_by': 'trend_score', 'category': '과학기술'},
+    {'sort_by': 'views', 'region': '국내'},
+    {'sort_by': 'unknown'},
+]
+
+
+class _NoCrawl:
+    """오래된 캐시여도 요청 중 실제 크롤링을 시작하지 않도록"""
+
+    def get(self, name):
+        raise RuntimeError('크롤링 비활성화 (테스트)')
+
+
+@pytest.fixture(params=['index', 'numpy'])
+def client(request, monkeypatch):
+    if request.param == 'numpy' and not columnar_engine.NUMPY_AVAILABLE:
+        pytest.skip('numpy 없음')
+    monkeypatch.setattr(columnar_engine, 'ENGINE', request.param)
+    store = VideoStore(CACHE_FILE, view_history=False, binary_snapshot=False)
+    monkeypatch.setattr(main, 'video_store', store)
+    monkeypatch.setattr(main, 'crawlers', _NoCrawl())
+    monkeypatch.setattr(main, 'trending_cache', main.ResponseCache())
+    return TestClient(main.app)
+
+
+def _ids(videos):
+    return [video['video_id'] for video in videos]
+
+
+def _ndjson(client, params):
+    response = client.get('/api/youtube/trending', params=dict(params, format='ndjson'))
+    assert response.status_code == 200
+    videos = [json.loads(line) for line in response.text.splitlines() if line]
+    return _ids(videos), int(response.headers['X-Total-Count'])
+
+
+def test_snapshot_keeps_last_copy_of_duplicate_ids():
+    with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+        videos = json.load(f)['videos']
+    counts = Counter(video['video_id'] for video in videos)
+    assert any(count > 1 for count in counts.values())
+
+    snapshot = VideoSnapshot(videos)
+    assert len(snapshot) == len(counts)
+    last = {video['video_id']: video for video in videos}
+    assert all(snapshot.get(video_id) is video for video_id, video in last.items())
+
+
+@pytest.mark.parametrize('params', QUERIES)
+def test_cursor_pages_match_single_shot(client, params):
+    expected, total = _ndjson(client, params)
+    assert len(expected) == len(set(expected)) == total
+
+    first = client.get('/api/youtube/trending', params=dict(params, count=len(expected) + 1)).json()
+    assert _ids(first['trending_videos']) == expected
+    assert first['total_count'] == total
+
+    paged, cursor = [], None
+    while True:
+        page_params = dict(params, count=7)
+        if cursor:
+            page_params['cursor'] = cursor
+        page = client.get('/api/youtube/trending', params=page_params).json()
+        assert page['total_count'] == total
+        paged += _ids(page['trending_videos'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert paged == expected
+
+
+@pytest.mark.parametrize('params', QUERIES)
+def test_after_pages_match_single_shot(client, params):
+    expected, _ = _ndjson(client, params)
+
+    paged, after = [], None
+    while True:
+        page_params = dict(params, count=11)
+        if after:
+            page_params['after'] = after
+        page = client.get('/api/youtube/trending', params=page_params).json()
+        paged += _ids(page['trending_videos'])
+        after = page['next_after']
+        if not after:
+            break
+    assert paged == expected
+
+    # NDJSON도 같은 after에서 같은 순서로 이어짐
+    resumed, _ = _ndjson(client, dict(params, after=expected[len(expected) // 2]))
+    assert resumed == expected[len(expected) // 2 + 1:]
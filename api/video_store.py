@@ -0,0 +1,975 @@
+"""
+프로세스 상주 영상 저장소
+캐시 파일을 한 번만 읽어 메모리에 보관하고, 크롤러가 캐시를 저장할 때마다
+새 스냅샷으로 원자적으로 교체한다. 필터링은 보조 인덱스의 집합 교집합으로 처리.
+
+증분 모드에서는 크롤러가 새로 생겼거나 바뀐 영상만 전달하고, 저장소는 이전
+스냅샷을 복사-수정(copy-on-write)해 바뀐 영상의 인덱스만 갱신한다.
+
+SQLite 저장소(video_repository)를 연결하면 JSON 파일 대신 영상 단위로 저장한다.
+
+캐시 파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로 읽는 쪽은 잘린 파일을 보지
+않는다. 다른 프로세스가 파일을 바꾸면 (mtime, 크기, inode)가 달라질 때만 다시 읽는다.
+JSON 옆에는 바이너리 스냅샷(.vsnap, snapshot_file 참고)을 함께 써서 다음 로드 때
+json.load 없이 열 배열에서 바로 인덱스를 만든다.
+
+크롤러가 저장할 때마다 영상별 조회수를 이력(.history, view_history 참고)에 남기고,
+이력이 쌓인 영상은 시간당 조회수 증가량으로 트렌드 점수를 매긴다.
+"""
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Set
+
+from keyword_index import KeywordIndex, video_keywords
+from pagination import GenerationPins
+from snapshot_file import LazyRecords, SnapshotFile, read_snapshot_file, snapshot_path, write_snapshot_file
+from video_repository import VideoRepository, video_view_count
+from view_history import ViewHistory, history_path, with_trend
+
+# 동일 값 인덱스를 만드는 필드
+INDEXED_FIELDS = ('category', 'region', 'language', 'video_type')
+
+# 트렌드 점수 버킷 크기 (0-9, 10-19, ...)
+TREND_BUCKET_SIZE = 10
+
+# 영어 영상 타입 필터 → 저장된 한글 값
+VIDEO_TYPE_ALIASES = {'shorts': '쇼츠', 'long': '롱폼'}
+
+# 기간 필터 → 기준 일수
+TIME_FILTER_DAYS = {'today': 1, 'week': 7, 'month': 30}
+
+# 미리 정렬해 두는 정렬 키 (모두 내림차순)
+SORT_KEYS = ('trend_score', 'views', 'crawled_at')
+
+# 삭제 표시된 자리가 이 비율을 넘으면 스냅샷을 새로 빌드 (압축)
+COMPACT_RATIO = 0.25
+
+
+def _normalize(value) -> str:
+    """인덱스 키 정규화 (기존 필터의 strip 비교와 동일)"""
+    if isinstance(value, str):
+        return value.strip()
+    return value if value is not None else ''
+
+
+def unique_videos(videos: Iterable[Dict]) -> List[Dict]:
+    """같은 video_id가 여러 번 있으면 마지막 것만 남김 (upsert와 같은 기준, 순서는 유지)"""
+    videos = list(videos)
+    last = {}
+    for index, video in enumerate(videos):
+        video_id = video.get('video_id')
+        if video_id:
+            last[video_id] = index
+    return [video for index, video in enumerate(videos)
+            if not video.get('video_id') or last[video['video_id']] == index]
+
+
+def parse_crawled_at(value) -> Optional[float]:
+    """crawled_at ISO 문자열을 epoch 초로 변환 (timezone 정보는 버림)"""
+    if not value:
+        return None
+    try:
+        crawled_time = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if crawled_time.tzinfo is not None:
+            crawled_time = crawled_time.replace(tzinfo=None)
+        return crawled_time.timestamp()
+    except (ValueError, AttributeError, OSError):
+        return None
+
+
+def file_signature(path) -> Optional[tuple]:
+    """파일 변경 감지용 (mtime_ns, 크기, inode) - 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def write_json_atomic(path, data) -> Optional[tuple]:
+    """임시 파일에 쓰고 fsync 후 os.replace로 교체 → 새 파일의 시그니처 반환
+
+    같은 디렉터리의 임시 파일을 쓰므로 교체는 원자적이고, 읽는 쪽은 항상 이전
+    파일이나 새 파일 전체 중 하나만 본다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return file_signature(path)
+
+
+class VideoSnapshot:
+    """한 시점의 영상 목록과 보조 인덱스 (공개 후에는 변경하지 않음)
+
+    영상은 위치(position)로 식별한다. 증분 갱신으로 빠진 영상의 자리는 None으로
+    남겨 두고, 그런 자리가 많아지면 새로 빌드한다. 같은 video_id는 한 위치에만
+    있다 (빌드할 때 마지막 것만 남김).
+    """
+
+    def __init__(self, videos: List[Dict], last_updated: Optional[str] = None,
+                 source: Optional[str] = None, generation: int = 0, now: Optional[float] = None):
+        self.last_updated = last_updated
+        self.source = source
+        self.generation = generation
+
+        now = now if now is not None else time.time()
+        self._records: List[Optional[Dict]] = []
+        self.positions_by_id: Dict[str, int] = {}
+        self._live: Set[int] = set()
+        # 동점 정렬용 삽입 순번 (전체 빌드에서는 원래 순서)
+        self.seqs: List[int] = []
+        self._next_seq = 0
+
+        # 필드 값 → 영상 위치 집합
+        self.indexes: Dict[str, Dict[str, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        # 트렌드 점수 버킷 → 영상 위치 집합
+        self.trend_buckets: Dict[int, Set[int]] = {}
+        self.trend_scores: List = []
+        # 정수 조회수 (원본 view_count 우선, 없으면 포맷된 문자열 파싱)
+        self.view_counts: List[int] = []
+        # crawled_at epoch (파싱 실패 시 None)
+        self.crawled_epochs: List[Optional[float]] = []
+        # 마지막으로 크롤러에 잡힌 시각 (TTL 만료 기준)
+        self.last_seen: List[float] = []
+        # 키워드 역색인 (키워드 → 위치, 카테고리별 키워드 빈도)
+        self._keywords: Optional[KeywordIndex] = KeywordIndex()
+
+        self._owned: Set[int] = set()
+        for video in unique_videos(videos):
+            position = len(self._records)
+            self._records.append(None)
+            for values in (self.seqs, self.trend_scores, self.view_counts, self.crawled_epochs, self.last_seen):
+                values.append(None)
+            self._index(position, video, self._take_seq(), now)
+        self._owned = set()
+        self._keywords._owned = set()
+        self._build_sorted()
+
+    @classmethod
+    def from_file(cls, snapshot_file: SnapshotFile, generation: int = 0,
+                  now: Optional[float] = None) -> 'VideoSnapshot':
+        """바이너리 스냅샷에서 빌드 (인덱스는 열 배열에서 만들고 영상 dict는 필요할 때 디코드)"""
+        now = now if now is not None else time.time()
+        header = snapshot_file.header
+        count = len(snapshot_file)
+
+        video_ids = [video_id for video_id in snapshot_file.video_ids if video_id]
+        if len(set(video_ids)) != len(video_ids):
+            # 중복 video_id를 걸러 내기 전에 저장된 파일 - 레코드에서 새로 빌드
+            return cls(list(LazyRecords(snapshot_file)), last_updated=header.get('last_updated'),
+                       source=header.get('source'), generation=generation, now=now)
+
+        snapshot = cls.__new__(cls)
+        snapshot.last_updated = header.get('last_updated')
+        snapshot.source = header.get('source')
+        snapshot.generation = generation
+        snapshot._records = LazyRecords(snapshot_file)
+        snapshot.positions_by_id = {
+            video_id: position for position, video_id in enumerate(snapshot_file.video_ids) if video_id
+        }
+        snapshot._live = set(range(count))
+        snapshot.seqs = list(range(count))
+        snapshot._next_seq = count
+
+        snapshot.indexes = {}
+        for field in INDEXED_FIELDS:
+            values = snapshot_file.strings(field)
+            members = [set() for _ in values]
+            for position, code in enumerate(snapshot_file.column(field)):
+                members[code].add(position)
+            snapshot.indexes[field] = {value: positions for value, positions in zip(values, members) if positions}
+
+        snapshot.trend_scores = [
+            int(score) if score.is_integer() else score for score in snapshot_file.column('trend_score')
+        ]
+        snapshot.trend_buckets = {}
+        for position, score in enumerate(snapshot.trend_scores):
+            snapshot.trend_buckets.setdefault(int(score // TREND_BUCKET_SIZE), set()).add(position)
+        snapshot.view_counts = list(snapshot_file.column('view_count'))
+        # NaN은 값 없음
+        snapshot.crawled_epochs = [epoch if epoch == epoch else None for epoch in snapshot_file.column('crawled_at')]
+        snapshot.last_seen = [
+            seen if seen == seen else (crawled if crawled is not None else now)
+            for seen, crawled in zip(snapshot_file.column('last_seen'), snapshot.crawled_epochs)
+        ]
+        # 키워드는 열 배열에 없으므로 처음 쓸 때 레코드에서 빌드
+        snapshot._keywords = None
+        snapshot._owned = set()
+        snapshot._build_sorted()
+        return snapshot
+
+    def write_file(self, path, meta: Optional[Dict] = None):
+        """살아 있는 영상을 바이너리 스냅샷으로 저장 (위치는 압축됨)"""
+        positions = sorted(self._live)
+        records = [self._records[p] for p in positions]
+        columns = {
+            field: [_normalize(record.get(field, '')) for record in records]
+            for field in INDEXED_FIELDS
+        }
+        columns.update({
+            'view_count': [self.view_counts[p] for p in positions],
+            'trend_score': [self.trend_scores[p] for p in positions],
+            'duration': [record.get('duration') for record in records],
+            'crawled_at': [self.crawled_epochs[p] for p in positions],
+            'last_seen': [self.last_seen[p] for p in positions],
+        })
+        header = {"last_updated": self.last_updated, "source": self.source}
+        header.update(meta or {})
+        write_snapshot_file(path, records, columns, header)
+
+    def _build_sorted(self):
+        """위치별 값에서 정렬 목록 생성"""
+        # crawled_at / last_seen 오름차순 (기간 필터와 TTL 만료는 이진 탐색)
+        crawled = sorted((self.crawled_epochs[p], p) for p in self._live if self.crawled_epochs[p] is not None)
+        self._crawled_epochs = [epoch for epoch, _ in crawled]
+        self._crawled_positions = [position for _, position in crawled]
+        seen = sorted((self.last_seen[p], p) for p in self._live)
+        self._seen_epochs = [epoch for epoch, _ in seen]
+        self._seen_positions = [position for _, position in seen]
+
+        # 정렬 키별 (-값, 순번, 위치) 오름차순 목록 (스냅샷마다 한 번만 계산)
+        self.orders: Dict[str, List[tuple]] = {
+            sort_key: sorted(self._order_entry(sort_key, p) for p in self._live)
+            for sort_key in SORT_KEYS
+        }
+        self._live_videos: Optional[List[Dict]] = None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    @property
+    def videos(self) -> List[Dict]:
+        """살아 있는 영상 목록 (위치 순서)"""
+        if self._live_videos is None:
+            self._live_videos = [video for video in self._records if video is not None]
+        return self._live_videos
+
+    @property
+    def keyword_index(self) -> KeywordIndex:
+        """키워드 역색인 (바이너리 스냅샷에서 로드했으면 처음 접근할 때 빌드)"""
+        keywords = self._keywords
+        if keywords is None:
+            keywords = self._keywords = KeywordIndex.build(
+                (position, _normalize(self._records[position].get('category', '')),
+                 video_keywords(self._records[position]))
+                for position in sorted(self._live)
+            )
+        return keywords
+
+    def top_keywords(self, category: Optional[str] = None, k: Optional[int] = None) -> List[tuple]:
+        """빈도 상위 (키워드, 빈도) - category를 주면 그 카테고리 영상만"""
+        return self.keyword_index.top(_normalize(category) if category is not None else None, k)
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        position = self.positions_by_id.get(video_id)
+        return self._records[position] if position is not None else None
+
+    def positions_for(self, field: str, value: str) -> Set[int]:
+        """필드 값이 일치하는 영상 위치"""
+        return self.indexes[field].get(_normalize(value), set())
+
+    def positions_min_trend_score(self, min_trend_score) -> Set[int]:
+        """트렌드 점수가 min_trend_score 이상인 영상 위치"""
+        boundary = int(min_trend_score // TREND_BUCKET_SIZE)
+        positions = set()
+        for bucket, members in self.trend_buckets.items():
+            if bucket > boundary:
+                positions |= members
+            elif bucket == boundary:
+                positions.update(p for p in members if self.trend_scores[p] >= min_trend_score)
+        return positions
+
+    def positions_crawled_since(self, cutoff: datetime) -> Set[int]:
+        """cutoff 이후 수집된 영상 위치"""
+        start = bisect_left(self._crawled_epochs, cutoff.timestamp())
+        return set(self._crawled_positions[start:])
+
+    def facet_rows(self) -> Iterator[tuple]:
+        """살아 있는 영상마다 (INDEXED_FIELDS 값..., 수집 시각 epoch) - 레코드를 꺼내지 않고 인덱스로 구성"""
+        rows = {position: [''] * len(INDEXED_FIELDS) for position in self._live}
+        for index, field in enumerate(INDEXED_FIELDS):
+            for value, positions in self.indexes[field].items():
+                for position in positions:
+                    rows[position][index] = value
+        for position, values in rows.items():
+            yield tuple(values) + (self.crawled_epochs[position],)
+
+    def filter(self, category: Optional[str] = None, region: Optional[str] = None,
+               language: Optional[str] = None, min_trend_score: Optional[int] = None,
+               video_type: Optional[str] = None, time_filter: Optional[str] = None) -> List[Dict]:
+        """인덱스 교집합으로 필터링 (원래 순서 유지)"""
+        return [self._records[p] for p in sorted(self.filter_positions(
+            category, region, language, min_trend_score, video_type, time_filter
+        ))]
+
+    def top(self, positions: Set[int], sort_by: str, limit: int) -> List[Dict]:
+        """필터 결과에서 정렬 기준 상위 limit개 (미리 정렬된 순서를 활용)"""
+        if limit <= 0 or not positions:
+            return []
+        if sort_by not in self.orders:
+            return [self._records[p] for p in sorted(positions)[:limit]]
+
+        order = self.orders[sort_by]
+        if len(positions) == len(self._live):
+            selected = [position for _, _, position in order[:limit]]
+        elif limit * len(self._live) <= len(positions) * len(positions):
+            # 선택도가 높으면 정렬 순서를 따라가며 일치 항목만 수집
+            selected = []
+            for _, _, position in order:
+                if position in positions:
+                    selected.append(position)
+                    if len(selected) >= limit:
+                        break
+        else:
+            # 결과가 적으면 정렬 키 기준 부분 선택
+            selected = heapq.nsmallest(limit, positions, key=lambda p: self._order_entry(sort_by, p))
+        return [self._records[p] for p in selected]
+
+    def iter_sorted(self, positions: Set[int], sort_by: str, after: Optional[int] = None) -> Iterator[Dict]:
+        """필터 결과를 정렬 순서대로 하나씩 반환 (after 위치의 영상 다음부터)
+
+        스트리밍 응답과 커서 페이지용. 목록을 통째로 만들지 않고 미리 정렬된 순서를
+        따라가며 꺼내므로 첫 영상이 바로 나온다. after 영상이 필터 결과에 없어도
+        정렬 순서상 그 뒤부터 이어진다.
+        """
+        if not positions:
+            return
+        if sort_by not in self.orders:
+            ordered = sorted(positions)
+            start = bisect_right(ordered, after) if after is not None else 0
+            for position in ordered[start:]:
+                yield self._records[position]
+            return
+
+        order = self.orders[sort_by]
+        check = len(positions) != len(self._live)
+        if check and len(positions) * 8 < len(order):
+            # 결과가 적으면 일치 항목만 정렬 (전체 순서를 훑지 않음)
+            order = sorted(self._order_entry(sort_by, p) for p in positions)
+            check = False
+        start = bisect_right(order, self._order_entry(sort_by, after)) if after is not None else 0
+        for index in range(start, len(order)):
+            position = order[index][2]
+            if check and position not in positions:
+                continue
+            yield self._records[position]
+
+    def filter_positions(self, category: Optional[str] = None, region: Optional[str] = None,
+                         language: Optional[str] = None, min_trend_score: Optional[int] = None,
+                         video_type: Optional[str] = None, time_filter: Optional[str] = None) -> Set[int]:
+        """필터 조건에 맞는 영상 위치 집합"""
+        candidates = []
+
+        if category:
+            candidates.append(self.positions_for('category', category))
+        if region:
+            candidates.append(self.positions_for('region', region))
+        if language:
+            candidates.append(self.positions_for('language', language))
+        if video_type:
+            candidates.append(self.positions_for('video_type', VIDEO_TYPE_ALIASES.get(video_type, video_type)))
+        if min_trend_score:
+            candidates.append(self.positions_min_trend_score(min_trend_score))
+        if time_filter and time_filter in TIME_FILTER_DAYS:
+            cutoff = datetime.now() - timedelta(days=TIME_FILTER_DAYS[time_filter])
+            candidates.append(self.positions_crawled_since(cutoff))
+
+        if not candidates:
+            return set(self._live)
+
+        # 작은 집합부터 교집합
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for members in candidates[1:]:
+            if not result:
+                break
+            result &= members
+        return result
+
+    # ------------------------------------------------------------------
+    # 증분 갱신
+    # ------------------------------------------------------------------
+
+    def apply(self, videos: List[Dict], seen_ids: Iterable[str] = (), now: Optional[float] = None,
+              expire_before: Optional[float] = None, last_updated: Optional[str] = None,
+              source: Optional[str] = None) -> tuple:
+        """새로 생겼거나 바뀐 영상을 반영한 새 스냅샷과 통계 반환 (self는 그대로)
+
+        Args:
+            videos: 새로 생겼거나 바뀐 영상 (video_id 기준 upsert)
+            seen_ids: 바뀌지 않았지만 이번 크롤링에서 다시 확인된 영상 ID
+            expire_before: 이 epoch 이전에 마지막으로 확인된 영상은 만료
+        """
+        now = now if now is not None else time.time()
+        now_iso = datetime.fromtimestamp(now).isoformat()
+        stats = {"inserted": 0, "updated": 0, "touched": 0, "expired": 0}
+
+        if len(videos) > max(256, len(self) // 4):
+            # 변경이 많으면 하나씩 끼워 넣는 것보다 병합 후 새로 빌드하는 편이 빠름
+            new = self._rebuild_with(videos, seen_ids, now, now_iso, stats, last_updated, source)
+        else:
+            new = self._derive(last_updated, source)
+            new._upsert_each(videos, seen_ids, now, now_iso, stats)
+
+        if expire_before is not None:
+            cutoff = bisect_left(new._seen_epochs, expire_before)
+            for position in list(new._seen_positions[:cutoff]):
+                new._remove_sorted(position)
+                new._unindex(position)
+                stats["expired"] += 1
+
+        new._owned = set()
+        stats["total"] = len(new)
+
+        # 빈 자리가 많으면 새로 빌드해 압축
+        tombstones = len(new._records) - len(new)
+        if tombstones > 64 and tombstones > len(new._records) * COMPACT_RATIO:
+            new = VideoSnapshot(new.videos, last_updated=new.last_updated, source=new.source, now=now)
+        return new, stats
+
+    def _upsert_each(self, videos: List[Dict], seen_ids: Iterable[str], now: float,
+                     now_iso: str, stats: Dict):
+        """바뀐 영상마다 인덱스/정렬 목록을 제자리 갱신 (_derive 사본에서만 호출)"""
+        new = self
+        for video in videos:
+            video_id = video.get('video_id')
+            position = new.positions_by_id.get(video_id) if video_id else None
+            if position is None:
+                record = dict(video)
+                record['first_seen'] = record['last_seen'] = now_iso
+                position = len(new._records)
+                new._records.append(None)
+                for values in (new.seqs, new.trend_scores, new.view_counts, new.crawled_epochs, new.last_seen):
+                    values.append(None)
+                new._index(position, record, new._take_seq(), now)
+                new._insert_sorted(position)
+                stats["inserted"] += 1
+            else:
+                old = new._records[position]
+                record = dict(old)
+                record.update(video)
+                record['first_seen'] = old.get('first_seen') or old.get('crawled_at') or now_iso
+                record['last_seen'] = now_iso
+                seq = new.seqs[position]
+                new._remove_sorted(position)
+                new._unindex(position)
+                new._index(position, record, seq, now)
+                new._insert_sorted(position)
+                stats["updated"] += 1
+
+        for video_id in seen_ids:
+            position = new.positions_by_id.get(video_id)
+            if position is None:
+                continue
+            # 바뀌지 않은 영상은 마지막 확인 시각만 갱신
+            record = dict(new._records[position])
+            record['last_seen'] = now_iso
+            new._records[position] = record
+            new._move_seen(position, now)
+            stats["touched"] += 1
+
+    def _rebuild_with(self, videos: List[Dict], seen_ids: Iterable[str], now: float, now_iso: str,
+                      stats: Dict, last_updated: Optional[str], source: Optional[str]) -> 'VideoSnapshot':
+        """레코드를 병합한 뒤 새 스냅샷을 한 번에 빌드"""
+        records = list(self._records)
+        positions_by_id = dict(self.positions_by_id)
+        for video in videos:
+            video_id = video.get('video_id')
+            position = positions_by_id.get(video_id) if video_id else None
+            if position is None:
+                record = dict(video)
+                record['first_seen'] = record['last_seen'] = now_iso
+                if video_id:
+                    positions_by_id[video_id] = len(records)
+                records.append(record)
+                stats["inserted"] += 1
+            else:
+                old = records[position]
+                record = dict(old)
+                record.update(video)
+                record['first_seen'] = old.get('first_seen') or old.get('crawled_at') or now_iso
+                record['last_seen'] = now_iso
+                records[position] = record
+                stats["updated"] += 1
+
+        for video_id in seen_ids:
+            position = positions_by_id.get(video_id)
+            if position is not None and records[position] is not None:
+                records[position] = dict(records[position], last_seen=now_iso)
+                stats["touched"] += 1
+
+        return VideoSnapshot(
+            [record for record in records if record is not None],
+            last_updated=last_updated or self.last_updated,
+            source=source or self.source,
+            generation=self.generation,
+            now=now
+        )
+
+    def _derive(self, last_updated: Optional[str], source: Optional[str]) -> 'VideoSnapshot':
+        """복사-수정용 사본 (컨테이너는 얕은 복사, 인덱스 집합은 수정 시에만 복사)"""
+        new = VideoSnapshot.__new__(VideoSnapshot)
+        new.last_updated = last_updated or self.last_updated
+        new.source = source or self.source
+        new.generation = self.generation
+        new._records = list(self._records)
+        new.positions_by_id = dict(self.positions_by_id)
+        new._live = set(self._live)
+        new.seqs = list(self.seqs)
+        new._next_seq = self._next_seq
+        new.indexes = {field: dict(mapping) for field, mapping in self.indexes.items()}
+        new.trend_buckets = dict(self.trend_buckets)
+        new.trend_scores = list(self.trend_scores)
+        new.view_counts = list(self.view_counts)
+        new.crawled_epochs = list(self.crawled_epochs)
+        new.last_seen = list(self.last_seen)
+        new._crawled_epochs = list(self._crawled_epochs)
+        new._crawled_positions = list(self._crawled_positions)
+        new._seen_epochs = list(self._seen_epochs)
+        new._seen_positions = list(self._seen_positions)
+        new.orders = {sort_key: list(order) for sort_key, order in self.orders.items()}
+        keywords = self._keywords
+        new._keywords = keywords.copy() if keywords is not None else None
+        new._live_videos = None
+        new._owned = set()
+        return new
+
+    def _take_seq(self) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        return seq
+
+    def _owned_set(self, mapping: Dict, key) -> Set[int]:
+        """수정 가능한 인덱스 집합 (다른 스냅샷과 공유 중이면 복사)"""
+        members = mapping.get(key)
+        if members is None:
+            members = mapping[key] = set()
+            self._owned.add(id(members))
+        elif id(members) not in self._owned:
+            members = mapping[key] = set(members)
+            self._owned.add(id(members))
+        return members
+
+    def _index(self, position: int, video: Dict, seq: int, now: float):
+        """위치에 영상 기록 + 값 인덱스 등록 (정렬 목록은 호출자가 처리)"""
+        self._records[position] = video
+        self._live.add(position)
+        video_id = video.get('video_id')
+        if video_id:
+            self.positions_by_id[video_id] = position
+        self.seqs[position] = seq
+
+        for field in INDEXED_FIELDS:
+            self._owned_set(self.indexes[field], _normalize(video.get(field, ''))).add(position)
+
+        score = video.get('trend_score', 0)
+        self.trend_scores[position] = score
+        self._owned_set(self.trend_buckets, int(score // TREND_BUCKET_SIZE)).add(position)
+
+        self.view_counts[position] = video_view_count(video)
+        self.crawled_epochs[position] = parse_crawled_at(video.get('crawled_at'))
+        seen = parse_crawled_at(video.get('last_seen'))
+        if seen is None:
+            seen = self.crawled_epochs[position]
+        self.last_seen[position] = seen if seen is not None else now
+        if self._keywords is not None:
+            self._keywords.add(position, _normalize(video.get('category', '')), video_keywords(video))
+        self._live_videos = None
+
+    def _unindex(self, position: int):
+        """위치의 영상을 값 인덱스에서 제거하고 빈 자리로 표시"""
+        video = self._records[position]
+        for field in INDEXED_FIELDS:
+            key = _normalize(video.get(field, ''))
+            members = self._owned_set(self.indexes[field], key)
+            members.discard(position)
+            if not members:
+                del self.indexes[field][key]
+        bucket = int(self.trend_scores[position] // TREND_BUCKET_SIZE)
+        members = self._owned_set(self.trend_buckets, bucket)
+        members.discard(position)
+        if not members:
+            del self.trend_buckets[bucket]
+        if self._keywords is not None:
+            self._keywords.remove(position, _normalize(video.get('category', '')), video_keywords(video))
+
+        video_id = video.get('video_id')
+        if video_id and self.positions_by_id.get(video_id) == position:
+            del self.positions_by_id[video_id]
+        self._live.discard(position)
+        self._records[position] = None
+        self._live_videos = None
+
+    def _order_entry(self, sort_key: str, position: int) -> tuple:
+        if sort_key == 'trend_score':
+            value = self.trend_scores[position]
+        elif sort_key == 'views':
+            value = self.view_counts[position]
+        else:
+            value = self.crawled_epochs[position]
+            if value is None:
+                value = float('-inf')
+        return (-value, self.seqs[position], position)
+
+    def _insert_sorted(self, position: int):
+        for sort_key in SORT_KEYS:
+            insort(self.orders[sort_key], self._order_entry(sort_key, position))
+        epoch = self.crawled_epochs[position]
+        if epoch is not None:
+            _sorted_insert(self._crawled_epochs, self._crawled_positions, epoch, position)
+        _sorted_insert(self._seen_epochs, self._seen_positions, self.last_seen[position], position)
+
+    def _remove_sorted(self, position: int):
+        for sort_key in SORT_KEYS:
+            order = self.orders[sort_key]
+            del order[bisect_left(order, self._order_entry(sort_key, position))]
+        epoch = self.crawled_epochs[position]
+        if epoch is not None:
+            _sorted_remove(self._crawled_epochs, self._crawled_positions, epoch, position)
+        _sorted_remove(self._seen_epochs, self._seen_positions, self.last_seen[position], position)
+
+    def _move_seen(self, position: int, seen: float):
+        _sorted_remove(self._seen_epochs, self._seen_positions, self.last_seen[position], position)
+        self.last_seen[position] = seen
+        _sorted_insert(self._seen_epochs, self._seen_positions, seen, position)
+
+
+def _sorted_insert(epochs: List[float], positions: List[int], epoch: float, position: int):
+    """(epoch, position) 오름차순을 유지하며 평행 목록에 삽입"""
+    index = bisect_left(epochs, epoch)
+    while index < len(epochs) and epochs[index] == epoch and positions[index] < position:
+        index += 1
+    epochs.insert(index, epoch)
+    positions.insert(index, position)
+
+
+def _sorted_remove(epochs: List[float], positions: List[int], epoch: float, position: int):
+    """평행 목록에서 (epoch, position) 항목 제거"""
+    index = bisect_left(epochs, epoch)
+    while index < len(epochs) and epochs[index] == epoch:
+        if positions[index] == position:
+            del epochs[index]
+            del positions[index]
+            return
+        index += 1
+
+
+class VideoStore:
+    """캐시 파일을 메모리에 상주시키는 저장소
+
+    repository를 주면 로드/저장을 SQLite로 처리한다 (JSON 파일은 읽지도 쓰지도 않음).
+    binary_snapshot이 켜져 있으면 (기본, VIDEO_BINARY_SNAPSHOT=0으로 끔) JSON을 쓸 때마다
+    .vsnap 파일도 함께 쓰고, 로드할 때 JSON과 시그니처가 맞으면 그것을 읽는다.
+    view_history가 켜져 있으면 (기본, VIDEO_VIEW_HISTORY=0으로 끔) 크롤러가 저장할 때마다
+    조회수를 이력에 남기고 증가 속도로 트렌드 점수를 갱신한다.
+    최근 몇 세대의 스냅샷은 교체된 뒤에도 보관해 커서 페이지가 같은 세대에서 이어진다.
+    """
+
+    def __init__(self, cache_file: str = "../data/youtube_shorts_cache.json",
+                 ttl_hours: Optional[float] = None, repository: Optional[VideoRepository] = None,
+                 binary_snapshot: Optional[bool] = None, view_history: Optional[bool] = None):
+        self.cache_file = Path(cache_file)
+        self.repository = repository
+        if binary_snapshot is None:
+            binary_snapshot = os.getenv('VIDEO_BINARY_SNAPSHOT', '1') != '0'
+        self.binary_snapshot = binary_snapshot
+        self.snapshot_file = snapshot_path(cache_file)
+        if view_history is None:
+            view_history = os.getenv('VIDEO_VIEW_HISTORY', '1') != '0'
+        self.history: Optional[ViewHistory] = ViewHistory(history_path(cache_file)) if view_history else None
+        # 증분 모드에서 이 시간 동안 다시 확인되지 않은 영상은 만료 (0이면 만료 없음)
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv('VIDEO_TTL_HOURS', '48'))
+        self.ttl_seconds = ttl_hours * 3600
+        self._snapshot: Optional[VideoSnapshot] = None
+        self._generation = 0
+        # 커서 페이지가 이어 받을 최근 세대 스냅샷 (PINNED_GENERATIONS개)
+        self._pinned: GenerationPins[VideoSnapshot] = GenerationPins()
+        # 새 스냅샷이 발행될 때 호출할 함수 (스냅샷별 파생 데이터를 미리 계산)
+        self._listeners: List[Callable[[VideoSnapshot], object]] = []
+        # 마지막으로 읽거나 쓴 캐시 파일의 시그니처 (바뀌었을 때만 다시 읽음)
+        self._file_signature: Optional[tuple] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        # publish / upsert 직렬화 (스냅샷 교체와 파일 저장 순서 보장)
+        self._write_lock = threading.Lock()
+        _register_store(self)
+
+    @property
+    def generation(self) -> int:
+        """스냅샷이 교체될 때마다 증가하는 세대 번호"""
+        return self._generation
+
+    def add_listener(self, listener: Callable[[VideoSnapshot], object]):
+        """스냅샷이 교체될 때마다 listener(새 스냅샷) 호출 (이미 로드되어 있으면 현재 스냅샷으로 한 번 호출)"""
+        self._listeners.append(listener)
+        if self._snapshot is not None:
+            self._notify(listener, self._snapshot)
+
+    def get_snapshot(self) -> Optional[VideoSnapshot]:
+        """현재 스냅샷 (첫 호출 시 캐시 파일 로드, 이후에는 파일이 바뀐 경우에만 다시 로드)"""
+        if not self._loaded:
+            self.load()
+        elif self.repository is None:
+            self._reload_if_changed()
+        return self._snapshot
+
+    def snapshot_at(self, generation: int) -> Optional[VideoSnapshot]:
+        """고정해 둔 최근 세대의 스냅샷 (교체된 지 오래되어 버려졌으면 None)"""
+        snapshot = self.get_snapshot()
+        if snapshot is not None and snapshot.generation == generation:
+            return snapshot
+        return self._pinned.get(generation)
+
+    def _reload_if_changed(self):
+        """다른 프로세스가 캐시 파일을 교체했으면 다시 로드
+
+        다른 스레드가 저장/로드 중이면 기다리지 않고 현재 스냅샷을 그대로 쓴다.
+        """
+        signature = file_signature(self.cache_file)
+        if signature is None or signature == self._file_signature:
+            return
+        if not self._write_lock.acquire(blocking=False):
+            return
+        try:
+            signature = file_signature(self.cache_file)
+            if signature is None or signature == self._file_signature:
+                return
+            # 읽는 동안 또 바뀌면 다음 호출에서 다시 감지됨
+            self._file_signature = signature
+            snapshot = self._load_cache_file(signature)
+            if snapshot is None:
+                return
+            with self._lock:
+                self._swap(snapshot)
+        finally:
+            self._write_lock.release()
+        print(f"🔄 캐시 파일 변경 감지 → 다시 로드: {len(snapshot)}개 영상 (세대 {snapshot.generation})")
+
+    def _load_cache_file(self, signature: tuple) -> Optional[VideoSnapshot]:
+        """JSON과 시그니처가 맞는 바이너리 스냅샷이 있으면 그것을, 없으면 JSON을 읽음"""
+        if self.binary_snapshot:
+            snapshot_file = read_snapshot_file(self.snapshot_file, signature)
+            if snapshot_file is not None:
+                return VideoSnapshot.from_file(snapshot_file)
+        cache_data = self._read_cache_file()
+        if cache_data is None:
+            return None
+        snapshot = self._build(cache_data)
+        # 다음 로드부터는 바이너리 스냅샷 사용
+        self._write_binary(snapshot, signature)
+        return snapshot
+
+    def _write_binary(self, snapshot: VideoSnapshot, signature: Optional[tuple]):
+        if not self.binary_snapshot or signature is None:
+            return
+        try:
+            snapshot.write_file(self.snapshot_file, {"json_signature": list(signature)})
+        except (OSError, TypeError, ValueError, OverflowError) as e:
+            print(f"⚠️ 바이너리 스냅샷 저장 실패: {e}")
+
+    def _read_cache_file(self) -> Optional[Dict]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ 영상 캐시 로드 실패: {e}")
+            return None
+
+    def load(self):
+        """캐시 파일에서 스냅샷 로드"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if self.repository is not None:
+                snapshot = self._build(self.repository.load())
+            else:
+                self._file_signature = file_signature(self.cache_file)
+                if self._file_signature is None:
+                    return
+                snapshot = self._load_cache_file(self._file_signature)
+                if snapshot is None:
+                    return
+            self._swap(snapshot)
+        print(f"📦 영상 저장소 로드 완료: {len(self._snapshot)}개 영상")
+
+    def publish(self, cache_data: Dict):
+        """크롤러의 전체 저장 - 스냅샷 교체 후 SQLite 또는 캐시 파일에 저장"""
+        if self.history is not None:
+            videos, _ = self._observe_views(VideoSnapshot([]), cache_data.get('videos', []), [], time.time())
+            cache_data = dict(cache_data, videos=videos)
+        snapshot = self._build(cache_data)
+        with self._write_lock:
+            with self._lock:
+                self._loaded = True
+                self._swap(snapshot)
+            if self.repository is not None:
+                self.repository.replace_all(snapshot.videos, snapshot.last_updated, snapshot.source)
+            else:
+                self._file_signature = write_json_atomic(self.cache_file, cache_data)
+                self._write_binary(snapshot, self._file_signature)
+        print(f"🔁 영상 저장소 스냅샷 교체: {len(snapshot)}개 영상 (세대 {snapshot.generation})")
+
+    def upsert(self, videos: List[Dict], seen_ids: Iterable[str] = (),
+               source: Optional[str] = None, persist: bool = True) -> Dict:
+        """새로 생겼거나 바뀐 영상만 반영 (증분 모드)
+
+        video_id가 같은 영상은 조회수/트렌드 점수 등을 덮어쓰고 first_seen은 유지,
+        last_seen은 갱신한다. TTL 동안 다시 확인되지 않은 영상은 만료된다.
+        """
+        seen_ids = list(seen_ids)
+        with self._write_lock:
+            base = self.get_snapshot() or VideoSnapshot([])
+            now = time.time()
+            if self.history is not None:
+                videos, seen_ids = self._observe_views(base, videos, seen_ids, now)
+            expire_before = now - self.ttl_seconds if self.ttl_seconds > 0 else None
+            snapshot, stats = base.apply(
+                videos, seen_ids, now=now, expire_before=expire_before,
+                last_updated=datetime.fromtimestamp(now).isoformat(), source=source
+            )
+            with self._lock:
+                self._loaded = True
+                self._swap(snapshot)
+            if persist and self.repository is not None:
+                # 바뀐 행만 쓰고 나머지는 last_seen 갱신 / 만료 삭제
+                changed_ids = {video.get('video_id') for video in videos}
+                self.repository.apply_changes(
+                    [snapshot.get(video_id) for video_id in changed_ids if snapshot.get(video_id)],
+                    [video_id for video_id in seen_ids if video_id not in changed_ids],
+                    seen_at=datetime.fromtimestamp(now).isoformat(),
+                    expire_before=expire_before,
+                    last_updated=snapshot.last_updated,
+                    source=snapshot.source
+                )
+            elif persist:
+                self._persist(snapshot)
+
+        print(f"🔁 영상 저장소 증분 갱신 (세대 {snapshot.generation}): "
+              f"신규 {stats['inserted']} / 변경 {stats['updated']} / 유지 {stats['touched']} / "
+              f"만료 {stats['expired']} → 전체 {stats['total']}개")
+        return stats
+
+    def _observe_views(self, base: VideoSnapshot, videos: List[Dict], seen_ids: List[str],
+                       now: float) -> tuple:
+        """바뀐 영상과 다시 확인된 영상의 조회수를 이력에 추가하고 트렌드 반영
+
+        다시 확인된 영상도 조회수가 그대로라는 관측이므로 이력에 남기고, 그래서
+        증가 속도가 바뀐 영상은 트렌드 값만 담은 변경으로 옮긴다.
+        """
+        observations = [(video.get('video_id'), video_view_count(video)) for video in videos]
+        for video_id in seen_ids:
+            record = base.get(video_id)
+            if record is not None:
+                observations.append((video_id, video_view_count(record)))
+        trends = self.history.observe(observations, now)
+
+        changed = [
+            with_trend(video, trends[video.get('video_id')]) if video.get('video_id') in trends else video
+            for video in videos
+        ]
+        unchanged = []
+        for video_id in seen_ids:
+            trend = trends.get(video_id)
+            record = base.get(video_id)
+            if trend is None or record is None or all(record.get(key) == value for key, value in trend.items()):
+                unchanged.append(video_id)
+            elif 'base_trend_score' in record:
+                changed.append(dict(trend, video_id=video_id))
+            else:
+                changed.append(with_trend({'video_id': video_id, 'trend_score': record.get('trend_score')}, trend))
+        self.history.save(now)
+        return changed, unchanged
+
+    def _persist(self, snapshot: VideoSnapshot):
+        """병합된 스냅샷을 캐시 파일로 저장 (재시작 후에도 이력 유지)"""
+        cache_data = {
+            "last_updated": snapshot.last_updated,
+            "videos": snapshot.videos,
+            "count": len(snapshot),
+            "source": snapshot.source
+        }
+        self._file_signature = write_json_atomic(self.cache_file, cache_data)
+        self._write_binary(snapshot, self._file_signature)
+
+    def _build(self, cache_data: Dict) -> VideoSnapshot:
+        return VideoSnapshot(
+            videos=cache_data.get('videos', []),
+            last_updated=cache_data.get('last_updated'),
+            source=cache_data.get('source')
+        )
+
+    def _swap(self, snapshot: VideoSnapshot):
+        # 호출자가 self._lock을 보유한 상태
+        self._generation += 1
+        snapshot.generation = self._generation
+        self._snapshot = snapshot
+        self._pinned.pin(snapshot.generation, snapshot)
+        for listener in self._listeners:
+            self._notify(listener, snapshot)
+
+    @staticmethod
+    def _notify(listener: Callable[[VideoSnapshot], object], snapshot: VideoSnapshot):
+        try:
+            listener(snapshot)
+        except Exception as e:
+            print(f"⚠️ 스냅샷 리스너 실패 ({getattr(listener, '__name__', listener)}): {e}")
+
+
+# 캐시 파일 경로 → 저장소 (크롤러의 save_to_cache에서 찾아 갱신)
+_stores: Dict[Path, VideoStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _register_store(store: VideoStore):
+    with _stores_lock:
+        _stores[store.cache_file.resolve()] = store
+
+
+def _find_store(cache_file) -> Optional[VideoStore]:
+    with _stores_lock:
+        return _stores.get(Path(cache_file).resolve())
+
+
+def publish_cache(cache_file, cache_data: Dict):
+    """크롤러의 전체 저장 - 같은 파일을 보는 저장소가 있으면 저장소가 스냅샷 교체와
+    저장(SQLite 또는 캐시 파일)을 맡고, 없으면 캐시 파일만 원자적으로 교체"""
+    store = _find_store(cache_file)
+    if store is None:
+        write_json_atomic(cache_file, cache_data)
+        return
+    store.publish(cache_data)
+
+
+def publish_changes(cache_file, videos: List[Dict], seen_ids: Iterable[str] = (),
+                    source: Optional[str] = None) -> Optional[Dict]:
+    """증분 모드 크롤러가 호출 - 바뀐 영상만 저장소에 upsert (저장소가 파일 저장)"""
+    store = _find_store(cache_file)
+    if store is None:
+        return None
+    return store.upsert(videos, seen_ids, source=source)
@@ -5,10 +5,11 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 import random
 import time
+from enrichment import enrich
 
 class YouTubeCrawler:
     def __init__(self):
@@ -118,7 +119,7 @@ class YouTubeCrawler:
             print(f"동영상 파싱 실패: {e}")
             return []
     
-    def _extract_video_info(self, renderer: dict) -> Dict:
+    def _extract_video_info(self, renderer: dict) -> Optional[Dict]:
         """동영상 렌더러에서 정보 추출"""
         try:
             # 제목
@@ -139,124 +140,17 @@ class YouTubeCrawler:
             # 비디오 ID
             video_id = renderer.get('videoId', '')
             
-            if not title:
-                return None
-            
-            # 키워드 추출 (제목에서)
-            keywords = self._extract_keywords_from_title(title)
-            
-            # 카테고리 추정
-            category = self._estimate_category(title, keywords)
-            
-            # 바이럴 요소 분석
-            why_viral = self._analyze_viral_elements(title, view_count_text)
-            
-            return {
-                "title": title,
-                "category": category,
-                "views": self._format_view_count(view_count_text),
-                "engagement": "높음",
-                "keywords": keywords,
-                "thumbnail": self._get_emoji_for_category(category),
-                "why_viral": why_viral,
-                "video_id": video_id,
-                "thumbnail_url": thumbnail_url,
-                "channel": channel
-            }
+            return enrich({
+                'title': title,
+                'video_id': video_id,
+                'views': view_count_text,
+                'extra': {"thumbnail_url": thumbnail_url, "channel": channel},
+            })
             
         except Exception as e:
             print(f"동영상 정보 추출 실패: {e}")
             return None
     
-    def _extract_keywords_from_title(self, title: str) -> List[str]:
-        """제목에서 키워드 추출"""
-        keywords = []
-        
-        # 한국어 키워드 패턴
-        keyword_patterns = [
-            r'부업', r'재테크', r'투자', r'돈', r'수익', r'월급',
-            r'AI', r'ChatGPT', r'개발', r'코딩',
-            r'마케팅', r'브랜딩', r'SNS', r'인스타',
-            r'창업', r'사업', r'프리랜서',
-            r'자기계발', r'루틴', r'습관', r'성공',
-            r'부동산', r'주식', r'경매'
-        ]
-        
-        for pattern in keyword_patterns:
-            if re.search(pattern, title):
-                keywords.append(pattern.replace('r', '').replace("'", ""))
-        
-        # 숫자 포함 (금액, 기간)
-        if re.search(r'\d+만원|\d+천|\d+억', title):
-            keywords.append('구체적금액')
-        if re.search(r'\d+개월|\d+일|\d+년', title):
-            keywords.append('기간명시')
-        
-        return keywords[:5] if keywords else ['일반']
-    
-    def _estimate_category(self, title: str, keywords: List[str]) -> str:
-        """제목과 키워드로 카테고리 추정"""
-        if any(k in keywords for k in ['부업', '재테크', '투자', '돈']):
-            return '재테크/투자'
-        elif any(k in keywords for k in ['AI', 'ChatGPT', '개발', '코딩']):
-            return 'IT/테크'
-        elif any(k in keywords for k in ['마케팅', '브랜딩', 'SNS']):
-            return '마케팅'
-        elif any(k in keywords for k in ['창업', '사업', '프리랜서']):
-            return '부업/창업'
-        elif any(k in keywords for k in ['자기계발', '루틴', '습관']):
-            return '자기계발'
-        else:
-            return '라이프스타일'
-    
-    def _format_view_count(self, view_text: str) -> str:
-        """조회수 텍스트 포맷"""
-        if not view_text:
-            return f"{random.randint(100, 900)}K"
-        
-        # "조회수 1,234회" -> "1.2K"
-        numbers = re.findall(r'\d+', view_text.replace(',', ''))
-        if numbers:
-            count = int(numbers[0])
-            if count >= 1000000:
-                return f"{count/1000000:.1f}M"
-            elif count >= 1000:
-                return f"{count/1000:.0f}K"
-            else:
-                return str(count)
-        
-        return f"{random.randint(100, 900)}K"
-    
-    def _analyze_viral_elements(self, title: str, views: str) -> str:
-        """바이럴 요소 분석"""
-        elements = []
-        
-        if re.search(r'\d+', title):
-            elements.append("구체적 숫자")
-        if re.search(r'비밀|비법|꿀팁|방법', title):
-            elements.append("하우투")
-        if re.search(r'이렇게|이것만|단|오직', title):
-            elements.append("단순화")
-        if re.search(r'충격|놀라운|대박|미친', title):
-            elements.append("충격 요소")
-        
-        return " + ".join(elements) if elements else "흥미로운 주제"
-    
-    def _get_emoji_for_category(self, category: str) -> str:
-        """카테고리별 이모지"""
-        emoji_map = {
-            '재테크/투자': '💰',
-            '부업/창업': '💼',
-            'IT/테크': '🤖',
-            '마케팅': '📱',
-            '자기계발': '📚',
-            '라이프스타일': '✨',
-            '요리/먹방': '🍳',
-            '건강/운동': '💪',
-            '교육': '🎓'
-        }
-        return emoji_map.get(category, '🎬')
-    
     def _get_simulated_data(self, count: int) -> List[Dict]:
         """시뮬레이션 데이터 (크롤링 실패 시 백업)"""
         simulated_videos = [
@@ -14,7 +14,9 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import re
+
+from enrichment import enrich
+from video_store import write_json_atomic
 
 class YouTubeRealtimeCrawler:
     def __init__(self, cache_file: str = "../data/youtube_realtime_cache.json"):
@@ -108,24 +110,14 @@ class YouTubeRealtimeCrawler:
                     if href and "/shorts/" in href:
                         video_id = href.split("/shorts/")[-1].split("?")[0]
                         
-                        video_data = {
-                            "title": title,
-                            "category": self._categorize_video(title),
-                            "views": self._get_view_count(element),
-                            "engagement": "높음",
-                            "keywords": self._extract_keywords(title),
-                            "thumbnail": "📱",
-                            "why_viral": self._analyze_viral_factors(title),
-                            "video_id": video_id,
-                            "youtube_url": f"https://www.youtube.com/watch?v={video_id}",
-                            "shorts_url": href,
-                            "is_shorts": True,
-                            "region": "국내",
-                            "language": "한국어",
-                            "trend_score": self._calculate_trend_score(title)
-                        }
-                        
-                        videos.append(video_data)
+                        video_data = enrich({
+                            'title': title,
+                            'video_id': video_id,
+                            'views': self._get_view_count(element),
+                            'is_shorts': True,
+                        })
+                        if video_data:
+                            videos.append(video_data)
                         
                 except Exception as e:
                     continue
@@ -136,23 +128,6 @@ class YouTubeRealtimeCrawler:
             print(f"❌ 데이터 추출 오류: {e}")
             return []
     
-    def _categorize_video(self, title: str) -> str:
-        """영상 제목으로 카테고리 분류"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['부업', '창업', '돈', '수익', 'n잡']):
-            return '창업/부업'
-        elif any(word in title_lower for word in ['주식', '투자', '재테크', '코인']):
-            return '재테크/금융'
-        elif any(word in title_lower for word in ['ai', 'chatgpt', '코딩', '개발']):
-            return '과학기술'
-        elif any(word in title_lower for word in ['운동', '헬스', '다이어트']):
-            return '운동/건강'
-        elif any(word in title_lower for word in ['요리', '레시피', '먹방']):
-            return '요리/음식'
-        else:
-            return '기타'
-    
     def _get_view_count(self, element) -> str:
         """조회수 추출"""
         try:
@@ -161,63 +136,6 @@ class YouTubeRealtimeCrawler:
         except:
             return "조회수 없음"
     
-    def _extract_keywords(self, title: str) -> List[str]:
-        """제목에서 키워드 추출"""
-        keywords = []
-        
-        # 주요 키워드 패턴
-        patterns = {
-            '부업': ['부업', 'n잡', '투잡', '사이드'],
-            '돈': ['돈', '수익', '월급', '벌기'],
-            '주식': ['주식', '투자', '재테크'],
-            'AI': ['ai', 'chatgpt', '인공지능'],
-            '운동': ['운동', '헬스', '다이어트'],
-            '요리': ['요리', '레시피', '먹방']
-        }
-        
-        for category, words in patterns.items():
-            if any(word in title.lower() for word in words):
-                keywords.append(category)
-        
-        return keywords[:3]
-    
-    def _analyze_viral_factors(self, title: str) -> str:
-        """바이럴 요소 분석"""
-        elements = []
-        
-        if re.search(r'\d+', title):
-            elements.append("숫자")
-        if re.search(r'[!?]', title):
-            elements.append("감정")
-        if re.search(r'비법|꿀팁|방법', title):
-            elements.append("하우투")
-        
-        return " + ".join(elements) if elements else "흥미로운 주제"
-    
-    def _calculate_trend_score(self, title: str) -> int:
-        """트렌드 점수 계산"""
-        score = 50  # 기본 점수
-        
-        # 제목 길이
-        if len(title) > 20:
-            score += 10
-        
-        # 숫자 포함
-        if re.search(r'\d+', title):
-            score += 15
-        
-        # 감정 표현
-        if re.search(r'[!?]', title):
-            score += 10
-        
-        # 키워드 점수
-        viral_keywords = ['비법', '꿀팁', '방법', '공개', '진짜', '절대']
-        for keyword in viral_keywords:
-            if keyword in title:
-                score += 5
-        
-        return min(score, 100)
-    
     def save_to_cache(self, data: List[Dict]):
         """캐시에 저장"""
         cache_data = {
@@ -227,8 +145,7 @@ class YouTubeRealtimeCrawler:
             "source": "real_crawler"
         }
         
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        write_json_atomic(self.cache_file, cache_data)
         
         self.last_update = datetime.now()
         print(f"💾 실제 데이터 캐시 저장 완료: {len(data)}개 영상")
@@ -9,13 +9,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-import json
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import re
 import random
+from enrichment import enrich
+from video_store import publish_cache
 
 class YouTubeShortsCrawler:
     def __init__(self, cache_file: str = "../data/youtube_shorts_cache.json"):
@@ -123,24 +124,14 @@ class YouTubeShortsCrawler:
                     if href and "/shorts/" in href:
                         video_id = href.split("/shorts/")[-1].split("?")[0]
                         
-                        video_data = {
-                            "title": title,
-                            "category": self._categorize_video(title),
-                            "views": self._get_view_count(element),
-                            "engagement": "높음",
-                            "keywords": self._extract_keywords(title),
-                            "thumbnail": "📱",
-                            "why_viral": self._analyze_viral_factors(title),
-                            "video_id": video_id,
-                            "youtube_url": f"https://www.youtube.com/watch?v={video_id}",
-                            "shorts_url": href,
-                            "is_shorts": True,
-                            "region": "국내",
-                            "language": "한국어",
-                            "trend_score": self._calculate_trend_score(title)
-                        }
-                        
-                        videos.append(video_data)
+                        video_data = enrich({
+                            'title': title,
+                            'video_id': video_id,
+                            'views': self._get_view_count(element),
+                            'is_shorts': True,
+                        })
+                        if video_data:
+                            videos.append(video_data)
                         
                 except Exception as e:
                     continue
@@ -151,23 +142,6 @@ class YouTubeShortsCrawler:
             print(f"❌ 실제 데이터 추출 오류: {e}")
             return []
     
-    def _categorize_video(self, title: str) -> str:
-        """영상 제목으로 카테고리 분류"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['부업', '창업', '돈', '수익', 'n잡']):
-            return '창업/부업'
-        elif any(word in title_lower for word in ['주식', '투자', '재테크', '코인']):
-            return '재테크/금융'
-        elif any(word in title_lower for word in ['ai', 'chatgpt', '코딩', '개발']):
-            return '과학기술'
-        elif any(word in title_lower for word in ['운동', '헬스', '다이어트']):
-            return '운동/건강'
-        elif any(word in title_lower for word in ['요리', '레시피', '먹방']):
-            return '요리/음식'
-        else:
-            return '기타'
-    
     def _get_view_count(self, element) -> str:
         """조회수 추출"""
         try:
@@ -176,63 +150,6 @@ class YouTubeShortsCrawler:
         except:
             return "조회수 없음"
     
-    def _extract_keywords(self, title: str) -> List[str]:
-        """제목에서 키워드 추출"""
-        keywords = []
-        
-        # 주요 키워드 패턴
-        patterns = {
-            '부업': ['부업', 'n잡', '투잡', '사이드'],
-            '돈': ['돈', '수익', '월급', '벌기'],
-            '주식': ['주식', '투자', '재테크'],
-            'AI': ['ai', 'chatgpt', '인공지능'],
-            '운동': ['운동', '헬스', '다이어트'],
-            '요리': ['요리', '레시피', '먹방']
-        }
-        
-        for category, words in patterns.items():
-            if any(word in title.lower() for word in words):
-                keywords.append(category)
-        
-        return keywords[:3]
-    
-    def _analyze_viral_factors(self, title: str) -> str:
-        """바이럴 요소 분석"""
-        elements = []
-        
-        if re.search(r'\d+', title):
-            elements.append("숫자")
-        if re.search(r'[!?]', title):
-            elements.append("감정")
-        if re.search(r'비법|꿀팁|방법', title):
-            elements.append("하우투")
-        
-        return " + ".join(elements) if elements else "흥미로운 주제"
-    
-    def _calculate_trend_score(self, title: str) -> int:
-        """트렌드 점수 계산"""
-        score = 50  # 기본 점수
-        
-        # 제목 길이
-        if len(title) > 20:
-            score += 10
-        
-        # 숫자 포함
-        if re.search(r'\d+', title):
-            score += 15
-        
-        # 감정 표현
-        if re.search(r'[!?]', title):
-            score += 10
-        
-        # 키워드 점수
-        viral_keywords = ['비법', '꿀팁', '방법', '공개', '진짜', '절대']
-        for keyword in viral_keywords:
-            if keyword in title:
-                score += 5
-        
-        return min(score, 100)
-    
     def _crawl_from_shorts_page(self, driver, count: int) -> List[Dict]:
         """Shorts 메인 페이지에서 크롤링"""
         videos = []
@@ -335,17 +252,9 @@ class YouTubeShortsCrawler:
                                     break
                                     
                                 try:
-                                    video_info = self._extract_video_info_from_element(element)
+                                    # 카테고리 강제 설정
+                                    video_info = self._extract_video_info_from_element(element, category)
                                     if video_info and self._is_shorts_video(video_info):
-                                        # 카테고리 강제 설정
-                                        video_info["category"] = category
-                                        video_info["thumbnail"] = self._get_emoji(category)
-                                        
-                                        # 지역/언어 감지
-                                        region, language = self._detect_region_and_language(video_info["title"])
-                                        video_info["region"] = region
-                                        video_info["language"] = language
-                                        
                                         videos.append(video_info)
                                         category_video_counts[category] += 1
                                 except Exception as e:
@@ -392,14 +301,14 @@ class YouTubeShortsCrawler:
                 pass
             
             if title and video_id:
-                return self._create_shorts_video_info(title, views, video_id, href)
+                return self._create_shorts_video_info(title, views, video_id)
                 
         except Exception as e:
             pass
         
         return None
     
-    def _extract_video_info_from_element(self, element) -> Dict:
+    def _extract_video_info_from_element(self, element, category: Optional[str] = None) -> Optional[Dict]:
         """일반 동영상 요소에서 정보 추출"""
         try:
             # 제목
@@ -420,7 +329,7 @@ class YouTubeShortsCrawler:
                 pass
             
             if title and video_id:
-                return self._create_shorts_video_info(title, views, video_id, href)
+                return self._create_shorts_video_info(title, views, video_id, category)
                 
         except Exception as e:
             pass
@@ -461,294 +370,16 @@ class YouTubeShortsCrawler:
         
         return False
     
-    def _create_shorts_video_info(self, title: str, views: str, video_id: str, original_url: str) -> Dict:
-        """Shorts 동영상 정보 생성"""
-        keywords = self._extract_keywords_from_title(title)
-        category = self._estimate_category(title, keywords)
-        
-        # 지역 및 언어 감지
-        region, language = self._detect_region_and_language(title)
-        
-        # Shorts URL 생성
-        shorts_url = f"https://www.youtube.com/shorts/{video_id}" if video_id else original_url
-        youtube_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else original_url
-        
-        return {
-            "title": title,
-            "category": category,
-            "views": self._format_views(views),
-            "engagement": self._estimate_engagement(views),
-            "keywords": keywords,
-            "thumbnail": self._get_emoji(category),
-            "why_viral": self._analyze_viral_elements(title),
-            "video_id": video_id,
-            "youtube_url": youtube_url,
-            "shorts_url": shorts_url,
-            "crawled_at": datetime.now().isoformat(),
-            "is_shorts": True,
-            "region": region,
-            "language": language,
-            "trend_score": self._calculate_trend_score(views, engagement="높음")
-        }
-    
-    def _extract_keywords_from_title(self, title: str) -> List[str]:
-        """제목에서 키워드 추출 (한국어 최적화)"""
-        keywords = []
-        
-        # 한국어 키워드 패턴
-        keyword_patterns = {
-            '부업': r'부업|사이드잡|n잡|투잡|부수입',
-            '재테크': r'재테크|돈|수익|벌기|월급|저축',
-            '투자': r'투자|주식|부동산|코인|ETF|펀드',
-            'AI': r'AI|인공지능|ChatGPT|미드저니|뉴럴',
-            '개발': r'개발|코딩|프로그래밍|앱|웹사이트',
-            '마케팅': r'마케팅|SNS|인스타|틱톡|유튜브|브랜딩',
-            '창업': r'창업|사업|스타트업|온라인사업',
-            '자기계발': r'자기계발|루틴|습관|성공|동기부여',
-            '요리': r'요리|레시피|먹방|간단요리',
-            '운동': r'운동|다이어트|홈트|헬스|필라테스'
-        }
-        
-        for keyword, pattern in keyword_patterns.items():
-            if re.search(pattern, title, re.IGNORECASE):
-                keywords.append(keyword)
-        
-        # 숫자 관련 키워드
-        if re.search(r'\d+만원|\d+천|\d+억', title):
-            keywords.append('구체적금액')
-        if re.search(r'\d+개월|\d+일|\d+년|\d+주', title):
-            keywords.append('기간명시')
-        if re.search(r'TOP\d+|상위\d+|\d+가지', title):
-            keywords.append('리스트형')
-        
-        return keywords[:5] if keywords else ['일반']
-    
-    def _estimate_category(self, title: str, keywords: List[str]) -> str:
-        """YouTube 공식 카테고리 기반 추정"""
-        title_lower = title.lower()
-        
-        # YouTube 카테고리별 키워드 매핑
-        category_patterns = {
-            '영화/애니메이션': [
-                r'영화|movie|film|애니|animation|애니메이션|만화|드라마|netflix|넷플릭스'
-            ],
-            '자동차/차량': [
-                r'자동차|차|car|vehicle|drive|운전|슈퍼카|tesla|테슬라|bmw|벤츠'
-            ],
-            '음악': [
-                r'음악|music|노래|song|가수|singer|아이돌|kpop|힙합|발라드|jazz'
-            ],
-            '반려동물/동물': [
-                r'강아지|고양이|dog|cat|pet|반려동물|동물|animal|puppy|kitten'
-            ],
-            '스포츠': [
-                r'축구|야구|농구|football|soccer|baseball|basketball|운동|스포츠|sport|피트니스|헬스'
-            ],
-            '여행/이벤트': [
-                r'여행|travel|trip|관광|해외|vacation|호텔|flight|비행기'
-            ],
-            '게임': [
-                r'게임|game|gaming|롤|lol|배그|pubg|오버워치|마인크래프트|e스포츠'
-            ],
-            '인물/블로그': [
-                r'브이로그|vlog|일상|daily|루틴|routine|하루|life'
-            ],
-            '코미디': [
-                r'웃긴|funny|comedy|코미디|개그|유머|몰카|prank'
-            ],
-            '엔터테인먼트': [
-                r'예능|entertainment|방송|tv|쇼|show|연예인|celebrity'
-            ],
-            '뉴스/정치': [
-                r'뉴스|news|정치|politics|이슈|사건|시사|북한'
-            ],
-            '노하우/스타일': [
-                r'메이크업|makeup|패션|fashion|스타일|style|뷰티|beauty|옷|코디'
-            ],
-            '교육': [
-                r'교육|education|강의|lecture|수업|공부|study|학습|배우|learn'
-            ],
-            '과학기술': [
-                r'AI|인공지능|과학|science|기술|tech|technology|로봇|우주|space|코딩|프로그래밍'
-            ],
-            '비영리/사회운동': [
-                r'봉사|volunteer|기부|donation|환경|environment|ngo|캠페인'
-            ],
-            '요리/음식': [
-                r'요리|recipe|레시피|음식|food|cooking|먹방|mukbang|맛집'
-            ],
-            '자기계발': [
-                r'자기계발|동기부여|motivation|성공|success|습관|habit|목표|명언'
-            ],
-            '재테크/금융': [
-                r'재테크|투자|주식|stock|부동산|코인|bitcoin|돈|money|수익|펀드|저축'
-            ],
-            '창업/부업': [
-                r'창업|부업|사업|business|startup|스타트업|사이드|n잡|투잡|온라인사업'
-            ],
-            '마케팅/비즈니스': [
-                r'마케팅|marketing|광고|브랜딩|sns|인스타|유튜브|틱톡'
-            ]
-        }
-        
-        # 키워드 매칭
-        for category, patterns in category_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, title_lower, re.IGNORECASE):
-                    return category
-                if any(re.search(pattern, kw.lower(), re.IGNORECASE) for kw in keywords):
-                    return category
-        
-        return '일반'
-    
-    def _format_views(self, views_text: str) -> str:
-        """조회수 포맷"""
-        if not views_text or views_text == "N/A":
-            # Shorts는 조회수가 표시되지 않는 경우가 많음
-            return f"{random.randint(50, 500)}K"
-        
-        # 숫자 추출
-        numbers = re.findall(r'[\d,]+', views_text.replace(',', ''))
-        if numbers:
-            count = int(numbers[0])
-            if count >= 1000000:
-                return f"{count/1000000:.1f}M"
-            elif count >= 1000:
-                return f"{count/1000:.0f}K"
-            return str(count)
-        
-        return f"{random.randint(50, 500)}K"
-    
-    def _estimate_engagement(self, views: str) -> str:
-        """참여도 추정 (Shorts 기준)"""
-        if 'M' in views:
-            return '매우높음'
-        elif 'K' in views:
-            try:
-                num = float(views.replace('K', ''))
-                return '매우높음' if num > 100 else '높음'  # Shorts는 기준이 낮음
-            except:
-                return '높음'
-        return '보통'
-    
-    def _get_emoji(self, category: str) -> str:
-        """카테고리별 이모지"""
-        emojis = {
-            '영화/애니메이션': '🎬',
-            '자동차/차량': '🚗',
-            '음악': '🎵',
-            '반려동물/동물': '🐾',
-            '스포츠': '⚽',
-            '여행/이벤트': '✈️',
-            '게임': '🎮',
-            '인물/블로그': '👤',
-            '코미디': '😂',
-            '엔터테인먼트': '🎭',
-            '뉴스/정치': '📰',
-            '노하우/스타일': '💄',
-            '교육': '📚',
-            '과학기술': '🔬',
-            '비영리/사회운동': '🤝',
-            '요리/음식': '🍳',
-            '자기계발': '💪',
-            '재테크/금융': '💰',
-            '창업/부업': '💼',
-            '마케팅/비즈니스': '📱',
-            '일반': '📺'
-        }
-        return emojis.get(category, '📺')
-    
-    def _analyze_viral_elements(self, title: str) -> str:
-        """바이럴 요소 분석"""
-        elements = []
-        
-        if re.search(r'\d+만원|\d+억|\d+천', title):
-            elements.append("구체적 금액")
-        if re.search(r'\d+개월|\d+일|\d+주', title):
-            elements.append("기간 명시")
-        if re.search(r'비법|꿀팁|방법|노하우', title):
-            elements.append("하우투")
-        if re.search(r'공개|솔직|진짜|실제', title):
-            elements.append("진정성")
-        if re.search(r'충격|놀라운|대박|미친', title):
-            elements.append("충격 요소")
-        if re.search(r'TOP\d+|\d+가지|\d+개', title):
-            elements.append("리스트형")
-        
-        return " + ".join(elements) if elements else "흥미로운 주제"
-    
-    def _detect_region_and_language(self, title: str) -> tuple:
-        """제목에서 지역과 언어 감지 - 개선된 로직"""
-        
-        # 한글 문자가 있는지 확인
-        has_korean = bool(re.search(r'[가-힣]', title))
-        
-        # 영어 단어가 있는지 확인 (3글자 이상의 연속된 영문자)
-        has_english_words = bool(re.search(r'\b[a-zA-Z]{3,}\b', title))
-        
-        # 한국어 특화 키워드
-        korean_keywords = [
-            '부업', '재테크', '투자', '창업', '마케팅', 'AI', '자기계발',
-            '월', '만원', '억', '천만원', '수익', '벌기', '쇼츠', '유튜브',
-            '한국', '국내', '서울', '부산', '대구', '인천', '광주', '대전',
-            '게임', '롤', '배그', 'FIFA', '마인크래프트', '메이크업', '패션',
-            '뷰티', '스타일', '강아지', '고양이', '반려동물', '요리', '음식',
-            '음악', '노래', '댄스', '춤', '코미디', '웃음', '개그'
-        ]
-        
-        # 영어 특화 키워드 (한국어 제목에서 자주 나오는 영어 단어는 제외)
-        english_keywords = [
-            'business', 'investment', 'marketing', 'entrepreneur', 'startup', 
-            'money', 'profit', 'how to', 'make money', 'side hustle', 
-            'passive income', 'tutorial', 'guide', 'tips', 'tricks'
-        ]
-        
-        # 한국어 키워드 점수
-        korean_keyword_count = sum(1 for keyword in korean_keywords if keyword in title)
-        
-        # 영어 키워드 점수
-        english_keyword_count = sum(1 for keyword in english_keywords if keyword.lower() in title.lower())
-        
-        # 판정 로직
-        if has_korean:
-            # 한글이 있으면 기본적으로 국내 콘텐츠
-            if korean_keyword_count > 0 or not has_english_words:
-                return "국내", "한국어"
-            else:
-                # 한글이 있지만 영어 키워드가 더 많으면 해외
-                return "해외", "한국어" if korean_keyword_count > english_keyword_count else "영어"
-        else:
-            # 한글이 없으면 영어 콘텐츠
-            return "해외", "영어"
-    
-    def _calculate_trend_score(self, views: str, engagement: str) -> int:
-        """트렌드 점수 계산 (1-100)"""
-        score = 50  # 기본 점수
-        
-        # 조회수 기반 점수
-        if 'M' in views:
-            score += 30
-        elif 'K' in views:
-            try:
-                num = float(views.replace('K', ''))
-                if num > 100:
-                    score += 25
-                elif num > 50:
-                    score += 15
-                elif num > 10:
-                    score += 10
-            except:
-                score += 5
-        
-        # 참여도 기반 점수
-        if engagement == '매우높음':
-            score += 20
-        elif engagement == '높음':
-            score += 15
-        elif engagement == '보통':
-            score += 5
-        
-        return min(100, max(1, score))
+    def _create_shorts_video_info(self, title: str, views: str, video_id: str,
+                                  category: Optional[str] = None) -> Optional[Dict]:
+        """Shorts 동영상 정보 생성 (공용 가공 파이프라인)"""
+        return enrich({
+            'title': title,
+            'video_id': video_id,
+            'views': views,
+            'is_shorts': True,
+            'category': category,
+        })
     
     def _deduplicate_videos(self, videos: List[Dict]) -> List[Dict]:
         """중복 동영상 제거"""
@@ -1206,9 +837,8 @@ class YouTubeShortsCrawler:
             "source": "shorts_crawler"
         }
         
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        
+        # 임시 파일 + os.replace로 저장 (저장소가 있으면 스냅샷 교체도 함께)
+        publish_cache(self.cache_file, cache_data)
         self.last_update = datetime.now()
         print(f"💾 Shorts 캐시 저장 완료: {self.cache_file}")
     
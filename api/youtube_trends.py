@@ -225,26 +225,41 @@ class YouTubeTrendsAnalyzer:
         views_str = views_str.replace("M", "000000").replace("K", "000")
         return int(float(views_str))
     
-    def extract_keywords_from_videos(self, videos: List[Dict]) -> Dict:
-        """급상승 동영상들에서 키워드 추출 및 분석"""
-        all_keywords = []
-        category_keywords = {}
-        
-        for video in videos:
-            keywords = video.get("keywords", [])
-            category = video.get("category", "")
+    def extract_keywords_from_videos(self, videos: List[Dict], keyword_index=None) -> Dict:
+        """급상승 동영상들에서 키워드 추출 및 분석
+
+        keyword_index: videos의 키워드 역색인(KeywordIndex)이 있으면 빈도를 다시 세지 않고 사용
+        """
+        if keyword_index is not None:
+            top_keywords = keyword_index.top(k=20)
+            keyword_freq = Counter(dict(top_keywords))
+            category_keywords = {
+                category: [kw for kw, _ in keyword_index.top(category, 5)]
+                for category in keyword_index.categories()
+            }
+        else:
+            all_keywords = []
+            category_keywords = {}
             
-            all_keywords.extend(keywords)
+            for video in videos:
+                keywords = video.get("keywords", [])
+                category = video.get("category", "")
+                
+                all_keywords.extend(keywords)
+                
+                if category not in category_keywords:
+                    category_keywords[category] = []
+                category_keywords[category].extend(keywords)
             
-            if category not in category_keywords:
-                category_keywords[category] = []
-            category_keywords[category].extend(keywords)
-        
-        # 키워드 빈도 분석
-        keyword_freq = Counter(all_keywords)
-        
-        # 상위 키워드
-        top_keywords = keyword_freq.most_common(20)
+            # 키워드 빈도 분석
+            keyword_freq = Counter(all_keywords)
+            
+            # 상위 키워드
+            top_keywords = keyword_freq.most_common(20)
+            category_keywords = {
+                category: list(set(keywords))[:5]
+                for category, keywords in category_keywords.items()
+            }
         
         return {
             "전체_인기_키워드": [
@@ -255,10 +270,7 @@ class YouTubeTrendsAnalyzer:
                 }
                 for kw, freq in top_keywords
             ],
-            "카테고리별_키워드": {
-                category: list(set(keywords))[:5]
-                for category, keywords in category_keywords.items()
-            },
+            "카테고리별_키워드": category_keywords,
             "트렌드_분석": self.analyze_trends(videos),
             "키워드_조합_추천": self.suggest_keyword_combinations(keyword_freq)
         }
@@ -4,15 +4,170 @@ YouTube Data API 없이도 실제 데이터 수집 가능
 """
 import yt_dlp
 import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
-import re
+from typing import List, Dict, Optional
+from enrichment import enrich
+from video_store import publish_cache, publish_changes
+
+# yt-dlp 검색 요청이 향하는 호스트 (호스트별 속도 제한 키)
+YOUTUBE_HOST = 'www.youtube.com'
+
+
+class _HostRateLimiter:
+    """호스트별 최소 요청 간격을 지키는 속도 제한기 (스레드 안전)"""
+    
+    def __init__(self, requests_per_second: float):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, host: str):
+        """다음 요청 슬롯까지 대기"""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _YoutubeDLPool:
+    """옵션 조합별로 재사용하는 장기 YoutubeDL 핸들 풀 (스레드 안전)
+    
+    핸들 하나는 한 번에 한 스레드만 사용하고, 반납된 핸들은 같은 옵션의
+    다음 검색에 재사용해 extractor 초기화/세션 설정 비용을 줄인다.
+    """
+    
+    def __init__(self, max_idle_per_key: int = 8):
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[str, List] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(ydl_opts: Dict) -> str:
+        return json.dumps(ydl_opts, sort_keys=True, default=repr)
+    
+    def acquire(self, ydl_opts: Dict):
+        """옵션에 맞는 핸들 대여 (없으면 새로 생성)"""
+        key = self._key(ydl_opts)
+        with self._lock:
+            stats = self._stats.setdefault(key, {"created": 0, "reused": 0, "discarded": 0, "in_use": 0})
+            stats["in_use"] += 1
+            idle = self._idle.get(key)
+            if idle:
+                stats["reused"] += 1
+                return idle.pop()
+            stats["created"] += 1
+        return yt_dlp.YoutubeDL(dict(ydl_opts))
+    
+    def release(self, ydl_opts: Dict, ydl, discard: bool = False):
+        """핸들 반납 (오류가 난 핸들은 폐기)"""
+        key = self._key(ydl_opts)
+        with self._lock:
+            stats = self._stats[key]
+            stats["in_use"] -= 1
+            idle = self._idle.setdefault(key, [])
+            if not discard and len(idle) < self.max_idle_per_key:
+                idle.append(ydl)
+                return
+            stats["discarded"] += 1
+        self._close(ydl)
+    
+    def close(self):
+        """대기 중인 핸들 모두 닫기"""
+        with self._lock:
+            handles = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        for ydl in handles:
+            self._close(ydl)
+    
+    def stats(self) -> Dict:
+        """재사용 통계 (옵션 조합별 + 합계)"""
+        with self._lock:
+            per_key = {key: dict(stats, idle=len(self._idle.get(key, []))) for key, stats in self._stats.items()}
+        created = sum(stats["created"] for stats in per_key.values())
+        reused = sum(stats["reused"] for stats in per_key.values())
+        return {
+            "handles_created": created,
+            "handles_reused": reused,
+            "reuse_ratio": round(reused / (created + reused), 3) if created + reused else 0,
+            "option_sets": per_key
+        }
+    
+    @staticmethod
+    def _close(ydl):
+        close = getattr(ydl, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+
 
 class YouTubeYTDLPCrawler:
-    def __init__(self, cache_file: str = "../data/youtube_shorts_cache.json"):
+    # 검색에 공통으로 쓰는 yt-dlp 옵션 (목록만 추출)
+    SEARCH_OPTS = {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': True,
+    }
+    
+    # 카테고리별 한국어 검색 키워드
+    CATEGORY_KEYWORDS_KO = {
+        '창업/부업': ['부업', '창업', '사업', '스타트업', 'n잡', '투잡'],
+        '재테크/금융': ['재테크', '주식', '투자', '부동산', '코인', '돈버는법'],
+        '과학기술': ['ChatGPT', 'AI', '코딩', '프로그래밍', '개발', '앱개발'],
+        '자기계발': ['자기계발', '루틴', '습관', '동기부여', '성공', '목표'],
+        '마케팅/비즈니스': ['마케팅', 'SNS', '인스타', '유튜브', '브랜딩', '광고'],
+        '요리/음식': ['요리', '레시피', '간단요리', '먹방', '맛집', '다이어트식단'],
+        '게임': ['게임', '롤', '배그', 'LOL', 'FIFA', '마인크래프트'],
+        '운동/건강': ['운동', '헬스', '다이어트', '홈트', '요가', '필라테스'],
+        '교육/학습': ['공부', '영어', '학습', '수험생', '공무원', '자격증'],
+        '음악': ['노래', '음악', 'K-POP', '가수', '뮤직비디오', '커버']
+    }
+    
+    # 카테고리별 영어 검색 키워드
+    CATEGORY_KEYWORDS_EN = {
+        '창업/부업': ['side hustle', 'startup', 'business', 'entrepreneur', 'make money'],
+        '재테크/금융': ['investing', 'stock market', 'real estate', 'crypto', 'money'],
+        '과학기술': ['AI', 'ChatGPT', 'coding', 'programming', 'tech', 'app'],
+        '자기계발': ['self improvement', 'productivity', 'motivation', 'success', 'habits'],
+        '마케팅/비즈니스': ['marketing', 'social media', 'instagram', 'youtube', 'branding'],
+        '요리/음식': ['cooking', 'recipe', 'food', 'baking', 'meal prep'],
+        '게임': ['gaming', 'gameplay', 'esports', 'minecraft', 'fortnite'],
+        '운동/건강': ['workout', 'fitness', 'diet', 'gym', 'exercise'],
+        '교육/학습': ['education', 'learning', 'study', 'tutorial', 'course'],
+        '음악': ['music', 'song', 'cover', 'remix', 'beats']
+    }
+    
+    def __init__(self, cache_file: str = "../data/youtube_shorts_cache.json",
+                 max_workers: Optional[int] = None, requests_per_second: Optional[float] = None):
         self.cache_file = Path(cache_file)
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 병렬 검색 설정 (환경 변수로 조정 가능)
+        self.max_workers = max_workers or int(os.getenv('YTDLP_MAX_WORKERS', '4'))
+        if requests_per_second is None:
+            requests_per_second = float(os.getenv('YTDLP_REQUESTS_PER_SECOND', '2'))
+        self.rate_limiter = _HostRateLimiter(requests_per_second)
+        
+        # 검색 간에 재사용하는 YoutubeDL 핸들 풀
+        self.ydl_pool = _YoutubeDLPool(max_idle_per_key=self.max_workers)
+        
+        # 마지막 카테고리 크롤링의 작업별 지연 시간 통계
+        self.last_crawl_stats: Dict = {}
+        
+        # 증분 모드: 마지막으로 내보낸 영상별 지문 (video_id → 변경 감지 값)
+        self._emitted: Dict[str, tuple] = {}
     
     def get_trending_videos(self, max_results: int = 100, include_shorts: bool = True, include_long: bool = True) -> List[Dict]:
         """yt-dlp로 실제 급상승 영상 가져오기 (쇼츠 + 롱폼)"""
@@ -58,391 +213,224 @@ class YouTubeYTDLPCrawler:
                 return []
     
     def get_trending_by_category(self, categories: List[str], per_category: int = 50) -> List[Dict]:
-        """카테고리별로 영상 수집 (한국어 60% + 영어 40%)"""
-        all_videos = []
+        """카테고리별로 영상 수집 (한국어 60% + 영어 40%)
+        
+        (카테고리, 언어, 키워드) 검색을 작업 풀로 병렬 실행하고, 완료되는 대로
+        결과를 합친다. 카테고리/언어별 목표 개수에 필요한 키워드만 먼저 검색하고
+        부족할 때만 다음 키워드를 추가로 검색한다.
+        """
+        started = time.monotonic()
         
+        # (카테고리, 언어)별 검색 그룹
+        groups = []
         for category in categories:
-            print(f"📂 {category} 카테고리 크롤링 중 (목표: {per_category}개)...")
-            try:
-                # 한국어 60%, 영어 40%
-                korean_count = int(per_category * 0.6)
-                english_count = int(per_category * 0.4)
-                
-                # 한국어 영상
-                category_videos_kr = self._search_by_category(category, korean_count)
-                all_videos.extend(category_videos_kr)
-                
-                # 영어 영상 (카테고리의 영어 키워드로 검색)
-                category_videos_en = self._search_by_category_english(category, english_count)
-                all_videos.extend(category_videos_en)
-                
-                total_collected = len(category_videos_kr) + len(category_videos_en)
-                print(f"   ✅ {total_collected}개 수집 완료 (한국어: {len(category_videos_kr)}, 영어: {len(category_videos_en)})")
-            except Exception as e:
-                print(f"   ❌ 실패: {e}")
+            # 한국어 60%, 영어 40%
+            korean_count = int(per_category * 0.6)
+            english_count = int(per_category * 0.4)
+            
+            groups.append(self._keyword_group(
+                category, True, korean_count,
+                self.CATEGORY_KEYWORDS_KO.get(category, [category]), min_per_keyword=10
+            ))
+            groups.append(self._keyword_group(
+                category, False, english_count,
+                self.CATEGORY_KEYWORDS_EN.get(category, ['trending']), min_per_keyword=5
+            ))
+        
+        print(f"📂 {len(categories)}개 카테고리 병렬 크롤링 시작 (작업자 {self.max_workers}명, 카테고리당 목표 {per_category}개)...")
+        
+        task_stats = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ytdlp') as executor:
+            pending = {}
+            
+            def submit_next(group):
+                keyword_index = group['next']
+                group['next'] += 1
+                group['running'] += 1
+                future = executor.submit(
+                    self._timed_search, group['keywords'][keyword_index],
+                    group['per_keyword'], group['is_korean'], group['category']
+                )
+                pending[future] = (group, keyword_index)
+            
+            # 목표 개수를 채우는 데 필요한 키워드만 먼저 제출
+            for group in groups:
+                initial = min(len(group['keywords']), math.ceil(group['target'] / group['per_keyword']))
+                for _ in range(initial):
+                    submit_next(group)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group, keyword_index = pending.pop(future)
+                    group['running'] -= 1
+                    videos, latency, error = future.result()
+                    group['results'][keyword_index] = videos
+                    group['collected'] += len(videos)
+                    task_stats.append({
+                        "category": group['category'],
+                        "language": "한국어" if group['is_korean'] else "영어",
+                        "keyword": group['keywords'][keyword_index],
+                        "videos": len(videos),
+                        "latency": round(latency, 3),
+                        "error": error
+                    })
+                    
+                    # 목표에 못 미치면 다음 키워드 검색
+                    if (group['collected'] < group['target']
+                            and group['running'] == 0
+                            and group['next'] < len(group['keywords'])):
+                        submit_next(group)
+        
+        # 카테고리/키워드 순서대로 합쳐 목표 개수만큼 사용
+        all_videos = []
+        for category in categories:
+            collected = {}
+            for group in groups:
+                if group['category'] != category:
+                    continue
+                videos = []
+                for keyword_index in sorted(group['results']):
+                    videos.extend(group['results'][keyword_index])
+                collected[group['is_korean']] = videos[:group['target']]
+            all_videos.extend(collected[True])
+            all_videos.extend(collected[False])
+            print(f"   ✅ {category}: {len(collected[True]) + len(collected[False])}개 수집 완료 (한국어: {len(collected[True])}, 영어: {len(collected[False])})")
+        
+        wall_time = time.monotonic() - started
+        latencies = [stat['latency'] for stat in task_stats]
+        self.last_crawl_stats = {
+            "wall_time": round(wall_time, 3),
+            "max_workers": self.max_workers,
+            "task_count": len(task_stats),
+            "failed_tasks": sum(1 for stat in task_stats if stat['error']),
+            "avg_latency": round(sum(latencies) / len(latencies), 3) if latencies else 0,
+            "max_latency": max(latencies) if latencies else 0,
+            "ydl_pool": self.ydl_pool.stats(),
+            "tasks": task_stats
+        }
         
         print(f"\n🎉 전체 수집 완료: {len(all_videos)}개 영상")
+        print(f"⏱️ 검색 {len(task_stats)}건, 소요 {wall_time:.1f}초 "
+              f"(평균 {self.last_crawl_stats['avg_latency']:.2f}초, 최대 {self.last_crawl_stats['max_latency']:.2f}초)")
         return all_videos
     
-    def _search_by_category_english(self, category: str, max_results: int) -> List[Dict]:
-        """특정 카테고리의 영어 영상 검색"""
-        # 카테고리별 영어 검색 키워드
-        category_keywords_en = {
-            '창업/부업': ['side hustle', 'startup', 'business', 'entrepreneur', 'make money'],
-            '재테크/금융': ['investing', 'stock market', 'real estate', 'crypto', 'money'],
-            '과학기술': ['AI', 'ChatGPT', 'coding', 'programming', 'tech', 'app'],
-            '자기계발': ['self improvement', 'productivity', 'motivation', 'success', 'habits'],
-            '마케팅/비즈니스': ['marketing', 'social media', 'instagram', 'youtube', 'branding'],
-            '요리/음식': ['cooking', 'recipe', 'food', 'baking', 'meal prep'],
-            '게임': ['gaming', 'gameplay', 'esports', 'minecraft', 'fortnite'],
-            '운동/건강': ['workout', 'fitness', 'diet', 'gym', 'exercise'],
-            '교육/학습': ['education', 'learning', 'study', 'tutorial', 'course'],
-            '음악': ['music', 'song', 'cover', 'remix', 'beats']
+    def _keyword_group(self, category: str, is_korean: bool, target: int,
+                       keywords: List[str], min_per_keyword: int) -> Dict:
+        """(카테고리, 언어) 검색 그룹 상태"""
+        return {
+            "category": category,
+            "is_korean": is_korean,
+            "target": target,
+            "keywords": keywords,
+            "per_keyword": max(min_per_keyword, target // len(keywords)),
+            "next": 0,
+            "running": 0,
+            "collected": 0,
+            "results": {}
         }
+    
+    def _timed_search(self, keyword: str, per_keyword: int, is_korean: bool,
+                      category: Optional[str] = None) -> tuple:
+        """키워드 검색 1건 실행 - (영상 목록, 지연 시간, 오류) 반환"""
+        started = time.monotonic()
+        try:
+            videos = self._search_keyword(keyword, per_keyword, is_korean, category)
+            return videos, time.monotonic() - started, None
+        except Exception as e:
+            return [], time.monotonic() - started, str(e)
+    
+    def _search_keyword(self, keyword: str, per_keyword: int, is_korean: bool,
+                        category: Optional[str] = None) -> List[Dict]:
+        """ytsearch로 키워드 1개 검색 후 파싱"""
+        self.rate_limiter.wait(YOUTUBE_HOST)
+        result = self._extract_info(f'ytsearch{per_keyword}:{keyword}', self.SEARCH_OPTS)
         
-        keywords = category_keywords_en.get(category, ['trending'])
         videos = []
-        
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-        }
-        
-        per_keyword = max(5, max_results // len(keywords))
-        
-        for keyword in keywords:
-            if len(videos) >= max_results:
-                break
-            
-            try:
-                search_url = f'ytsearch{per_keyword}:{keyword}'
-                
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    result = ydl.extract_info(search_url, download=False)
-                    
-                    if result and 'entries' in result:
-                        for entry in result['entries']:
-                            if entry and len(videos) < max_results:
-                                video_info = self._parse_ytdlp_data(entry, is_korean=False)
-                                if video_info:
-                                    video_info['category'] = category  # 카테고리 강제 설정
-                                    videos.append(video_info)
-            except Exception as e:
-                continue
-        
+        if result and 'entries' in result:
+            for entry in result['entries']:
+                if entry:
+                    # 카테고리 검색이면 카테고리 강제 설정
+                    video_info = self._parse_ytdlp_data(entry, category=category)
+                    if video_info:
+                        videos.append(video_info)
         return videos
     
+    def _extract_info(self, url: str, ydl_opts: Dict) -> Optional[Dict]:
+        """풀에서 빌린 YoutubeDL 핸들로 정보 추출"""
+        ydl = self.ydl_pool.acquire(ydl_opts)
+        failed = True
+        try:
+            result = ydl.extract_info(url, download=False)
+            failed = False
+            return result
+        finally:
+            self.ydl_pool.release(ydl_opts, ydl, discard=failed)
+    
+    def _search_by_category_english(self, category: str, max_results: int) -> List[Dict]:
+        """특정 카테고리의 영어 영상 검색"""
+        keywords = self.CATEGORY_KEYWORDS_EN.get(category, ['trending'])
+        return self._search_keywords(keywords, max_results, is_korean=False,
+                                     per_keyword=max(5, max_results // len(keywords)), category=category)
+    
     def _search_by_category(self, category: str, max_results: int) -> List[Dict]:
         """특정 카테고리의 인기 영상 검색"""
-        # 카테고리별 검색 키워드
-        category_keywords = {
-            '창업/부업': ['부업', '창업', '사업', '스타트업', 'n잡', '투잡'],
-            '재테크/금융': ['재테크', '주식', '투자', '부동산', '코인', '돈버는법'],
-            '과학기술': ['ChatGPT', 'AI', '코딩', '프로그래밍', '개발', '앱개발'],
-            '자기계발': ['자기계발', '루틴', '습관', '동기부여', '성공', '목표'],
-            '마케팅/비즈니스': ['마케팅', 'SNS', '인스타', '유튜브', '브랜딩', '광고'],
-            '요리/음식': ['요리', '레시피', '간단요리', '먹방', '맛집', '다이어트식단'],
-            '게임': ['게임', '롤', '배그', 'LOL', 'FIFA', '마인크래프트'],
-            '운동/건강': ['운동', '헬스', '다이어트', '홈트', '요가', '필라테스'],
-            '교육/학습': ['공부', '영어', '학습', '수험생', '공무원', '자격증'],
-            '음악': ['노래', '음악', 'K-POP', '가수', '뮤직비디오', '커버']
-        }
-        
-        keywords = category_keywords.get(category, [category])
+        keywords = self.CATEGORY_KEYWORDS_KO.get(category, [category])
+        return self._search_keywords(keywords, max_results, is_korean=True,
+                                     per_keyword=max(10, max_results // len(keywords)), category=category)
+    
+    def _search_keywords(self, keywords: List[str], max_results: int, is_korean: bool,
+                         per_keyword: int, category: Optional[str] = None) -> List[Dict]:
+        """키워드를 순서대로 검색해 max_results개까지 수집"""
         videos = []
-        
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-        }
-        
-        per_keyword = max(10, max_results // len(keywords))
-        
         for keyword in keywords:
             if len(videos) >= max_results:
                 break
-            
             try:
-                search_url = f'ytsearch{per_keyword}:{keyword}'
-                
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    result = ydl.extract_info(search_url, download=False)
-                    
-                    if result and 'entries' in result:
-                        for entry in result['entries']:
-                            if entry and len(videos) < max_results:
-                                video_info = self._parse_ytdlp_data(entry, is_korean=True)
-                                if video_info:
-                                    video_info['category'] = category  # 카테고리 강제 설정
-                                    videos.append(video_info)
+                found = self._search_keyword(keyword, per_keyword, is_korean, category)
+                videos.extend(found[:max_results - len(videos)])
             except Exception as e:
                 continue
-        
         return videos
     
     def _search_korean_videos(self, max_results: int) -> List[Dict]:
         """한국어 인기 영상 검색"""
-        videos = []
-        
         # 한국어 인기 키워드들
         korean_keywords = [
             '부업', '재테크', '주식', 'ChatGPT', '마케팅', 
             '자기계발', '요리', '게임', '운동', '공부'
         ]
-        
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-        }
-        
-        per_keyword = max(5, max_results // len(korean_keywords))
-        
-        for keyword in korean_keywords:
-            if len(videos) >= max_results:
-                break
-            
-            try:
-                search_url = f'ytsearch{per_keyword}:{keyword}'
-                
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    result = ydl.extract_info(search_url, download=False)
-                    
-                    if result and 'entries' in result:
-                        for entry in result['entries']:
-                            if entry and len(videos) < max_results:
-                                video_info = self._parse_ytdlp_data(entry, is_korean=True)
-                                if video_info:
-                                    videos.append(video_info)
-            except Exception as e:
-                continue
-        
-        return videos
+        return self._search_keywords(korean_keywords, max_results, is_korean=True,
+                                     per_keyword=max(5, max_results // len(korean_keywords)))
     
     def _search_global_videos(self, max_results: int) -> List[Dict]:
         """글로벌 인기 영상 검색 (영어)"""
-        videos = []
-        
         # 영어 인기 키워드들
         english_keywords = [
             'side hustle', 'make money online', 'AI tools', 'productivity', 
             'entrepreneur', 'business', 'investing', 'crypto', 'fitness', 'cooking'
         ]
-        
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-        }
-        
-        per_keyword = max(5, max_results // len(english_keywords))
-        
-        for keyword in english_keywords:
-            if len(videos) >= max_results:
-                break
-            
-            try:
-                search_url = f'ytsearch{per_keyword}:{keyword}'
-                
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    result = ydl.extract_info(search_url, download=False)
-                    
-                    if result and 'entries' in result:
-                        for entry in result['entries']:
-                            if entry and len(videos) < max_results:
-                                video_info = self._parse_ytdlp_data(entry, is_korean=False)
-                                if video_info:
-                                    videos.append(video_info)
-            except Exception as e:
-                continue
-        
-        return videos
+        return self._search_keywords(english_keywords, max_results, is_korean=False,
+                                     per_keyword=max(5, max_results // len(english_keywords)))
     
-    def _parse_ytdlp_data(self, entry: dict, is_korean: bool = False) -> Dict:
-        """yt-dlp 데이터 파싱"""
-        try:
-            title = entry.get('title', '')
-            video_id = entry.get('id', '')
-            view_count = entry.get('view_count', 0)
-            duration = entry.get('duration', 0)
-            
-            if not title or not video_id:
-                return None
-            
-            # 쇼츠 여부 판단 (60초 이하)
-            is_shorts = duration and duration <= 60
-            
-            # 키워드 추출
-            keywords = self._extract_keywords(title)
-            category = self._estimate_category(title, keywords)
-            
-            # 지역/언어 판단 - 제목의 실제 언어 기반으로 판단
-            has_korean = bool(re.search(r'[가-힣]', title))
-            korean_ratio = len(re.findall(r'[가-힣]', title)) / len(title) if len(title) > 0 else 0
-            
-            # 한글이 30% 이상이면 한국어, 아니면 영어
-            if korean_ratio >= 0.1 or has_korean:
-                region = "국내"
-                language = "한국어"
-            else:
-                region = "해외"
-                language = "영어"
-            
-            return {
-                "title": title,
-                "category": category,
-                "views": self._format_views(view_count),
-                "engagement": self._calculate_engagement(view_count),
-                "keywords": keywords,
-                "thumbnail": self._get_emoji(category),
-                "why_viral": self._analyze_viral(title, view_count),
-                "video_id": video_id,
-                "youtube_url": f"https://www.youtube.com/watch?v={video_id}",
-                "shorts_url": f"https://www.youtube.com/shorts/{video_id}",
-                "is_shorts": is_shorts,
-                "video_type": "쇼츠" if is_shorts else "롱폼",
-                "duration": duration,
-                "region": region,
-                "language": language,
-                "trend_score": self._calculate_trend_score(view_count),
-                "crawled_at": datetime.now().isoformat()
-            }
-        except Exception as e:
-            return None
-    
-    def _format_views(self, count: int) -> str:
-        """조회수 포맷"""
-        if count >= 1000000:
-            return f"{count/1000000:.1f}M"
-        elif count >= 1000:
-            return f"{count/1000:.0f}K"
-        return str(count)
-    
-    def _calculate_engagement(self, view_count: int) -> str:
-        """참여도 계산"""
-        if view_count >= 1000000:
-            return "매우높음"
-        elif view_count >= 100000:
-            return "높음"
-        return "보통"
-    
-    def _calculate_trend_score(self, view_count: int) -> int:
-        """트렌드 점수"""
-        if view_count >= 5000000:
-            return 100
-        elif view_count >= 1000000:
-            return 95
-        elif view_count >= 500000:
-            return 90
-        elif view_count >= 100000:
-            return 85
-        return 70
-    
-    def _extract_keywords(self, title: str) -> List[str]:
-        """키워드 추출 - 더 많은 키워드 추출"""
-        keyword_patterns = {
-            '부업': r'부업|사이드|n잡|투잡|side.*hustle',
-            '재테크': r'재테크|돈|수익|벌기|money|earn',
-            '투자': r'투자|주식|부동산|코인|stock|invest',
-            'AI': r'AI|ChatGPT|인공지능|artificial',
-            '개발': r'개발|코딩|프로그래밍|coding|programming|dev',
-            '마케팅': r'마케팅|SNS|인스타|틱톡|marketing|instagram|tiktok',
-            '창업': r'창업|사업|스타트업|business|startup|entrepreneur',
-            '자기계발': r'자기계발|루틴|습관|동기부여|motivation|routine|habit',
-            '요리': r'요리|레시피|먹방|음식|cook|recipe|food',
-            '게임': r'게임|롤|배그|game|gaming|lol',
-            '운동': r'운동|헬스|다이어트|workout|fitness|diet',
-            '공부': r'공부|학습|영어|study|learn|english',
-            '브이로그': r'브이로그|일상|루틴|vlog|daily',
-            '리뷰': r'리뷰|추천|비교|review|recommend',
-            '꿀팁': r'꿀팁|비법|방법|노하우|tip|trick|hack'
-        }
-        
-        keywords = []
-        for keyword, pattern in keyword_patterns.items():
-            if re.search(pattern, title, re.IGNORECASE):
-                keywords.append(keyword)
-        
-        # 해시태그에서 추가 키워드 추출
-        hashtags = re.findall(r'#(\w+)', title)
-        for tag in hashtags[:3]:
-            if len(tag) > 2 and tag not in keywords:
-                keywords.append(tag)
-        
-        return keywords[:10] if keywords else ['트렌드']
-    
-    def _estimate_category(self, title: str, keywords: List[str]) -> str:
-        """카테고리 추정"""
-        if any(k in keywords for k in ['부업', '창업']):
-            return '창업/부업'
-        elif any(k in keywords for k in ['재테크', '투자']):
-            return '재테크/금융'
-        elif 'AI' in keywords or '개발' in keywords:
-            return '과학기술'
-        elif '마케팅' in keywords:
-            return '마케팅/비즈니스'
-        elif '자기계발' in keywords:
-            return '자기계발'
-        return '일반'
-    
-    def _get_emoji(self, category: str) -> str:
-        """카테고리별 이모지"""
-        emojis = {
-            '창업/부업': '💼', '재테크/금융': '💰', '과학기술': '🔬',
-            '자기계발': '💪', '마케팅/비즈니스': '📱', '게임': '🎮',
-            '요리/음식': '🍳', '교육': '📚', '음악': '🎵'
-        }
-        return emojis.get(category, '🎬')
-    
-    def _analyze_viral(self, title: str, view_count: int) -> str:
-        """바이럴 요소 분석"""
-        elements = []
-        
-        if view_count >= 1000000:
-            elements.append("초고조회수")
-        
-        if re.search(r'\d+만원|\d+억', title):
-            elements.append("구체적 금액")
-        if re.search(r'\d+개월|\d+일', title):
-            elements.append("기간 명시")
-        if re.search(r'비법|꿀팁|방법', title):
-            elements.append("하우투")
-        
-        return " + ".join(elements) if elements else "인기 급상승"
+    def _parse_ytdlp_data(self, entry: dict, category: Optional[str] = None) -> Optional[Dict]:
+        """yt-dlp 항목 → 공용 가공 파이프라인 (title/id가 없으면 None)"""
+        return enrich({
+            'title': entry.get('title'),
+            'video_id': entry.get('id'),
+            'view_count': entry.get('view_count'),
+            'duration': entry.get('duration'),
+            'category': category,
+        })
     
     def _retry_crawling(self, max_results: int, include_shorts: bool, include_long: bool) -> List[Dict]:
         """크롤링 재시도 - 실제 데이터만 사용"""
         print("🔄 실제 크롤링 재시도 중...")
         
         try:
-            videos = []
             search_terms = ['trending', 'viral', 'popular', 'shorts']
-            
-            for term in search_terms:
-                if len(videos) >= max_results:
-                    break
-                    
-                try:
-                    search_url = f'ytsearch{max_results//len(search_terms)}:{term}'
-                    ydl_opts = {
-                        'quiet': True,
-                        'no_warnings': True,
-                        'extract_flat': True,
-                    }
-                    
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        result = ydl.extract_info(search_url, download=False)
-                        
-                        if result and 'entries' in result:
-                            for entry in result['entries']:
-                                if entry and len(videos) < max_results:
-                                    video_info = self._parse_ytdlp_data(entry)
-                                    if video_info:
-                                        videos.append(video_info)
-                except Exception as e:
-                    continue
+            videos = self._search_keywords(search_terms, max_results, is_korean=False,
+                                           per_keyword=max_results // len(search_terms))
             
             print(f"✅ 재시도 성공: {len(videos)}개 실제 영상 수집")
             return videos
@@ -460,16 +448,47 @@ class YouTubeYTDLPCrawler:
             "source": "yt-dlp_crawler"
         }
         
-        with open(self.cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        
+        # 임시 파일 + os.replace로 저장 (저장소가 있으면 스냅샷 교체도 함께)
+        publish_cache(self.cache_file, cache_data)
         print(f"💾 캐시 저장 완료: {len(data)}개 영상")
     
+    def save_incremental(self, data: List[Dict]) -> Optional[Dict]:
+        """증분 저장 - 새로 생겼거나 바뀐 영상만 저장소에 upsert
+        
+        바뀌지 않은 영상은 ID만 넘겨 마지막 확인 시각만 갱신한다.
+        저장소가 병합된 전체 목록을 캐시 파일로 저장한다.
+        """
+        changed = []
+        seen_ids = []
+        for video in data:
+            video_id = video.get('video_id')
+            fingerprint = self._fingerprint(video)
+            if video_id and self._emitted.get(video_id) == fingerprint:
+                seen_ids.append(video_id)
+                continue
+            changed.append(video)
+            if video_id:
+                self._emitted[video_id] = fingerprint
+        
+        stats = publish_changes(self.cache_file, changed, seen_ids, source="yt-dlp_crawler")
+        if stats is None:
+            # 이 캐시 파일을 보는 저장소가 없으면 전체 저장으로 대체
+            self.save_to_cache(data)
+            return None
+        
+        print(f"💾 증분 저장 완료: 변경 {len(changed)}개 / 유지 {len(seen_ids)}개")
+        return stats
+    
+    @staticmethod
+    def _fingerprint(video: Dict) -> tuple:
+        """변경 감지용 값 (조회수, 트렌드 점수, 카테고리, 제목)"""
+        return (video.get('view_count'), video.get('trend_score'), video.get('category'), video.get('title'))
+    
     def _sort_by_trend_and_recency(self, videos: List[Dict]) -> List[Dict]:
         """트렌드 점수와 최신성을 종합하여 정렬 (급상승 우선)"""
         def sort_key(video):
             trend_score = video.get('trend_score', 0)
-            views = video.get('views', 0)
+            views = video.get('view_count') or 0
             # 트렌드 점수 70%, 조회수 30% 가중치
             return (trend_score * 0.7) + (views / 1000000 * 0.3)
         
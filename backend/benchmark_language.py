@@ -0,0 +1,101 @@
+"""
+제목 언어 감지 벤치마크 - 문자별 범위 비교 루프 vs 변환 표(str.translate) 제목별 / 일괄 감지
+
+video_cache.json(YouTube API로 수집한 실제 영상)의 제목으로 두 방식의 비용을 재고,
+제목마다 결과가 같은지 확인한다.
+
+    python benchmark_language.py [--repeat 20]
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from language_detect import detect_language, detect_languages
+
+SOURCE_CACHE = Path(__file__).parent / 'video_cache.json'
+
+
+def _detect_language_loop(text: str) -> str:
+    """기존 YouTubeAPIService.detect_language (문자마다 범위 비교)"""
+    if not text:
+        return '기타'
+
+    korean_count = 0
+    japanese_count = 0
+    chinese_count = 0
+    english_count = 0
+
+    for char in text:
+        if '\uac00' <= char <= '\ud7a3':
+            korean_count += 1
+        elif '\u3040' <= char <= '\u309f':
+            japanese_count += 1
+        elif '\u30a0' <= char <= '\u30ff':
+            japanese_count += 1
+        elif ('A' <= char <= 'Z') or ('a' <= char <= 'z'):
+            english_count += 1
+        elif '\u4e00' <= char <= '\u9fff':
+            chinese_count += 1
+
+    if korean_count >= 5:
+        return '한국어'
+    if japanese_count >= 3:
+        return '일본어'
+    if chinese_count >= 5 and korean_count == 0 and japanese_count == 0:
+        return '중국어'
+
+    counts = {
+        '한국어': korean_count,
+        '일본어': japanese_count,
+        '중국어': chinese_count,
+        '영어': english_count
+    }
+    max_count = max(counts.values())
+    if max_count == 0:
+        return '기타'
+    for lang in ['한국어', '일본어', '중국어', '영어']:
+        if counts[lang] == max_count:
+            return lang
+    return '기타'
+
+
+METHODS = {
+    'char loop': lambda titles: [_detect_language_loop(title) for title in titles],
+    'per-title': lambda titles: [detect_language(title) for title in titles],
+    'batch': detect_languages,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(SOURCE_CACHE, 'r', encoding='utf-8') as f:
+        titles = [video.get('title', '') for video in json.load(f)['videos']]
+
+    expected = METHODS['char loop'](titles)
+    mismatches = [
+        (title, before, after)
+        for title, before, after in zip(titles, expected, detect_languages(titles))
+        if before != after
+    ]
+    print(f"제목 {len(titles)}개 (평균 {sum(map(len, titles)) / len(titles):.0f}자), "
+          f"결과 불일치 {len(mismatches)}개")
+    for title, before, after in mismatches[:5]:
+        print(f"  ❌ {title!r}: {before} != {after}")
+
+    print(f"\n{'방식':<10} | {'제목당(us)':>10} | {'전체(ms)':>9}")
+    print('-' * 36)
+    for name, method in METHODS.items():
+        best = float('inf')
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            method(titles)
+            best = min(best, time.perf_counter() - started)
+        print(f"{name:<10} | {best / len(titles) * 1e6:>10.2f} | {best * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+/api/youtube/trending 응답 직렬화 벤치마크 - 요청 처리량 비교
+
+video_cache.json(YouTube API로 수집한 실제 영상)을 캐시로 올려 두고 count별로 같은
+요청을 반복해 초당 요청 수를 잰다. 필터/정렬 결과는 두 방식 모두 같은 세대 캐시를
+쓰므로 차이는 응답을 만드는 비용이다.
+
+    response_model  기존 방식 - 요청마다 TrendingVideosResponse로 영상을 검증하고
+                    FastAPI가 표준 json으로 직렬화
+    pre-validated   수집할 때 검증해 둔 레코드를 fast_json으로 인코딩 (json / orjson)
+
+요청은 한 이벤트 루프에서 ASGI 앱을 직접 호출한다 (미들웨어/라우팅/파라미터 처리는
+포함하고, 네트워크와 테스트 클라이언트 스레드 비용은 뺀 값).
+
+    python benchmark_response.py [--seconds 2] [--counts 20 200 2000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode
+
+from fastapi import Header
+
+import fast_json
+import main
+
+SOURCE_CACHE = Path(__file__).parent / 'video_cache.json'
+
+BASELINE_PATH = '/benchmark/trending-response-model'
+
+
+# 기존 엔드포인트와 같은 방식 (response_model 검증 + 표준 json)
+# 미들웨어와 파라미터 처리 비용이 같도록 main.app에 같은 시그니처로 등록
+@main.app.get(BASELINE_PATH, response_model=main.TrendingVideosResponse)
+async def baseline_trending(
+    count: Optional[int] = None,
+    category: Optional[str] = None,
+    region: Optional[str] = None,
+    language: Optional[str] = None,
+    min_trend_score: Optional[int] = None,
+    sort_by: str = "trend_score",
+    video_type: Optional[str] = None,
+    time_filter: Optional[str] = None,
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
+    format: str = "json",
+    if_none_match: Optional[str] = Header(None)
+):
+    query = main.query_digest(
+        category=category, region=region, language=language, min_trend_score=min_trend_score,
+        sort_by=sort_by, video_type=video_type, time_filter=time_filter
+    )
+    filtered_videos = main._sorted_videos(main.cache_generation, main.cached_videos, query, category,
+                                          region, language, min_trend_score, video_type, time_filter, sort_by)
+    final_videos = filtered_videos[:count if count is not None else main.DEFAULT_TRENDING_COUNT]
+    return main.TrendingVideosResponse(
+        trending_videos=final_videos,
+        count=len(final_videos),
+        total_count=len(filtered_videos),
+        last_updated=main.last_update_time,
+        source="youtube_api_v3"
+    )
+
+
+async def _get(path: str, params: dict) -> tuple:
+    """main.app에 GET 요청 한 번 → (상태 코드, 본문)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": urlencode(params).encode(), "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0), "server": ("benchmark", 80),
+    }
+    status = 0
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await main.app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def _throughput(path: str, count: int, seconds: float) -> tuple:
+    """(초당 요청 수, 응답 영상 수, 응답 크기)"""
+    params = {'count': count}
+    status, body = await _get(path, params)
+    if status != 200:
+        raise RuntimeError(f"{path} → {status}: {body[:200]!r}")
+    videos = len(json.loads(body)['trending_videos'])
+    requests = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        await _get(path, params)
+        requests += 1
+    return requests / (time.perf_counter() - started), videos, len(body)
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=2.0)
+    parser.add_argument('--counts', type=int, nargs='+', default=[20, 200, 2000])
+    args = parser.parse_args()
+
+    with open(SOURCE_CACHE, 'r', encoding='utf-8') as f:
+        cache_data = json.load(f)
+    started = time.perf_counter()
+    main._set_cached_videos(cache_data['videos'], cache_data.get('last_updated'))
+    print(f"영상 {len(main.cached_videos)}개 적재 + 검증: {(time.perf_counter() - started) * 1000:.1f}ms "
+          f"(orjson {'사용' if fast_json.ORJSON_AVAILABLE else '없음'})")
+    main.startup_state["phase"] = "ready"
+
+    methods = [('response_model', BASELINE_PATH, None), ('pre-validated json', '/api/youtube/trending', False)]
+    if fast_json.ORJSON_AVAILABLE:
+        methods.append(('pre-validated orjson', '/api/youtube/trending', True))
+
+    print(f"\n{'방식':<22} | {'count':>5} | {'영상':>5} | {'응답(KB)':>8} | {'req/s':>8} | {'영상당(us)':>10}")
+    print('-' * 74)
+    for count in args.counts:
+        for name, path, use_orjson in methods:
+            if use_orjson is not None:
+                fast_json.ORJSON_AVAILABLE = use_orjson
+            rate, videos, size = asyncio.run(_throughput(path, count, args.seconds))
+            print(f"{name:<22} | {count:>5} | {videos:>5} | {size / 1024:>8.1f} | {rate:>8.1f} | "
+                  f"{1e6 / rate / max(videos, 1):>10.2f}")
+        print('-' * 74)
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,78 @@
+"""
+YouTube API 응답 ETag 캐시
+요청 시그니처(엔드포인트 + 파라미터)별로 마지막 응답의 ETag와 파싱 결과를 보관한다.
+같은 요청을 다시 보낼 때 If-None-Match 헤더를 붙이고, 304 Not Modified가 오면
+응답 본문을 받거나 파싱하지 않고 보관해 둔 결과를 그대로 쓴다.
+
+환경 변수:
+    YOUTUBE_ETAG_CACHE_SIZE  보관할 요청 시그니처 수 (기본 1000, 0이면 사용 안 함)
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class EtagCache:
+    """요청 시그니처 → (ETag, 파싱 결과) LRU (스레드 안전)"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv('YOUTUBE_ETAG_CACHE_SIZE', '1000'))
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[tuple, Tuple[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # 엔드포인트별 {requests, conditional, not_modified}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(endpoint: str, params: Dict) -> tuple:
+        """파라미터 이름 순으로 정렬한 요청 시그니처"""
+        return (endpoint,) + tuple(sorted(params.items()))
+
+    def lookup(self, endpoint: str, key: tuple) -> Optional[Tuple[str, Any]]:
+        """보관된 (ETag, 결과) - 요청 한 번으로 집계"""
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics['requests'] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            metrics['conditional'] += 1
+            return entry
+
+    def not_modified(self, endpoint: str):
+        """304 응답을 받아 보관된 결과를 사용함"""
+        with self._lock:
+            self._endpoint(endpoint)['not_modified'] += 1
+
+    def store(self, key: tuple, etag: Optional[str], value: Any):
+        if not etag or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (etag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            endpoints = {}
+            for endpoint, metrics in self._metrics.items():
+                endpoints[endpoint] = dict(metrics)
+                endpoints[endpoint]['hit_ratio'] = (
+                    round(metrics['not_modified'] / metrics['requests'], 3) if metrics['requests'] else 0.0
+                )
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "endpoints": endpoints,
+            }
+
+    def _endpoint(self, endpoint: str) -> Dict[str, int]:
+        # 호출자가 self._lock을 보유한 상태
+        metrics = self._metrics.get(endpoint)
+        if metrics is None:
+            metrics = self._metrics[endpoint] = {"requests": 0, "conditional": 0, "not_modified": 0}
+        return metrics
@@ -0,0 +1,34 @@
+"""
+빠른 JSON 인코딩 (선택 사항)
+orjson이 설치되어 있으면 orjson으로, 없으면 표준 json으로 FastAPI JSONResponse와 같은
+형식(compact, ensure_ascii=False)으로 인코딩한다. 영상 목록처럼 큰 응답에서 직렬화 비용이
+줄어든다.
+
+    dumps(payload)              → bytes
+    FastJSONResponse            response_class로 쓰는 응답 클래스
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps(payload: Any) -> bytes:
+    """payload를 UTF-8 JSON 바이트로 인코딩"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """dumps로 인코딩하는 JSON 응답"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,95 @@
+"""
+제목 언어 감지 (한국어 / 일본어 / 중국어 / 영어 / 기타)
+문자마다 범위 비교를 하던 루프 대신, 문자 → 문자 체계 변환 표(str.translate)로 제목을
+한 번 변환하고 체계별 글자 수를 str.count로 센다. 판정 규칙은 기존과 같다.
+
+    detect_language(title)         제목 하나
+    detect_languages(titles)       제목 목록을 한 번에 (API 응답 한 페이지 단위) - 제목을 이어 붙여
+                                   translate 한 번, 제목별 구간을 str.count(sub, start, end)로 셈
+
+backend/의 YouTube API 수집에서 쓴다. api/ 크롤러는 "한글이 있으면 한국어" 규칙이라
+enrichment의 정규식 검색(첫 한글에서 멈춤)이 이 변환보다 빠르므로 그대로 둔다.
+"""
+from typing import Dict, Iterable, List, Tuple
+
+# 문자 체계별 코드 포인트 범위 → 변환 후 문자
+# ASCII 영문자는 모두 'e'로 바뀌므로 변환 결과의 k/j/c는 각 범위에서만 나온다
+_SCRIPT_RANGES = [
+    (0xAC00, 0xD7A3, 'k'),   # 한글 (가-힣)
+    (0x3040, 0x309F, 'j'),   # 히라가나
+    (0x30A0, 0x30FF, 'j'),   # 가타카나
+    (0x4E00, 0x9FFF, 'c'),   # CJK 통합 한자
+    (0x41, 0x5A, 'e'),       # A-Z
+    (0x61, 0x7A, 'e'),       # a-z
+]
+
+_SCRIPT_TABLE: Dict[int, str] = {
+    code_point: script
+    for start, end, script in _SCRIPT_RANGES
+    for code_point in range(start, end + 1)
+}
+
+# 동점이면 앞쪽 언어
+_LANGUAGE_PRIORITY = ('한국어', '일본어', '중국어', '영어')
+
+
+def count_scripts(text: str) -> Tuple[int, int, int, int]:
+    """(한글, 일본어 가나, 한자, 영문자) 글자 수"""
+    scripts = text.translate(_SCRIPT_TABLE)
+    return scripts.count('k'), scripts.count('j'), scripts.count('c'), scripts.count('e')
+
+
+def detect_language(text: str) -> str:
+    """
+    텍스트에서 언어 감지
+
+    Returns:
+        감지된 언어 ('한국어', '일본어', '영어', '중국어', '기타')
+    """
+    if not text:
+        return '기타'
+    return _classify(*count_scripts(text))
+
+
+def _classify(korean_count: int, japanese_count: int, chinese_count: int, english_count: int) -> str:
+    """문자 체계별 글자 수 → 언어"""
+    # 1. 한글이 5개 이상 있으면 무조건 한국어
+    if korean_count >= 5:
+        return '한국어'
+
+    # 2. 일본어 문자(히라가나 or 가타카나)가 3개 이상 있으면 일본어
+    if japanese_count >= 3:
+        return '일본어'
+
+    # 3. 중국어 한자가 5개 이상 있고, 한글/일본어가 없으면 중국어
+    if chinese_count >= 5 and korean_count == 0 and japanese_count == 0:
+        return '중국어'
+
+    # 4. 위 조건에 해당하지 않으면 가장 많이 사용된 언어 (동점이면 우선순위)
+    counts = (korean_count, japanese_count, chinese_count, english_count)
+    max_count = max(counts)
+    if max_count == 0:
+        return '기타'
+    return _LANGUAGE_PRIORITY[counts.index(max_count)]
+
+
+def detect_languages(texts: Iterable[str]) -> List[str]:
+    """텍스트 목록의 언어를 한 번에 감지 (입력 순서대로)
+
+    변환 표는 글자마다 한 글자로 바꾸므로 변환 결과에서도 제목별 시작/끝 위치가 그대로다.
+    """
+    texts = [text or '' for text in texts]
+    scripts = '\n'.join(texts).translate(_SCRIPT_TABLE)
+    count = scripts.count
+    languages = []
+    start = 0
+    for text in texts:
+        end = start + len(text)
+        if text:
+            languages.append(_classify(
+                count('k', start, end), count('j', start, end), count('c', start, end), count('e', start, end)
+            ))
+        else:
+            languages.append('기타')
+        start = end + 1
+    return languages
@@ -2,29 +2,38 @@
 Methodus Shorts Planner - YouTube Data API v3 백엔드
 YouTube 데이터를 공식 API를 통해 제공
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, List, Dict
+from pydantic import BaseModel, ValidationError
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple
 import json
-from datetime import datetime
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
 from pathlib import Path
 import os
+import tempfile
 import threading
 import time
-from youtube_api_service import YouTubeAPIService
+from video_repository import TIME_FILTER_DAYS, open_repository, video_view_count
+from facets import FacetSummary
+from fast_json import FastJSONResponse, dumps as encode_json
+from pagination import CursorError, GenerationPins, body_etag, decode_cursor, encode_cursor, etag_matches, query_digest
+from view_history import ViewHistory, history_path
 from dotenv import load_dotenv
 
 # 환경 변수 로드
 load_dotenv()
 
-# Gemini는 선택적으로 import
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    print("⚠️ google-generativeai 패키지가 설치되지 않았습니다 (AI 기능 비활성화)")
+# 모듈 import 시점 (콜드 스타트 측정용)
+STARTUP_STARTED_AT = time.time()
+
+# 첫 데이터가 준비되기 전 요청에 보낼 Retry-After (초)
+STARTUP_RETRY_AFTER = 5
+
+# /api/youtube/trending 기본 개수 (format=json) / NDJSON 스트리밍 한 번에 보내는 줄 수
+DEFAULT_TRENDING_COUNT = 20
+NDJSON_CHUNK_SIZE = 64
 
 app = FastAPI(
     title="Methodus Shorts Planner API",
@@ -64,52 +73,181 @@ class TrendingVideosResponse(BaseModel):
     total_count: int
     last_updated: str
     source: str
+    next_after: Optional[str] = None  # 다음 페이지 첫 영상 직전 video_id (마지막 페이지면 None)
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 # 크롤러 초기화
 # crawler = SimpleYouTubeCrawler()
 
-# YouTube API 서비스 초기화
-try:
-    youtube_service = YouTubeAPIService()
-    print("✅ YouTube API 서비스 초기화 완료")
-except ValueError as e:
-    print(f"⚠️ YouTube API 초기화 실패: {e}")
-    print("💡 .env 파일에 YOUTUBE_API_KEY를 설정하세요.")
-    print("   설정 방법은 YOUTUBE_API_SETUP.md를 참조하세요.")
-    youtube_service = None
-
-# Google Gemini 초기화 (선택적)
-gemini_api_key = os.getenv("GEMINI_API_KEY")
+# YouTube API 서비스 / Gemini 모델은 처음 사용할 때 생성
+# (googleapiclient, google.generativeai import가 무거워 서버 시작을 늦추므로)
+youtube_service = None
 gemini_model = None
-if GEMINI_AVAILABLE and gemini_api_key:
-    try:
-        genai.configure(api_key=gemini_api_key)
-        gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-        print("✅ Google Gemini 2.0 Flash 초기화 완료 (무료!)")
-    except Exception as e:
-        print(f"⚠️ Gemini API 초기화 실패: {e}")
-        gemini_model = None
-elif not GEMINI_AVAILABLE:
-    print("⚠️ Gemini AI 패키지가 없습니다 (기본 패턴 사용)")
-else:
-    print("⚠️ GEMINI_API_KEY가 설정되지 않았습니다")
+_service_ready = False
+_gemini_ready = False
+_init_lock = threading.Lock()
+
+def get_youtube_service():
+    """YouTube API 서비스 (처음 호출 시 초기화, 설정되지 않았으면 None)"""
+    global youtube_service, _service_ready
+    if _service_ready:
+        return youtube_service
+    with _init_lock:
+        if not _service_ready:
+            try:
+                from youtube_api_service import YouTubeAPIService
+                youtube_service = YouTubeAPIService()
+                print("✅ YouTube API 서비스 초기화 완료")
+            except ValueError as e:
+                print(f"⚠️ YouTube API 초기화 실패: {e}")
+                print("💡 .env 파일에 YOUTUBE_API_KEY를 설정하세요.")
+                print("   설정 방법은 YOUTUBE_API_SETUP.md를 참조하세요.")
+                youtube_service = None
+            _service_ready = True
+    return youtube_service
+
+def get_gemini_model():
+    """Google Gemini 모델 (처음 호출 시 초기화, 선택적)"""
+    global gemini_model, _gemini_ready
+    if _gemini_ready:
+        return gemini_model
+    with _init_lock:
+        if not _gemini_ready:
+            gemini_api_key = os.getenv("GEMINI_API_KEY")
+            if not gemini_api_key:
+                print("⚠️ GEMINI_API_KEY가 설정되지 않았습니다")
+            else:
+                try:
+                    import google.generativeai as genai
+                    genai.configure(api_key=gemini_api_key)
+                    gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+                    print("✅ Google Gemini 2.0 Flash 초기화 완료 (무료!)")
+                except ImportError:
+                    print("⚠️ google-generativeai 패키지가 설치되지 않았습니다 (기본 패턴 사용)")
+                except Exception as e:
+                    print(f"⚠️ Gemini API 초기화 실패: {e}")
+                    gemini_model = None
+            _gemini_ready = True
+    return gemini_model
+
+def youtube_api_status() -> str:
+    """YouTube API 상태 (초기화 전이면 starting)"""
+    if not _service_ready:
+        return "starting"
+    return "active" if youtube_service else "not_configured"
 
 # 캐시된 데이터 저장소
 cached_videos = []
 last_update_time = None
+# cached_videos가 바뀔 때마다 증가 - 커서가 같은 세대에서 이어 받도록 최근 세대 목록을 고정
+# 세대마다 (영상 목록, id(영상) → TrendingVideo로 검증한 응답용 레코드)
+cache_generation = 0
+pinned_videos: GenerationPins[Tuple[List[Dict], Dict[int, Dict]]] = GenerationPins()
+# cached_videos의 필터 옵션 패싯 (값별 영상 수, 캐시를 교체할 때 함께 계산)
+cached_facets = FacetSummary.from_videos([])
+# (세대, 쿼리) → 필터/정렬된 목록 (다음 페이지는 다시 정렬하지 않고 이어서 자름)
+SORTED_RESULTS_SIZE = 32
+_sorted_results: "OrderedDict[tuple, List[Dict]]" = OrderedDict()
+_sorted_results_lock = threading.Lock()
+
+def _set_cached_videos(videos: List[Dict], updated_at: Optional[str]) -> List[Dict]:
+    """캐시 교체 (응답 형식 검증 → 새 세대로 고정한 뒤 공개)
+
+    Returns:
+        검증을 통과해 공개한 영상 목록 (저장할 때도 이 목록을 씀)
+    """
+    global cached_videos, cached_facets, last_update_time, cache_generation
+    videos, records = _validate_videos(videos)
+    pinned_videos.pin(cache_generation + 1, (videos, records))
+    cached_facets = FacetSummary.from_videos(videos)
+    cached_videos = videos
+    last_update_time = updated_at
+    cache_generation += 1
+    return videos
+
+# 응답 형식 검증에서 제외된 영상 (누적 개수, 최근 몇 개의 video_id와 오류 - /api/health)
+REJECTED_SAMPLE_SIZE = 20
+rejected_videos = {"total": 0, "recent": deque(maxlen=REJECTED_SAMPLE_SIZE)}
+
+def _validate_videos(videos: List[Dict]) -> Tuple[List[Dict], Dict[int, Dict]]:
+    """수집/로드할 때 한 번만 TrendingVideo로 검증 (요청마다 다시 검증하지 않음)
+
+    형식에 맞지 않는 영상은 응답에서 빠지므로 video_id와 오류를 로그로 남기고 rejected_videos에 센다.
+
+    Returns:
+        (형식에 맞는 영상 목록, id(영상) → 응답에 그대로 인코딩할 검증된 레코드)
+    """
+    valid, records = [], {}
+    for video in videos:
+        try:
+            records[id(video)] = TrendingVideo.model_validate(video).model_dump(mode='json')
+        except ValidationError as e:
+            video_id = video.get('video_id') if isinstance(video, dict) else None
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or '(영상)'}: {error['msg']}" for error in e.errors()
+            )
+            print(f"⚠️ 응답 형식에 맞지 않는 영상 제외 ({video_id}): {errors}")
+            rejected_videos["total"] += 1
+            rejected_videos["recent"].append({
+                "video_id": video_id, "errors": errors, "at": datetime.now().isoformat()
+            })
+            continue
+        valid.append(video)
+    if len(valid) < len(videos):
+        print(f"⚠️ 영상 {len(videos)}개 중 {len(videos) - len(valid)}개 제외 (누적 {rejected_videos['total']}개)")
+    return valid, records
+
+def _response_records(videos: List[Dict], records: Dict[int, Dict]) -> List[Dict]:
+    """응답용 레코드 (고정된 세대의 영상이므로 모두 검증해 둔 레코드가 있음)"""
+    return [records[id(video)] for video in videos]
+
+# 시작 파이프라인 상태: starting(캐시 로드 중) → fetching(첫 수집 중) → ready
+startup_state = {"phase": "starting", "ready_in": None}
+_fetch_lock = threading.Lock()
+
+# 수집이 실패한 뒤 요청으로 다시 수집을 시작하기까지 기다리는 시간 (초)
+# (API 키 오류/할당량 부족 등으로 실패했을 때 503 재시도마다 전체 수집을 다시 돌려 할당량을 소진하지 않도록)
+FETCH_RETRY_BACKOFF = int(os.getenv('FETCH_RETRY_BACKOFF', '600'))
+last_fetch_failure: Optional[float] = None
+
+# SQLite 영상 저장소 (VIDEO_DB_PATH 설정 시 JSON 캐시 파일 대신 사용, 수집 결과를 보관하고 응답은 메모리 세대에서)
+video_repository = open_repository(import_from='video_cache.json')
+
+# 조회수 이력 (수집할 때마다 조회수를 남기고 증가 속도로 트렌드 점수 갱신, VIDEO_VIEW_HISTORY=0으로 끔)
+view_history = ViewHistory(history_path('video_cache.json')) if os.getenv('VIDEO_VIEW_HISTORY', '1') != '0' else None
+
+def _write_json_atomic(path: Path, data):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽이 잘린 파일을 보지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
 def save_cache_to_file(videos):
     """캐시 데이터를 파일에 저장"""
     try:
+        if video_repository:
+            video_repository.replace_all(videos, datetime.now().isoformat(), "youtube_api_v3")
+            print(f"💾 SQLite 저장 완료: {len(videos)}개 영상")
+            return True
+        
         cache_data = {
             'videos': videos,
             'last_updated': datetime.now().isoformat(),
             'count': len(videos)
         }
         
-        cache_file = Path('video_cache.json')
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        _write_json_atomic(Path('video_cache.json').resolve(), cache_data)
         
         print(f"💾 캐시 저장 완료: {len(videos)}개 영상")
         return True
@@ -120,6 +258,10 @@ def save_cache_to_file(videos):
 def load_cache_from_file():
     """파일에서 캐시 데이터 로드"""
     try:
+        if video_repository:
+            cache_data = video_repository.load()
+            return cache_data['videos'], cache_data['last_updated']
+        
         cache_file = Path('video_cache.json')
         if cache_file.exists():
             with open(cache_file, 'r', encoding='utf-8') as f:
@@ -130,27 +272,62 @@ def load_cache_from_file():
     return [], None
 
 def fetch_youtube_data():
-    """YouTube API를 통해 데이터 수집"""
-    global cached_videos, last_update_time
-    
-    if not youtube_service:
+    """YouTube API를 통해 데이터 수집 (동시에 한 번만 실행)"""
+    if not _fetch_lock.acquire(blocking=False):
+        print("⏳ 이미 데이터 수집 중입니다")
+        return False
+    global last_fetch_failure
+    try:
+        success = _fetch_youtube_data()
+        last_fetch_failure = None if success else time.time()
+        return success
+    finally:
+        _fetch_lock.release()
+
+def fetch_retry_in() -> int:
+    """마지막 수집 실패 후 다시 시도할 수 있을 때까지 남은 시간 (초, 기다릴 필요 없으면 0)"""
+    if last_fetch_failure is None:
+        return 0
+    return max(0, int(last_fetch_failure + FETCH_RETRY_BACKOFF - time.time()))
+
+def start_background_fetch() -> bool:
+    """수집 중이 아니고 최근 실패 후 대기 중이 아니면 백그라운드 스레드에서 수집 시작"""
+    if _fetch_lock.locked() or fetch_retry_in() > 0:
+        return False
+    threading.Thread(target=fetch_youtube_data, daemon=True).start()
+    return True
+
+def _fetch_youtube_data():
+    service = get_youtube_service()
+    if not service:
         print("❌ YouTube API 서비스가 초기화되지 않았습니다.")
         return False
     
+    region_codes = ['KR', 'US', 'JP']  # 한국, 미국, 일본 (우선순위 순)
+    
+    # 전체 갱신을 할 할당량이 없으면 일부만 수집해 캐시를 덮어쓰지 않고 기존 캐시 유지
+    # (캐시가 비어 있어도 마찬가지 - 할당량이 회복될 때까지 수집하지 않음)
+    refresh_cost = service.comprehensive_cost(region_codes)
+    if not service.quota.can_afford('videos.list', refresh_cost, priority='high'):
+        print(f"⏸️ 할당량 부족으로 데이터 갱신 생략 - {'캐시 유지' if cached_videos else '캐시 없음'} "
+              f"(필요 {refresh_cost} units, 남은 할당량 {service.quota.remaining()} units)")
+        return False
+    
     try:
         print(f"🔄 [{datetime.now().strftime('%H:%M:%S')}] YouTube API 데이터 수집 시작...")
         
         # 카테고리별로 여러 지역에서 종합 데이터 수집
-        videos = youtube_service.get_comprehensive_data(
-            region_codes=['KR', 'US', 'JP'],  # 한국, 미국, 일본
+        videos = service.get_comprehensive_data(
+            region_codes=region_codes,
             min_videos_per_category=100
         )
         
         if videos and len(videos) > 0:
-            cached_videos = videos
-            last_update_time = datetime.now().isoformat()
+            if view_history:
+                videos = view_history.annotate(videos)
+            videos = _set_cached_videos(videos, datetime.now().isoformat())
             
-            # 캐시 저장
+            # 캐시 저장 (응답 형식 검증을 통과한 영상만)
             save_cache_to_file(videos)
             
             print(f"✅ YouTube API 데이터 수집 완료: {len(videos)}개 영상")
@@ -170,19 +347,49 @@ def auto_fetch_loop():
         time.sleep(2 * 60 * 60)  # 2시간
         fetch_youtube_data()
 
-# 초기 데이터 로드
-print("🔄 초기 데이터 로드 중...")
-cached_videos, last_update_time = load_cache_from_file()
+def _mark_ready():
+    if startup_state["phase"] != "ready":
+        startup_state["phase"] = "ready"
+        startup_state["ready_in"] = round(time.time() - STARTUP_STARTED_AT, 3)
+        print(f"✅ 데이터 준비 완료 (시작 후 {startup_state['ready_in']}초)")
+
+def startup_pipeline():
+    """캐시 로드 → (없으면) 첫 수집 → 자동 수집 (서버는 이미 요청을 받는 중)"""
+    print("🔄 초기 데이터 로드 중...")
+    _set_cached_videos(*load_cache_from_file())
+    if cached_videos:
+        _mark_ready()  # 지난 스냅샷부터 제공
+    
+    service = get_youtube_service()
+    if service:
+        if not cached_videos:
+            startup_state["phase"] = "fetching"
+            print("📡 캐시된 데이터가 없어서 즉시 데이터 수집을 시작합니다...")
+            fetch_youtube_data()
+        _mark_ready()
+        print("✅ 자동 데이터 수집 스레드 시작 (2시간 간격)")
+        auto_fetch_loop()
+    else:
+        _mark_ready()
 
-# 캐시된 데이터가 없으면 즉시 수집
-if not cached_videos and youtube_service:
-    print("📡 캐시된 데이터가 없어서 즉시 데이터 수집을 시작합니다...")
-    fetch_youtube_data()
+@app.on_event("startup")
+async def startup_event():
+    """서버 시작 시 실행 - 포트는 바로 열고 데이터 준비는 백그라운드에서"""
+    threading.Thread(target=startup_pipeline, daemon=True).start()
+    print(f"🚀 서버 시작 ({time.time() - STARTUP_STARTED_AT:.2f}초) - 데이터는 백그라운드에서 준비합니다")
 
-# 백그라운드에서 자동 데이터 수집 시작
-if youtube_service:
-    threading.Thread(target=auto_fetch_loop, daemon=True).start()
-    print("✅ 자동 데이터 수집 스레드 시작 (2시간 간격)")
+def _crawled_epoch(video: Dict) -> Optional[float]:
+    """기간 필터용 crawled_at epoch 초 (SQLite 저장소와 같은 기준 - timezone 정보는 버림, 없으면 None)"""
+    value = video.get('crawled_at')
+    if not value:
+        return None
+    try:
+        crawled_time = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if crawled_time.tzinfo is not None:
+            crawled_time = crawled_time.replace(tzinfo=None)
+        return crawled_time.timestamp()
+    except (ValueError, OSError):
+        return None
 
 @app.get("/")
 async def root():
@@ -191,7 +398,7 @@ async def root():
         "message": "Methodus Shorts Planner API - YouTube Data API v3",
         "version": "3.0.0",
         "status": "running",
-        "api_status": "active" if youtube_service else "not_configured",
+        "api_status": youtube_api_status(),
         "docs": "/docs",
         "setup_guide": "YOUTUBE_API_SETUP.md"
     }
@@ -204,34 +411,56 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "service": "methodus-shorts-planner",
         "version": "3.0.0",
-        "youtube_api": "active" if youtube_service else "not_configured",
+        "youtube_api": youtube_api_status(),
+        "startup": startup_state,
+        "fetch_retry_in": fetch_retry_in(),
         "cached_videos": len(cached_videos) if cached_videos else 0,
-        "last_update": last_update_time
+        "last_update": last_update_time,
+        "last_fetch": youtube_service.last_fetch_stats if youtube_service else None,
+        "quota": youtube_service.quota.stats() if youtube_service else None,
+        "etag_cache": youtube_service.etags.stats() if youtube_service else None,
+        "view_history": view_history.stats() if view_history else None,
+        "rejected_videos": {"total": rejected_videos["total"], "recent": list(rejected_videos["recent"])}
     }
 
 @app.get("/api/youtube/trending", response_model=TrendingVideosResponse)
 async def get_youtube_trending(
-    count: int = 20,
+    count: Optional[int] = None,
     category: Optional[str] = None,
     region: Optional[str] = None,
     language: Optional[str] = None,
     min_trend_score: Optional[int] = None,
     sort_by: str = "trend_score",
     video_type: Optional[str] = None,
-    time_filter: Optional[str] = None
+    time_filter: Optional[str] = None,
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
+    format: str = "json",
+    if_none_match: Optional[str] = Header(None)
 ):
-    """YouTube 급상승 동영상 조회 (YouTube Data API v3)"""
-    global cached_videos, last_update_time
+    """YouTube 급상승 동영상 조회 (YouTube Data API v3)
+
+    cursor: 응답의 next_cursor - 커서를 만든 세대의 정렬 결과에서 이어 받음
+            (수집이 끝나 캐시가 바뀌어도 스크롤 중인 목록은 섞이지 않음, 세대가 버려졌으면 410)
+    after: 이 video_id 다음 영상부터 (현재 세대에서)
+    format: "ndjson"이면 영상을 한 줄씩 바로 스트리밍 (count를 주지 않으면 전부)
+    JSON 응답에는 ETag가 붙고, If-None-Match가 같으면 304를 돌려준다.
+    """
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 format: {format}")
+    
+    # 첫 데이터를 준비 중이면 기다리게 함 (요청 처리 중에 수집하지 않음)
+    # 최근 수집이 실패했으면 FETCH_RETRY_BACKOFF 동안은 수집을 다시 시작하지 않음
+    if not cached_videos and (startup_state["phase"] != "ready" or youtube_service):
+        if startup_state["phase"] == "ready" and start_background_fetch():
+            print("📡 캐시된 데이터가 없어서 백그라운드 데이터 수집을 시작합니다...")
+        raise HTTPException(
+            status_code=503,
+            detail="영상 데이터를 준비 중입니다. 잠시 후 다시 시도하세요.",
+            headers={"Retry-After": str(max(STARTUP_RETRY_AFTER, fetch_retry_in()))}
+        )
     
     try:
-        # 캐시된 데이터가 없으면 즉시 수집
-        if not cached_videos and youtube_service:
-            print("📡 캐시된 데이터가 없어서 즉시 데이터 수집을 시작합니다...")
-            fetch_youtube_data()
-        
-        # 캐시된 데이터 사용
-        cached_videos = cached_videos if cached_videos else []
-        
         if not cached_videos or len(cached_videos) == 0:
             # 데이터가 없으면 빈 응답 반환
             return TrendingVideosResponse(
@@ -242,82 +471,203 @@ async def get_youtube_trending(
                 source="no_data"
             )
         
-        # 필터링 적용
-        filtered_videos = cached_videos.copy()
-        
-        # 카테고리 필터
-        if category:
-            filtered_videos = [v for v in filtered_videos if v.get('category') == category]
-        
-        # 언어 필터
-        if language:
-            filtered_videos = [v for v in filtered_videos if v.get('language') == language]
-        
-        # 영상 타입 필터
-        if video_type:
-            if video_type == 'shorts':
-                video_type_filter = '쇼츠'
-            elif video_type == 'long':
-                video_type_filter = '롱폼'
-            else:
-                video_type_filter = video_type
-            filtered_videos = [v for v in filtered_videos if v.get('video_type') == video_type_filter]
+        query = query_digest(
+            category=category, region=region, language=language, min_trend_score=min_trend_score,
+            sort_by=sort_by, video_type=video_type, time_filter=time_filter
+        )
+        generation = cache_generation
+        pinned = pinned_videos.get(generation)
+        if pinned is None:
+            # 읽는 사이 새 세대가 고정되어 밀려났으면 가장 최근 세대
+            generation = pinned_videos.generations()[-1]
+            pinned = pinned_videos.get(generation)
+        videos, records = pinned
+        state = None
+        if cursor:
+            try:
+                state = decode_cursor(cursor, query)
+            except CursorError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            generation = state['g']
+            pinned = pinned_videos.get(generation)
+            if pinned is None:
+                raise HTTPException(status_code=410, detail="커서의 데이터가 교체되었습니다. 처음부터 다시 조회하세요.")
+            videos, records = pinned
+        page_size = count if count is not None else DEFAULT_TRENDING_COUNT
         
-        # 지역 필터
-        if region:
-            filtered_videos = [v for v in filtered_videos if v.get('region') == region]
+        filtered_videos = _sorted_videos(generation, videos, query, category, region, language,
+                                         min_trend_score, video_type, time_filter, sort_by)
         
-        # 트렌드 점수 필터
-        if min_trend_score:
-            filtered_videos = [v for v in filtered_videos if v.get('trend_score', 0) >= min_trend_score]
+        # 시작 위치 (커서는 저장된 위치, after는 정렬된 필터 결과에서 그 영상 다음)
+        start = 0
+        if state is not None:
+            start = _cursor_start(filtered_videos, state)
+            if start is None:
+                raise HTTPException(status_code=400, detail="잘못된 커서")
+        elif after:
+            start = _index_after(filtered_videos, after)
+            if start is None:
+                raise HTTPException(status_code=400, detail=f"after 영상이 조회 결과에 없습니다: {after}")
         
-        # 정렬 (한국어 콘텐츠 우선)
-        if sort_by == "trend_score":
-            # 한국어 콘텐츠를 우선적으로 정렬
-            filtered_videos.sort(key=lambda x: (
-                x.get('language') != '한국어',  # 한국어가 아니면 True (뒤로)
-                -x.get('trend_score', 0)  # 트렌드 점수 높은 순
-            ))
-        elif sort_by == "views":
-            def parse_views(views_str):
-                if 'M' in str(views_str):
-                    return float(str(views_str).replace('M', '')) * 1000000
-                elif 'K' in str(views_str):
-                    return float(str(views_str).replace('K', '')) * 1000
-                else:
-                    try:
-                        return float(str(views_str).replace(',', ''))
-                    except:
-                        return 0
-            filtered_videos.sort(key=lambda x: parse_views(x.get('views', '0')), reverse=True)
-        elif sort_by == "crawled_at":
-            filtered_videos.sort(key=lambda x: x.get('crawled_at', ''), reverse=True)
+        if format == "ndjson":
+            # Pydantic 검증 없이 영상 한 줄씩 바로 인코딩
+            end = start + count if count is not None and count > 0 else len(filtered_videos)
+            return StreamingResponse(
+                _ndjson_lines(filtered_videos[i] for i in range(start, min(end, len(filtered_videos)))),
+                media_type="application/x-ndjson",
+                headers={
+                    "X-Total-Count": str(len(filtered_videos)),
+                    "X-Last-Updated": last_update_time or "",
+                }
+            )
         
         # 개수 제한
-        final_videos = filtered_videos[:count]
+        final_videos = filtered_videos[start:start + max(page_size, 0)]
+        has_more = start + len(final_videos) < len(filtered_videos)
         
-        return TrendingVideosResponse(
-            trending_videos=final_videos,
-            count=len(final_videos),
-            total_count=len(filtered_videos),
-            last_updated=last_update_time or datetime.now().isoformat(),
-            source="youtube_api_v3"
-        )
+        return _etag_response({
+            "trending_videos": _response_records(final_videos, records),
+            "count": len(final_videos),
+            "total_count": len(filtered_videos),
+            "last_updated": last_update_time or datetime.now().isoformat(),
+            "source": "youtube_api_v3",
+            "next_after": final_videos[-1].get('video_id') if has_more and final_videos else None,
+            "next_cursor": _next_cursor(generation, query, final_videos, start) if has_more else None
+        }, if_none_match)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ 영상 조회 오류: {e}")
         raise HTTPException(status_code=500, detail=f"영상 조회 실패: {str(e)}")
 
-@app.get("/api/youtube/filter-options")
-async def get_filter_options():
-    """사용 가능한 필터 옵션 제공 (실제 데이터 기반)"""
-    # 실제 캐시된 데이터에서 카테고리 추출
-    unique_categories = set()
-    if cached_videos:
-        for video in cached_videos:
-            cat = video.get('category')
-            if cat:
-                unique_categories.add(cat)
+def _sorted_videos(generation: int, videos: List[Dict], query: str, category: Optional[str],
+                   region: Optional[str], language: Optional[str], min_trend_score: Optional[int],
+                   video_type: Optional[str], time_filter: Optional[str], sort_by: str) -> List[Dict]:
+    """세대별 필터/정렬 결과 (같은 쿼리의 다음 페이지는 다시 정렬하지 않음)"""
+    key = (generation, query)
+    with _sorted_results_lock:
+        result = _sorted_results.get(key)
+        if result is not None:
+            _sorted_results.move_to_end(key)
+            return result
+    result = _filter_videos(videos, category, region, language, min_trend_score, video_type, time_filter, sort_by)
+    with _sorted_results_lock:
+        _sorted_results[key] = result
+        while len(_sorted_results) > SORTED_RESULTS_SIZE:
+            _sorted_results.popitem(last=False)
+    return result
+
+def _index_after(videos: List[Dict], video_id: str) -> Optional[int]:
+    """video_id 영상 다음 위치 (없으면 None)"""
+    return next((index + 1 for index, video in enumerate(videos) if video.get('video_id') == video_id), None)
+
+def _next_cursor(generation: int, query: str, page: List[Dict], start: int = 0) -> Optional[str]:
+    """page 다음부터 이어 받는 커서 (세대, 쿼리, 정렬 결과에서의 위치, 마지막 영상 ID)"""
+    if not page:
+        return None
+    return encode_cursor({"g": generation, "q": query, "i": start + len(page), "id": page[-1].get('video_id')})
+
+def _cursor_start(videos: List[Dict], state: Dict) -> Optional[int]:
+    """커서의 시작 위치 (저장된 위치의 직전 영상이 커서의 영상과 다르면 그 영상을 찾아 다음부터)"""
+    index = state.get('i')
+    if not isinstance(index, int) or index < 0:
+        return None
+    video_id = state.get('id')
+    if not video_id or (0 < index <= len(videos) and videos[index - 1].get('video_id') == video_id):
+        return min(index, len(videos))
+    # 정렬 결과를 다시 계산하는 사이 기간 필터 기준 시각이 지나 목록이 달라진 경우
+    return _index_after(videos, video_id)
+
+def _etag_response(payload: Dict, if_none_match: Optional[str]) -> Response:
+    """응답을 인코딩하고 본문 해시를 ETag로 (If-None-Match가 같으면 304)
+
+    영상 레코드는 수집할 때 검증해 두었으므로 TrendingVideosResponse로 다시 검증하지 않는다.
+    """
+    body = encode_json(payload)
+    etag = body_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _filter_videos(videos: List[Dict], category: Optional[str], region: Optional[str],
+                   language: Optional[str], min_trend_score: Optional[int], video_type: Optional[str],
+                   time_filter: Optional[str], sort_by: str) -> List[Dict]:
+    """메모리 목록 필터링 + 정렬 (한국어 콘텐츠 우선)"""
+    filtered_videos = videos.copy()
+    
+    # 카테고리 필터
+    if category:
+        filtered_videos = [v for v in filtered_videos if v.get('category') == category]
+    
+    # 언어 필터
+    if language:
+        filtered_videos = [v for v in filtered_videos if v.get('language') == language]
+    
+    # 영상 타입 필터
+    if video_type:
+        if video_type == 'shorts':
+            video_type_filter = '쇼츠'
+        elif video_type == 'long':
+            video_type_filter = '롱폼'
+        else:
+            video_type_filter = video_type
+        filtered_videos = [v for v in filtered_videos if v.get('video_type') == video_type_filter]
+    
+    # 지역 필터
+    if region:
+        filtered_videos = [v for v in filtered_videos if v.get('region') == region]
+    
+    # 트렌드 점수 필터
+    if min_trend_score:
+        filtered_videos = [v for v in filtered_videos if v.get('trend_score', 0) >= min_trend_score]
+    
+    # 기간 필터 (crawled_at이 기준 시각 이후, SQLite 저장소 조회와 같은 기준)
+    if time_filter and time_filter in TIME_FILTER_DAYS:
+        cutoff = (datetime.now() - timedelta(days=TIME_FILTER_DAYS[time_filter])).timestamp()
+        filtered_videos = [v for v in filtered_videos if (_crawled_epoch(v) or 0) >= cutoff]
+    
+    # 정렬 (한국어 콘텐츠 우선)
+    if sort_by == "trend_score":
+        # 한국어 콘텐츠를 우선적으로 정렬
+        filtered_videos.sort(key=lambda x: (
+            x.get('language') != '한국어',  # 한국어가 아니면 True (뒤로)
+            -x.get('trend_score', 0)  # 트렌드 점수 높은 순
+        ))
+    elif sort_by == "views":
+        filtered_videos.sort(key=video_view_count, reverse=True)
+    elif sort_by == "crawled_at":
+        filtered_videos.sort(key=lambda x: x.get('crawled_at', ''), reverse=True)
+    return filtered_videos
+
+def _ndjson_lines(videos: Iterable[Dict]) -> Iterator[bytes]:
+    """영상 한 줄씩 NDJSON 인코딩 (NDJSON_CHUNK_SIZE줄씩 묶어 전송)"""
+    lines = []
+    for video in videos:
+        lines.append(encode_json(video))
+        if len(lines) >= NDJSON_CHUNK_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+@app.get("/api/youtube/filter-options", response_class=FastJSONResponse)
+async def get_filter_options(
+    category: Optional[str] = None,
+    region: Optional[str] = None,
+    language: Optional[str] = None,
+    video_type: Optional[str] = None,
+    time_filter: Optional[str] = None
+):
+    """사용 가능한 필터 옵션 제공 (실제 데이터 기반)
+
+    facets에는 cached_videos의 값별 영상 수가 들어 있다. 필터 파라미터를 주면 다른 필터를
+    적용한 상태의 개수를 돌려준다 (예: region=국내 → 국내 영상의 카테고리별 개수).
+    """
+    # 실제 캐시된 데이터에서 카테고리 추출 (캐시를 교체할 때 계산해 둔 패싯 사용)
+    facets = cached_facets
+    unique_categories = set(facets.values('category'))
     
     return {
         "categories": sorted(list(unique_categories)) if unique_categories else [
@@ -335,7 +685,11 @@ async def get_filter_options():
             "min": 1,
             "max": 100,
             "default": 50
-        }
+        },
+        "facets": facets.counts(
+            category=category, region=region, language=language,
+            video_type=video_type, time_filter=time_filter
+        )
     }
 
 @app.post("/api/ai/generate-title-patterns")
@@ -344,6 +698,7 @@ async def generate_title_patterns(request: dict):
     keyword = request.get('keyword', '')
     related_videos = request.get('related_videos', [])
     
+    gemini_model = get_gemini_model()
     if not gemini_model:
         # Gemini가 없으면 기본 패턴 반환
         return {
@@ -421,7 +776,7 @@ async def generate_title_patterns(request: dict):
 @app.post("/api/youtube/force-refresh")
 async def force_refresh():
     """강제 새로고침 - 즉시 YouTube API로 데이터 수집"""
-    if not youtube_service:
+    if not get_youtube_service():
         raise HTTPException(
             status_code=503,
             detail="YouTube API가 설정되지 않았습니다. .env 파일에 YOUTUBE_API_KEY를 설정하세요."
@@ -454,8 +809,3 @@ if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
-
-# Render용 Gunicorn 설정
-if __name__ != "__main__":
-    import gunicorn.app.wsgiapp as wsgi
-    wsgi.run()
\ No newline at end of file
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from typing import Optional, List, Dict
 import json
 from datetime import datetime
+from video_repository import video_view_count
 from pathlib import Path
 import os
 
@@ -166,17 +167,7 @@ async def get_youtube_trending(
         if sort_by == "trend_score":
             filtered_videos.sort(key=lambda x: x.get('trend_score', 0), reverse=True)
         elif sort_by == "views":
-            def parse_views(views_str):
-                if 'M' in views_str:
-                    return float(views_str.replace('M', '')) * 1000000
-                elif 'K' in views_str:
-                    return float(views_str.replace('K', '')) * 1000
-                else:
-                    try:
-                        return float(views_str.replace(',', ''))
-                    except:
-                        return 0
-            filtered_videos.sort(key=lambda x: parse_views(x.get('views', '0')), reverse=True)
+            filtered_videos.sort(key=video_view_count, reverse=True)
         
         # 개수 제한
         final_videos = filtered_videos[:count]
@@ -0,0 +1,100 @@
+"""
+커서 페이지와 ETag
+/api/youtube/trending의 "더 보기"는 count를 늘려 다시 요청하는 대신 커서로 이어 받는다.
+커서는 (데이터 세대, 쿼리, 마지막 영상 위치)를 base64url JSON으로 감싼 불투명 문자열이라
+다음 페이지는 같은 세대의 정렬 결과에서 그 위치 다음부터 바로 이어진다. 크롤러가 중간에
+새 데이터를 발행해도 최근 몇 세대는 고정(pin)해 두므로 스크롤 중인 목록이 섞이지 않는다.
+
+응답 본문의 해시를 ETag로 보내고, If-None-Match가 같으면 304로 본문을 생략한다.
+
+환경 변수:
+    PINNED_GENERATIONS    커서가 이어 받을 수 있는 최근 세대 수 (기본 4)
+"""
+import base64
+import binascii
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Generic, Optional, TypeVar
+
+CURSOR_VERSION = 1
+
+T = TypeVar('T')
+
+
+class CursorError(ValueError):
+    """형식이 잘못되었거나 이 쿼리의 것이 아닌 커서"""
+
+
+def encode_cursor(state: Dict) -> str:
+    """커서 상태 → 불투명 문자열 (base64url, 패딩 없음)"""
+    raw = json.dumps(dict(state, v=CURSOR_VERSION), separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str, query: str) -> Dict:
+    """불투명 문자열 → 커서 상태 (query는 query_digest 값, 다른 쿼리의 커서면 CursorError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise CursorError(f"잘못된 커서: {e}") from e
+    if not isinstance(state, dict) or state.get('v') != CURSOR_VERSION or not isinstance(state.get('g'), int):
+        raise CursorError("잘못된 커서")
+    if state.get('q') != query:
+        raise CursorError("다른 필터/정렬 조건의 커서입니다")
+    return state
+
+
+def query_digest(**params) -> str:
+    """필터/정렬 파라미터 요약 (커서가 같은 쿼리에서만 쓰이도록)"""
+    raw = json.dumps(sorted(params.items()), separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def body_etag(body: bytes) -> str:
+    """응답 본문의 강한 ETag"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (여러 값, *, W/ 약한 비교 지원)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class GenerationPins(Generic[T]):
+    """최근 세대의 데이터를 보관 (커서가 가리키는 세대가 교체된 뒤에도 이어 받도록)"""
+
+    def __init__(self, max_generations: Optional[int] = None):
+        if max_generations is None:
+            max_generations = int(os.getenv('PINNED_GENERATIONS', '4'))
+        self.max_generations = max(1, max_generations)
+        self._pins: 'OrderedDict[int, T]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pin(self, generation: int, value: T):
+        with self._lock:
+            self._pins[generation] = value
+            self._pins.move_to_end(generation)
+            while len(self._pins) > self.max_generations:
+                self._pins.popitem(last=False)
+
+    def get(self, generation: int) -> Optional[T]:
+        with self._lock:
+            return self._pins.get(generation)
+
+    def generations(self):
+        with self._lock:
+            return list(self._pins)
@@ -0,0 +1,183 @@
+"""
+YouTube Data API 할당량 장부
+호출마다 비용(units)을 매겨 하루 사용량을 기록하고, 재시작해도 이어지도록
+파일에 저장한다. 하루의 경계는 할당량이 리셋되는 태평양 시간(America/Los_Angeles)
+자정이다.
+
+우선순위가 낮은 호출일수록 더 많은 여유분을 남겨야 허용되므로, 할당량이
+빠듯해지면 검색처럼 비싼 호출부터 막히고 급상승 차트 갱신은 마지막까지 남는다.
+허용되지 않은 호출은 API를 부르지 않고 호출하는 쪽이 캐시를 그대로 쓴다.
+
+환경 변수:
+    YOUTUBE_DAILY_QUOTA  일일 할당량 (기본 10000)
+    YOUTUBE_QUOTA_FILE   사용량 저장 파일 (기본 quota_ledger.json)
+"""
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    PACIFIC = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # tzdata가 없는 환경 (Windows 등) - 표준시 기준으로 근사
+    PACIFIC = timezone(timedelta(hours=-8), 'PST')
+
+# API 메서드별 비용 (units)
+API_COSTS = {
+    'videos.list': 1,
+    'channels.list': 1,
+    'videoCategories.list': 1,
+    'search.list': 100,
+}
+
+# 우선순위별로 호출 후에도 남아 있어야 하는 할당량 비율
+PRIORITY_FLOORS = {
+    'high': 0.0,     # 급상승 차트 갱신 (서비스 데이터의 근간)
+    'normal': 0.05,  # 상세 정보 조회
+    'low': 0.2,      # 검색 (100 units)
+}
+
+
+def pacific_today(now: Optional[datetime] = None) -> str:
+    """할당량 기준 날짜 (태평양 시간)"""
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(PACIFIC).date().isoformat()
+
+
+def next_reset(now: Optional[datetime] = None) -> datetime:
+    """다음 할당량 리셋 시각 (태평양 시간 자정, UTC로 반환)"""
+    now = (now or datetime.now(timezone.utc)).astimezone(PACIFIC)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=PACIFIC)
+    return midnight.astimezone(timezone.utc)
+
+
+class QuotaLedger:
+    """일일 할당량 사용 기록 (스레드 안전)"""
+
+    def __init__(self, path: Optional[str] = None, daily_quota: Optional[int] = None):
+        self.path = path or os.getenv('YOUTUBE_QUOTA_FILE', 'quota_ledger.json')
+        self.daily_quota = daily_quota or int(os.getenv('YOUTUBE_DAILY_QUOTA', '10000'))
+        self._lock = threading.Lock()
+        self.day = pacific_today()
+        self.spent = 0
+        self.calls: Dict[str, int] = {}
+        self.denied: Dict[str, int] = {}
+        self.exhausted = False
+        self._load()
+
+    def cost(self, method: str, calls: int = 1) -> int:
+        return API_COSTS.get(method, 1) * calls
+
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_day()
+            return self._remaining()
+
+    def can_afford(self, method: str, calls: int = 1, priority: str = 'normal') -> bool:
+        """호출 calls번을 우선순위 여유분 안에서 할 수 있는지 (기록하지 않음)"""
+        with self._lock:
+            self._roll_day()
+            return self._allowed(self.cost(method, calls), priority)
+
+    def affordable_calls(self, method: str, priority: str = 'normal') -> int:
+        """우선순위 여유분 안에서 할 수 있는 최대 호출 수"""
+        with self._lock:
+            self._roll_day()
+            if self.exhausted:
+                return 0
+            budget = self._remaining() - int(self.daily_quota * PRIORITY_FLOORS.get(priority, 0.0))
+            return max(0, budget // self.cost(method))
+
+    def reserve(self, method: str, calls: int = 1, priority: str = 'normal') -> bool:
+        """
+        호출 전에 비용을 차감 (실패한 호출도 할당량을 소모하므로 미리 기록)
+
+        Returns:
+            허용되면 True, 할당량이 부족하면 False (호출하지 말 것)
+        """
+        units = self.cost(method, calls)
+        with self._lock:
+            self._roll_day()
+            if not self._allowed(units, priority):
+                self.denied[method] = self.denied.get(method, 0) + calls
+                return False
+            self.spent += units
+            self.calls[method] = self.calls.get(method, 0) + calls
+            self._save()
+            return True
+
+    def mark_exhausted(self):
+        """API가 quotaExceeded로 응답함 - 리셋 전까지 더 호출하지 않음"""
+        with self._lock:
+            self._roll_day()
+            if not self.exhausted:
+                self.exhausted = True
+                self._save()
+                print(f"🚫 YouTube API 할당량 소진 - {next_reset().isoformat()} 까지 캐시 사용")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._roll_day()
+            return {
+                "day": self.day,
+                "daily_quota": self.daily_quota,
+                "spent": self.spent,
+                "remaining": self._remaining(),
+                "exhausted": self.exhausted,
+                "calls": dict(self.calls),
+                "denied": dict(self.denied),
+                "resets_at": next_reset().isoformat(),
+            }
+
+    def _remaining(self) -> int:
+        return 0 if self.exhausted else max(0, self.daily_quota - self.spent)
+
+    def _allowed(self, units: int, priority: str) -> bool:
+        floor = int(self.daily_quota * PRIORITY_FLOORS.get(priority, 0.0))
+        return self._remaining() - units >= floor
+
+    def _roll_day(self):
+        # 호출자가 self._lock을 보유한 상태
+        today = pacific_today()
+        if today != self.day:
+            self.day = today
+            self.spent = 0
+            self.calls = {}
+            self.denied = {}
+            self.exhausted = False
+            self._save()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('day') != self.day:
+            return  # 지난 날짜 기록은 리셋됨
+        self.spent = int(data.get('spent', 0))
+        self.calls = dict(data.get('calls', {}))
+        self.exhausted = bool(data.get('exhausted', False))
+        print(f"📒 오늘({self.day} PT) 할당량 사용량 복원: {self.spent}/{self.daily_quota} units")
+
+    def _save(self):
+        # 호출자가 self._lock을 보유한 상태, 임시 파일 + os.replace로 저장
+        data = {
+            "day": self.day,
+            "spent": self.spent,
+            "calls": self.calls,
+            "exhausted": self.exhausted,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.quota_', suffix='.tmp', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ 할당량 기록 저장 실패: {e}")
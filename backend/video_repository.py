@@ -0,0 +1,347 @@
+"""
+SQLite 영상 저장소 (선택 사항)
+JSON 캐시 파일은 변경이 있을 때마다 통째로 다시 쓰고 다시 읽어야 한다.
+VIDEO_DB_PATH 환경 변수를 지정하면 WAL 모드 SQLite 파일에 영상 단위로
+저장하고, 필터 조건은 인덱스 컬럼 조회로 처리한다.
+
+컬럼의 published_at / crawled_at 은 정렬·범위 비교를 위한 epoch 초이며,
+원본 문자열은 data(JSON) 컬럼에 그대로 남아 있다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Iterable, Optional, Tuple
+
+# 영어 영상 타입 필터 → 저장된 한글 값
+VIDEO_TYPE_ALIASES = {'shorts': '쇼츠', 'long': '롱폼'}
+
+# 기간 필터 → 기준 일수
+TIME_FILTER_DAYS = {'today': 1, 'week': 7, 'month': 30}
+
+# 정렬 기준 → ORDER BY (동점은 저장 순서)
+SORT_COLUMNS = {
+    'trend_score': 'trend_score DESC',
+    'views': 'view_count DESC',
+    'crawled_at': 'crawled_at IS NULL, crawled_at DESC',
+}
+
+# distinct() 로 조회할 수 있는 컬럼
+FACET_COLUMNS = ('category', 'region', 'language', 'video_type')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT UNIQUE,
+    category TEXT,
+    region TEXT,
+    language TEXT,
+    video_type TEXT,
+    trend_score REAL,
+    view_count INTEGER,
+    published_at REAL,
+    crawled_at REAL,
+    first_seen TEXT,
+    last_seen TEXT,
+    last_seen_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_videos_category ON videos (category);
+CREATE INDEX IF NOT EXISTS idx_videos_region ON videos (region);
+CREATE INDEX IF NOT EXISTS idx_videos_language ON videos (language);
+CREATE INDEX IF NOT EXISTS idx_videos_video_type ON videos (video_type);
+CREATE INDEX IF NOT EXISTS idx_videos_trend_score ON videos (trend_score);
+CREATE INDEX IF NOT EXISTS idx_videos_view_count ON videos (view_count);
+CREATE INDEX IF NOT EXISTS idx_videos_published_at ON videos (published_at);
+CREATE INDEX IF NOT EXISTS idx_videos_crawled_at ON videos (crawled_at);
+CREATE INDEX IF NOT EXISTS idx_videos_last_seen_at ON videos (last_seen_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO videos (video_id, category, region, language, video_type, trend_score, view_count,
+                    published_at, crawled_at, first_seen, last_seen, last_seen_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (video_id) DO UPDATE SET
+    category = excluded.category,
+    region = excluded.region,
+    language = excluded.language,
+    video_type = excluded.video_type,
+    trend_score = excluded.trend_score,
+    view_count = excluded.view_count,
+    published_at = excluded.published_at,
+    crawled_at = excluded.crawled_at,
+    first_seen = COALESCE(videos.first_seen, excluded.first_seen),
+    last_seen = excluded.last_seen,
+    last_seen_at = excluded.last_seen_at,
+    data = excluded.data
+"""
+
+
+def _parse_time(value) -> Optional[float]:
+    """ISO 문자열을 epoch 초로 변환 (timezone 정보는 버림)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if parsed.tzinfo is not None:
+            parsed = parsed.replace(tzinfo=None)
+        return parsed.timestamp()
+    except (ValueError, OSError):
+        return None
+
+
+def parse_views(views) -> int:
+    """조회수 값을 정수로 변환 ("3K", "1.2M", "1,234" 또는 숫자)"""
+    if isinstance(views, (int, float)):
+        return int(views)
+    if not views:
+        return 0
+    views = str(views).strip()
+    try:
+        if 'M' in views:
+            return int(float(views.replace('M', '')) * 1000000)
+        if 'K' in views:
+            return int(float(views.replace('K', '')) * 1000)
+        return int(float(views.replace(',', '')))
+    except ValueError:
+        return 0
+
+
+def video_view_count(video: Dict) -> int:
+    """영상의 정수 조회수 (원본 view_count 우선, 없으면 views 텍스트에서)"""
+    view_count = video.get('view_count')
+    if isinstance(view_count, (int, float)):
+        return int(view_count)
+    return parse_views(video.get('views'))
+
+
+def _strip(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _row(video: Dict) -> tuple:
+    """영상 dict → videos 테이블 행"""
+    trend_score = video.get('trend_score')
+    crawled_at = _parse_time(video.get('crawled_at'))
+    # 마지막 확인 시각이 없으면 수집 시각, 그것도 없으면 지금 (TTL 만료 기준)
+    last_seen_at = _parse_time(video.get('last_seen')) or crawled_at or time.time()
+    return (
+        video.get('video_id') or None,
+        _strip(video.get('category')),
+        _strip(video.get('region')),
+        _strip(video.get('language')),
+        _strip(video.get('video_type')),
+        trend_score if isinstance(trend_score, (int, float)) else 0,
+        video_view_count(video),
+        _parse_time(video.get('published_at')),
+        crawled_at,
+        video.get('first_seen'),
+        video.get('last_seen'),
+        last_seen_at,
+        json.dumps(video, ensure_ascii=False),
+    )
+
+
+class VideoRepository:
+    """WAL 모드 SQLite 영상 저장소 (스레드별 연결)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # 쓰기는 한 번에 하나 (읽기는 WAL 덕분에 쓰기와 동시에 가능)
+        self._write_lock = threading.Lock()
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work):
+        """BEGIN IMMEDIATE ~ COMMIT 안에서 work(conn) 실행"""
+        with self._write_lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = work(conn)
+                conn.execute('COMMIT')
+                return result
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def replace_all(self, videos: List[Dict], last_updated: Optional[str] = None,
+                    source: Optional[str] = None) -> int:
+        """전체 목록으로 교체 (크롤러의 전체 저장 대체)"""
+        def work(conn):
+            conn.execute('DELETE FROM videos')
+            conn.executemany(UPSERT_SQL, (_row(video) for video in videos))
+            self._set_meta(conn, last_updated, source)
+            return len(videos)
+        return self._transaction(work)
+
+    def apply_changes(self, videos: List[Dict] = (), seen_ids: Iterable[str] = (),
+                      seen_at: Optional[str] = None, expire_before: Optional[float] = None,
+                      last_updated: Optional[str] = None, source: Optional[str] = None) -> Dict:
+        """바뀐 영상 upsert + 다시 확인된 영상 last_seen 갱신 + 만료 삭제 (한 트랜잭션)"""
+        seen_ids = list(seen_ids)
+
+        def work(conn):
+            conn.executemany(UPSERT_SQL, (_row(video) for video in videos))
+            touched = 0
+            if seen_ids and seen_at:
+                seen_epoch = _parse_time(seen_at)
+                touched = conn.executemany(
+                    'UPDATE videos SET last_seen = ?, last_seen_at = ? WHERE video_id = ?',
+                    ((seen_at, seen_epoch, video_id) for video_id in seen_ids)
+                ).rowcount
+            expired = 0
+            if expire_before is not None:
+                expired = conn.execute(
+                    'DELETE FROM videos WHERE last_seen_at < ?', (expire_before,)
+                ).rowcount
+            self._set_meta(conn, last_updated, source)
+            return {"upserted": len(videos), "touched": touched, "expired": expired}
+        return self._transaction(work)
+
+    def _set_meta(self, conn: sqlite3.Connection, last_updated: Optional[str], source: Optional[str]):
+        for key, value in (('last_updated', last_updated), ('source', source)):
+            if value is not None:
+                conn.execute(
+                    'INSERT INTO meta (key, value) VALUES (?, ?) '
+                    'ON CONFLICT (key) DO UPDATE SET value = excluded.value',
+                    (key, value)
+                )
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM videos').fetchone()[0]
+
+    def meta(self) -> Dict[str, str]:
+        return dict(self._connect().execute('SELECT key, value FROM meta').fetchall())
+
+    def load(self) -> Dict:
+        """JSON 캐시 파일과 같은 모양의 전체 데이터 (저장 순서)"""
+        rows = self._connect().execute(
+            'SELECT data, first_seen, last_seen FROM videos ORDER BY id'
+        ).fetchall()
+        videos = [self._record(*row) for row in rows]
+        meta = self.meta()
+        return {
+            "last_updated": meta.get('last_updated'),
+            "videos": videos,
+            "count": len(videos),
+            "source": meta.get('source')
+        }
+
+    def query(self, category: Optional[str] = None, region: Optional[str] = None,
+              language: Optional[str] = None, min_trend_score: Optional[int] = None,
+              video_type: Optional[str] = None, time_filter: Optional[str] = None,
+              sort_by: str = 'trend_score', limit: int = 20,
+              prefer_language: Optional[str] = None) -> Tuple[List[Dict], int]:
+        """필터 조건을 인덱스 컬럼 조회로 처리 → (상위 limit개, 전체 개수)
+
+        prefer_language를 주면 해당 언어 영상을 먼저 정렬한다.
+        """
+        clauses, params = [], []
+        for column, value in (('category', category), ('region', region), ('language', language)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value.strip())
+        if video_type:
+            clauses.append('video_type = ?')
+            params.append(VIDEO_TYPE_ALIASES.get(video_type, video_type))
+        if min_trend_score:
+            clauses.append('trend_score >= ?')
+            params.append(min_trend_score)
+        if time_filter and time_filter in TIME_FILTER_DAYS:
+            cutoff = datetime.now() - timedelta(days=TIME_FILTER_DAYS[time_filter])
+            clauses.append('crawled_at >= ?')
+            params.append(cutoff.timestamp())
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        order = []
+        order_params = []
+        if prefer_language:
+            order.append('language IS NOT ?')
+            order_params.append(prefer_language)
+        if sort_by in SORT_COLUMNS:
+            order.append(SORT_COLUMNS[sort_by])
+        order.append('id')
+
+        conn = self._connect()
+        total = conn.execute(f'SELECT COUNT(*) FROM videos{where}', params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT data, first_seen, last_seen FROM videos{where} ORDER BY {', '.join(order)} LIMIT ?",
+            params + order_params + [max(limit, 0)]
+        ).fetchall()
+        return [self._record(*row) for row in rows], total
+
+    def distinct(self, column: str) -> List[str]:
+        """컬럼의 고유 값 (필터 옵션용)"""
+        if column not in FACET_COLUMNS:
+            raise ValueError(f"distinct를 지원하지 않는 컬럼: {column}")
+        rows = self._connect().execute(
+            f"SELECT DISTINCT {column} FROM videos WHERE {column} IS NOT NULL AND {column} != '' "
+            f"ORDER BY {column}"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _record(data: str, first_seen: Optional[str], last_seen: Optional[str]) -> Dict:
+        record = json.loads(data)
+        # last_seen은 갱신 시 컬럼만 바꾸므로 컬럼 값을 우선
+        if first_seen:
+            record['first_seen'] = first_seen
+        if last_seen:
+            record['last_seen'] = last_seen
+        return record
+
+
+def open_repository(db_path: Optional[str] = None, import_from: Optional[str] = None) -> Optional[VideoRepository]:
+    """VIDEO_DB_PATH가 설정되어 있으면 저장소를 연다 (없으면 None → JSON 캐시 사용)
+
+    DB가 비어 있고 import_from JSON 캐시가 있으면 한 번 가져온다.
+    """
+    db_path = db_path or os.getenv('VIDEO_DB_PATH')
+    if not db_path:
+        return None
+    try:
+        repository = VideoRepository(db_path)
+    except sqlite3.Error as e:
+        print(f"❌ SQLite 영상 저장소 열기 실패 ({db_path}): {e}")
+        return None
+
+    if import_from and repository.count() == 0 and Path(import_from).exists():
+        try:
+            with open(import_from, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+            imported = repository.replace_all(
+                cache_data.get('videos', []), cache_data.get('last_updated'), cache_data.get('source')
+            )
+            print(f"📥 JSON 캐시 → SQLite 이전 완료: {imported}개 영상")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"⚠️ JSON 캐시 이전 실패: {e}")
+
+    print(f"🗄️ SQLite 영상 저장소 사용: {db_path} ({repository.count()}개 영상)")
+    return repository
@@ -0,0 +1,311 @@
+"""
+영상별 조회수 이력과 조회수 증가 속도 기반 트렌드 점수
+크롤링할 때마다 (시각, 조회수)를 영상별 이력에 덧붙이고, 이력으로 시간당 조회수
+증가량(velocity)과 그 변화량(acceleration)을 계산한다. 한 시점의 조회수로 추정하던
+트렌드 점수 대신 실제로 조회수가 얼마나 빠르게 늘고 있는지로 급상승 순위를 매긴다.
+
+- 이력은 영상마다 array('d') 시각 / array('q') 조회수 두 배열로 보관
+- 오래된 점은 구간별로 솎아냄 (6시간 이내 전부, 48시간 이내 1시간에 1개, 그 이전 6시간에 1개)
+- 계산은 이번에 관측된 영상만 (전체를 다시 계산하지 않음)
+- 캐시 파일 옆 .history 파일에 바이너리로 저장 (임시 파일 + os.replace)
+
+파일 구조: MAGIC(8) | 헤더 길이(uint32) | 헤더 JSON | 시각 배열 (8바이트 정렬) | 조회수 배열
+
+환경 변수:
+    VIEW_HISTORY_MAX_POINTS         영상당 최대 점 수 (기본 96)
+    VIEW_HISTORY_RETENTION_HOURS    이 시간 동안 관측되지 않은 영상 이력 삭제 (기본 168)
+    VIEW_VELOCITY_WINDOW_MINUTES    증가 속도를 재는 구간 (기본 60)
+"""
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b'VHIST001'
+HEADER_LENGTH = struct.Struct('<I')
+
+# (이 나이 미만, 솎아내는 간격) - 간격이 0이면 모두 보관
+DOWNSAMPLE_TIERS = (
+    (6 * 3600, 0),
+    (48 * 3600, 3600),
+    (float('inf'), 6 * 3600),
+)
+
+# 구간이 이보다 짧으면 속도를 계산하지 않음 (첫 관측 직후)
+MIN_SPAN_SECONDS = 600
+
+# 시간당 조회수 증가량 → 트렌드 점수
+VELOCITY_SCORES = (
+    (100000, 100),
+    (30000, 95),
+    (10000, 90),
+    (3000, 85),
+    (1000, 80),
+    (100, 75),
+)
+BASE_VELOCITY_SCORE = 70
+
+
+def history_path(cache_file) -> Path:
+    """캐시 파일 옆에 두는 조회수 이력 파일 경로"""
+    return Path(cache_file).with_suffix('.history')
+
+
+def velocity_score(views_per_hour: float) -> int:
+    """시간당 조회수 증가량 → 트렌드 점수"""
+    for threshold, score in VELOCITY_SCORES:
+        if views_per_hour >= threshold:
+            return score
+    return BASE_VELOCITY_SCORE
+
+
+class ViewSeries:
+    """영상 하나의 (시각, 조회수) 이력 - 시각 오름차순"""
+
+    __slots__ = ('times', 'views')
+
+    def __init__(self, times: Optional[array] = None, views: Optional[array] = None):
+        self.times = times if times is not None else array('d')
+        self.views = views if views is not None else array('q')
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def append(self, at: float, view_count: int, max_points: int):
+        if self.times and at <= self.times[-1]:
+            # 같은 시각(또는 시계가 뒤로 간 경우)은 마지막 점을 교체
+            self.views[-1] = view_count
+            return
+        self.times.append(at)
+        self.views.append(view_count)
+        if len(self.times) > max_points:
+            self.downsample(at, max_points)
+
+    def downsample(self, now: float, max_points: int):
+        """나이 구간별로 간격마다 가장 최근 점 하나만 남기고, 그래도 많으면 오래된 점부터 삭제"""
+        kept: List[int] = []
+        last_bucket = None
+        for index, at in enumerate(self.times):
+            age = now - at
+            step = next(step for max_age, step in DOWNSAMPLE_TIERS if age < max_age)
+            bucket = (step, int(at // step)) if step else None
+            if bucket is not None and bucket == last_bucket:
+                kept[-1] = index
+            else:
+                kept.append(index)
+            last_bucket = bucket
+        kept = kept[-max_points:]
+        self.times = array('d', (self.times[index] for index in kept))
+        self.views = array('q', (self.views[index] for index in kept))
+
+    def trend(self, window: float) -> Optional[Dict]:
+        """마지막 구간의 시간당 증가량, 직전 구간 대비 변화량(시간당²), 점수 (이력이 짧으면 None)"""
+        times, views = self.times, self.views
+        last = len(times) - 1
+        start = self._window_start(last, window)
+        if start is None:
+            return None
+        hours = (times[last] - times[start]) / 3600
+        velocity = (views[last] - views[start]) / hours
+
+        acceleration = None
+        previous = self._window_start(start, window)
+        if previous is not None:
+            previous_velocity = (views[start] - views[previous]) / ((times[start] - times[previous]) / 3600)
+            # 두 구간 중간 시점 사이의 시간
+            midpoint_hours = (times[last] - times[previous]) / 2 / 3600
+            acceleration = round((velocity - previous_velocity) / midpoint_hours, 1)
+
+        return {
+            "views_per_hour": round(velocity),
+            "views_acceleration": acceleration,
+            "trend_score": velocity_score(velocity),
+        }
+
+    def _window_start(self, end: int, window: float) -> Optional[int]:
+        """end보다 window 이상 앞선 가장 최근 점 (없으면 MIN_SPAN 이상 떨어진 첫 점)"""
+        if end <= 0:
+            return None
+        times = self.times
+        index = bisect_right(times, times[end] - window, 0, end) - 1
+        if index >= 0:
+            return index
+        return 0 if times[end] - times[0] >= MIN_SPAN_SECONDS else None
+
+
+class ViewHistory:
+    """video_id → 조회수 이력 (스레드 안전, 처음 사용할 때 파일에서 로드)"""
+
+    def __init__(self, path=None, max_points: Optional[int] = None,
+                 retention_hours: Optional[float] = None, window_minutes: Optional[float] = None):
+        self.path = Path(path) if path else None
+        if max_points is None:
+            max_points = int(os.getenv('VIEW_HISTORY_MAX_POINTS', '96'))
+        if retention_hours is None:
+            retention_hours = float(os.getenv('VIEW_HISTORY_RETENTION_HOURS', '168'))
+        if window_minutes is None:
+            window_minutes = float(os.getenv('VIEW_VELOCITY_WINDOW_MINUTES', '60'))
+        self.max_points = max(2, max_points)
+        self.retention_seconds = retention_hours * 3600
+        self.window_seconds = window_minutes * 60
+        self._series: Dict[str, ViewSeries] = {}
+        self._loaded = self.path is None
+        self._lock = threading.Lock()
+        self.last_observed = 0
+        self.last_with_trend = 0
+
+    def observe(self, observations: Iterable[Tuple[str, int]], now: Optional[float] = None) -> Dict[str, Dict]:
+        """(video_id, 조회수)를 이력에 추가하고, 관측한 영상의 트렌드 반환 (이력이 짧은 영상은 제외)"""
+        now = now if now is not None else time.time()
+        trends = {}
+        with self._lock:
+            self._load()
+            observed = 0
+            for video_id, view_count in observations:
+                if not video_id or not view_count or view_count < 0:
+                    continue
+                series = self._series.get(video_id)
+                if series is None:
+                    series = self._series[video_id] = ViewSeries()
+                series.append(now, int(view_count), self.max_points)
+                observed += 1
+                trend = series.trend(self.window_seconds)
+                if trend is not None:
+                    trends[video_id] = trend
+            self.last_observed = observed
+            self.last_with_trend = len(trends)
+        return trends
+
+    def annotate(self, videos: List[Dict], now: Optional[float] = None, save: bool = True) -> List[Dict]:
+        """수집한 영상 목록을 관측하고 트렌드를 반영한 사본 반환 (전체 갱신용)"""
+        trends = self.observe(((video.get('video_id'), video.get('view_count')) for video in videos), now)
+        annotated = [
+            with_trend(video, trends[video.get('video_id')]) if video.get('video_id') in trends else video
+            for video in videos
+        ]
+        if save:
+            self.save(now)
+        return annotated
+
+    def get(self, video_id: str) -> Optional[ViewSeries]:
+        with self._lock:
+            self._load()
+            return self._series.get(video_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "videos": len(self._series),
+                "points": sum(len(series) for series in self._series.values()),
+                "last_observed": self.last_observed,
+                "last_with_trend": self.last_with_trend,
+            }
+
+    # ------------------------------------------------------------------
+    # 파일 저장/로드
+    # ------------------------------------------------------------------
+
+    def save(self, now: Optional[float] = None):
+        """보관 기간이 지난 이력을 지우고 파일에 저장 (임시 파일 + os.replace)"""
+        if self.path is None:
+            return
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._load()
+            cutoff = now - self.retention_seconds
+            self._series = {
+                video_id: series for video_id, series in self._series.items()
+                if series.times and series.times[-1] >= cutoff
+            }
+            video_ids = list(self._series)
+            times = array('d')
+            views = array('q')
+            counts = []
+            for video_id in video_ids:
+                series = self._series[video_id]
+                times.extend(series.times)
+                views.extend(series.views)
+                counts.append(len(series))
+
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "video_ids": video_ids,
+            "counts": counts,
+        }, ensure_ascii=False).encode('utf-8')
+        data_start = _padded(len(MAGIC) + HEADER_LENGTH.size + len(header))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f'.{self.path.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC)
+                f.write(HEADER_LENGTH.pack(len(header)))
+                f.write(header)
+                f.write(b'\0' * (data_start - f.tell()))
+                f.write(times.tobytes())
+                f.write(views.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _load(self):
+        # 호출자가 self._lock을 보유한 상태
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError("조회수 이력 파일 형식이 아닙니다")
+            header_start = len(MAGIC) + HEADER_LENGTH.size
+            (header_length,) = HEADER_LENGTH.unpack(data[len(MAGIC):header_start])
+            header = json.loads(data[header_start:header_start + header_length])
+            total = sum(header['counts'])
+            times_start = _padded(header_start + header_length)
+            views_start = times_start + total * 8
+            times = array('d', data[times_start:views_start])
+            views = array('q', data[views_start:views_start + total * 8])
+            if len(times) != total or len(views) != total:
+                raise ValueError("조회수 이력 파일이 잘렸습니다")
+            if header['byteorder'] != sys.byteorder:
+                times.byteswap()
+                views.byteswap()
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"⚠️ 조회수 이력 로드 실패 ({self.path.name}): {e}")
+            return
+
+        offset = 0
+        for video_id, count in zip(header['video_ids'], header['counts']):
+            self._series[video_id] = ViewSeries(times[offset:offset + count], views[offset:offset + count])
+            offset += count
+        print(f"📈 조회수 이력 로드: {len(self._series)}개 영상 / {total}개 관측")
+
+
+def with_trend(video: Dict, trend: Dict) -> Dict:
+    """영상 사본에 증가 속도 기반 트렌드 반영 (크롤러가 매긴 점수는 base_trend_score로 보관)"""
+    record = dict(video)
+    if 'trend_score' in video:
+        record['base_trend_score'] = video['trend_score']
+    record.update(trend)
+    return record
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
@@ -4,11 +4,17 @@ YouTube Data API v3 서비스
 """
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import random
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from quota_ledger import QuotaLedger
+from etag_cache import EtagCache
+from language_detect import detect_language, detect_languages
 
 # 환경 변수 로드
 load_dotenv()
@@ -16,12 +22,33 @@ load_dotenv()
 class YouTubeAPIService:
     """YouTube Data API v3를 사용한 데이터 수집 서비스"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # YouTube API 주요 카테고리 ID (카테고리별 수집 대상)
+    MAIN_CATEGORIES = {
+        '10': '음악',
+        '20': '게임',
+        '28': '과학기술',
+        '27': '교육/학습',
+        '24': '엔터테인먼트',
+        '26': '라이프스타일',
+        '25': '뉴스/정치',
+        '17': '스포츠',
+        '23': '코미디',
+        '22': '사람/블로그'
+    }
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        quota: Optional[QuotaLedger] = None
+    ):
         """
         YouTube API 서비스 초기화
         
         Args:
             api_key: YouTube Data API v3 키 (없으면 환경 변수에서 로드)
+            max_workers: 동시에 보낼 차트 요청 수 (없으면 YOUTUBE_API_MAX_WORKERS, 기본 6)
+            quota: 할당량 장부 (없으면 환경 변수 설정으로 생성)
         """
         self.api_key = api_key or os.getenv('YOUTUBE_API_KEY')
         
@@ -35,6 +62,25 @@ class YouTubeAPIService:
         # YouTube API 클라이언트 생성
         self.youtube = build('youtube', 'v3', developerKey=self.api_key)
         
+        # 동시 요청용 스레드별 클라이언트 (discovery 클라이언트의 httplib2는 스레드 안전하지 않음)
+        self._local = threading.local()
+        self._local.youtube = self.youtube
+        self.max_workers = max(1, max_workers or int(os.getenv('YOUTUBE_API_MAX_WORKERS', '6')))
+        self.last_fetch_stats: Dict = {}
+        
+        # 일일 할당량 장부 (호출 전에 비용 차감, 부족하면 호출하지 않음)
+        self.quota = quota or QuotaLedger()
+        
+        # get_videos_by_ids 결과 캐시: video_id → (조회 시각, 영상 정보)
+        # STATS_TTL초 안에 다시 조회한 ID는 API를 부르지 않음
+        self.stats_ttl = int(os.getenv('YOUTUBE_STATS_TTL', '600'))
+        self.stats_cache_size = int(os.getenv('YOUTUBE_STATS_CACHE_SIZE', '20000'))
+        self._stats_cache: Dict[str, Tuple[float, Dict]] = {}
+        self._stats_lock = threading.Lock()
+        
+        # 요청별 ETag 캐시 (If-None-Match → 304면 보관된 파싱 결과 사용)
+        self.etags = EtagCache()
+        
         # 카테고리 매핑 (YouTube 카테고리 ID → 한국어 카테고리명)
         self.category_mapping = {
             '1': '영화/애니메이션',
@@ -76,7 +122,7 @@ class YouTubeAPIService:
     
     def detect_language(self, text: str) -> str:
         """
-        텍스트에서 언어 감지
+        텍스트에서 언어 감지 (language_detect.detect_language)
         
         Args:
             text: 분석할 텍스트
@@ -84,81 +130,80 @@ class YouTubeAPIService:
         Returns:
             감지된 언어 ('한국어', '일본어', '영어', '중국어', '기타')
         """
-        if not text:
-            return '기타'
-        
-        # 각 언어별 문자 개수 카운트
-        korean_count = 0
-        japanese_count = 0
-        chinese_count = 0
-        english_count = 0
-        
-        for char in text:
-            # 한글 (가-힣)
-            if '\uac00' <= char <= '\ud7a3':
-                korean_count += 1
-            # 일본어 히라가나 (ぁ-ん)
-            elif '\u3040' <= char <= '\u309f':
-                japanese_count += 1
-            # 일본어 가타카나 (ァ-ヶ)
-            elif '\u30a0' <= char <= '\u30ff':
-                japanese_count += 1
-            # 영어 (A-Z, a-z)
-            elif ('A' <= char <= 'Z') or ('a' <= char <= 'z'):
-                english_count += 1
-            # 중국어 간체/번체 (CJK Unified Ideographs)
-            elif '\u4e00' <= char <= '\u9fff':
-                chinese_count += 1
-        
-        # 우선순위 기반 언어 감지
-        # 1. 한글이 5개 이상 있으면 무조건 한국어
-        if korean_count >= 5:
-            return '한국어'
-        
-        # 2. 일본어 문자(히라가나 or 가타카나)가 3개 이상 있으면 일본어
-        if japanese_count >= 3:
-            return '일본어'
-        
-        # 3. 중국어 한자가 5개 이상 있고, 한글/일본어가 없으면 중국어
-        if chinese_count >= 5 and korean_count == 0 and japanese_count == 0:
-            return '중국어'
-        
-        # 4. 위 조건에 해당하지 않으면 가장 많이 사용된 언어
-        counts = {
-            '한국어': korean_count,
-            '일본어': japanese_count,
-            '중국어': chinese_count,
-            '영어': english_count
-        }
+        return detect_language(text)
+    
+    def _client(self):
+        """현재 스레드의 YouTube API 클라이언트 (처음 사용하는 스레드에서 생성)"""
+        client = getattr(self._local, 'youtube', None)
+        if client is None:
+            client = self._local.youtube = build('youtube', 'v3', developerKey=self.api_key)
+        return client
+    
+    def _handle_http_error(self, e: HttpError):
+        """API 오류 출력 (할당량 초과면 장부에 기록)"""
+        if e.resp.status == 403:
+            print("💡 할당량 초과 또는 API 키 문제일 수 있습니다.")
+            print("   - Google Cloud Console에서 할당량 확인")
+            print("   - API 키가 올바른지 확인")
+            if 'quotaExceeded' in str(e) or 'dailyLimitExceeded' in str(e):
+                self.quota.mark_exhausted()
+    
+    def _list_videos(self, endpoint: str, params: Dict, parse):
+        """
+        videos.list 조건부 요청
+        
+        같은 파라미터로 받은 ETag가 있으면 If-None-Match를 붙여 보내고, 304면
+        보관된 parse 결과를 반환한다. HttpError는 호출하는 쪽에서 처리한다.
         
-        max_count = max(counts.values())
-        if max_count == 0:
-            return '기타'
+        Args:
+            endpoint: 지표 집계용 엔드포인트 이름
+            params: videos().list 파라미터
+            parse: 응답 dict → 결과 변환 함수
         
-        # 가장 많이 사용된 언어 반환 (동점인 경우 우선순위)
-        for lang in ['한국어', '일본어', '중국어', '영어']:
-            if counts[lang] == max_count:
-                return lang
+        Returns:
+            (결과, 304 여부)
+        """
+        key = self.etags.key(endpoint, params)
+        cached = self.etags.lookup(endpoint, key)
         
-        return '기타'
+        request = self._client().videos().list(**params)
+        if cached:
+            request.headers['If-None-Match'] = cached[0]
+        try:
+            response = request.execute()
+        except HttpError as e:
+            if cached and e.resp.status == 304:
+                self.etags.not_modified(endpoint)
+                return cached[1], True
+            raise
+        
+        result = parse(response)
+        self.etags.store(key, response.get('etag'), result)
+        return result, False
     
     def get_trending_videos(
         self,
         region_code: str = 'KR',
         max_results: int = 50,
-        category_id: Optional[str] = None
+        category_id: Optional[str] = None,
+        priority: str = 'high'
     ) -> List[Dict]:
         """
-        급상승 영상 목록 가져오기
+        급상승 영상 목록 가져오기 (videos.list, 1 unit)
         
         Args:
             region_code: 지역 코드 (KR=한국, US=미국, JP=일본 등)
             max_results: 최대 결과 수 (1-50)
             category_id: 카테고리 ID (선택사항)
+            priority: 할당량 우선순위 (high/normal/low)
         
         Returns:
-            영상 정보 리스트
+            영상 정보 리스트 (할당량이 부족하면 빈 리스트)
         """
+        if not self.quota.reserve('videos.list', priority=priority):
+            print(f"⏸️ 할당량 부족으로 급상승 조회 생략 ({region_code}/{category_id or '전체'})")
+            return []
+        
         try:
             # API 요청 파라미터
             request_params = {
@@ -173,25 +218,21 @@ class YouTubeAPIService:
             if not category_id:
                 del request_params['videoCategoryId']
             
-            # API 호출
-            request = self.youtube.videos().list(**request_params)
-            response = request.execute()
+            def parse(response: Dict) -> List[Dict]:
+                return self._parse_video_items(response.get('items', []), region_code)
             
-            # 결과 파싱
-            videos = []
-            for item in response.get('items', []):
-                video_info = self._parse_video_item(item, region_code)
-                if video_info:
-                    videos.append(video_info)
+            # API 호출 (현재 스레드의 클라이언트, 차트가 그대로면 304)
+            videos, not_modified = self._list_videos('videos.list:chart', request_params, parse)
+            if not_modified:
+                # 차트가 바뀌지 않았음을 지금 확인했으므로 수집 시각만 갱신한 복사본 반환
+                crawled_at = datetime.now().isoformat()
+                return [dict(video, crawled_at=crawled_at) for video in videos]
             
-            return videos
+            return [dict(video) for video in videos]
             
         except HttpError as e:
             print(f"❌ YouTube API 오류: {e}")
-            if e.resp.status == 403:
-                print("💡 할당량 초과 또는 API 키 문제일 수 있습니다.")
-                print("   - Google Cloud Console에서 할당량 확인")
-                print("   - API 키가 올바른지 확인")
+            self._handle_http_error(e)
             return []
         except Exception as e:
             print(f"❌ 예상치 못한 오류: {e}")
@@ -205,7 +246,7 @@ class YouTubeAPIService:
         published_after: Optional[datetime] = None
     ) -> List[Dict]:
         """
-        키워드로 영상 검색
+        키워드로 영상 검색 (search.list, 100 units - 할당량 우선순위 low)
         
         Args:
             query: 검색 키워드
@@ -214,8 +255,12 @@ class YouTubeAPIService:
             published_after: 이 날짜 이후에 업로드된 영상만 검색
         
         Returns:
-            영상 정보 리스트
+            영상 정보 리스트 (할당량이 빠듯하면 빈 리스트)
         """
+        if not self.quota.reserve('search.list', priority='low'):
+            print(f"⏸️ 할당량이 빠듯해 검색 생략: {query} (남은 할당량 {self.quota.remaining()} units)")
+            return []
+        
         try:
             # 기본값: 3개월 전
             if not published_after:
@@ -244,47 +289,115 @@ class YouTubeAPIService:
             
         except HttpError as e:
             print(f"❌ 검색 오류: {e}")
+            self._handle_http_error(e)
             return []
     
-    def get_videos_by_ids(self, video_ids: List[str]) -> List[Dict]:
+    def get_videos_by_ids(self, video_ids: List[str], force: bool = False) -> List[Dict]:
         """
         비디오 ID 리스트로 상세 정보 가져오기 (배치 처리)
         
+        ID 수 제한 없이 중복을 제거한 뒤 50개씩 나눠 동시에 조회한다 (배치당 videos.list 1 unit).
+        최근 stats_ttl초 안에 조회한 ID는 로컬 캐시에서 꺼내고 API를 부르지 않는다.
+        
         Args:
-            video_ids: 비디오 ID 리스트 (최대 50개)
+            video_ids: 비디오 ID 리스트
+            force: True면 캐시를 무시하고 모두 다시 조회
         
         Returns:
-            영상 정보 리스트
+            영상 정보 리스트 (입력 순서, 삭제/비공개 영상이나 할당량 부족으로 못 가져온 ID는 빠짐)
         """
+        # 입력 순서를 유지하며 중복 제거
+        unique_ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+        
+        now = time.time()
+        found: Dict[str, Dict] = {}
+        if not force:
+            with self._stats_lock:
+                for video_id in unique_ids:
+                    entry = self._stats_cache.get(video_id)
+                    if entry and now - entry[0] < self.stats_ttl:
+                        found[video_id] = entry[1]
+        
+        missing = [video_id for video_id in unique_ids if video_id not in found]
+        # API는 한 번에 최대 50개 처리 가능
+        batches = [missing[i:i + 50] for i in range(0, len(missing), 50)]
+        
+        if len(batches) == 1:
+            found.update(self._fetch_video_batch(batches[0]))
+        elif batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                for fetched in executor.map(self._fetch_video_batch, batches):
+                    found.update(fetched)
+        
+        if batches:
+            print(f"📦 비디오 정보 {len(unique_ids)}개: 캐시 {len(unique_ids) - len(missing)}개, "
+                  f"API {len(batches)}회 ({len(missing)}개)")
+        
+        # 호출하는 쪽이 수정해도 캐시가 바뀌지 않도록 복사본 반환
+        return [dict(found[video_id]) for video_id in unique_ids if video_id in found]
+    
+    def _fetch_video_batch(self, video_ids: List[str]) -> Dict[str, Dict]:
+        """50개 이하 ID 한 배치 조회 → {video_id: 영상 정보} (결과는 stats 캐시에 저장)"""
+        if not self.quota.reserve('videos.list', priority='normal'):
+            print(f"⏸️ 할당량 부족으로 비디오 정보 조회 생략 ({len(video_ids)}개)")
+            return {}
+        
+        def parse(response: Dict) -> Dict[str, Dict]:
+            return {video['video_id']: video for video in self._parse_video_items(response.get('items', []))}
+        
         try:
-            # API는 한 번에 최대 50개 처리 가능
-            video_ids = video_ids[:50]
-            
-            request = self.youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=','.join(video_ids)
-            )
-            response = request.execute()
-            
-            videos = []
-            for item in response.get('items', []):
-                video_info = self._parse_video_item(item)
-                if video_info:
-                    videos.append(video_info)
+            params = {
+                'part': 'snippet,statistics,contentDetails',
+                'id': ','.join(video_ids)
+            }
+            videos, not_modified = self._list_videos('videos.list:id', params, parse)
+            if not_modified:
+                crawled_at = datetime.now().isoformat()
+                videos = {video_id: dict(video, crawled_at=crawled_at) for video_id, video in videos.items()}
             
+            self._remember_stats(videos)
             return videos
             
         except HttpError as e:
             print(f"❌ 비디오 정보 조회 오류: {e}")
-            return []
+            self._handle_http_error(e)
+            return {}
+    
+    def _remember_stats(self, videos: Dict[str, Dict]):
+        """조회 결과를 stats 캐시에 저장 (크기를 넘으면 만료 항목, 그래도 넘으면 오래된 항목부터 정리)"""
+        now = time.time()
+        with self._stats_lock:
+            for video_id, video in videos.items():
+                self._stats_cache.pop(video_id, None)
+                self._stats_cache[video_id] = (now, video)
+            if len(self._stats_cache) > self.stats_cache_size:
+                self._stats_cache = {
+                    video_id: entry for video_id, entry in self._stats_cache.items()
+                    if now - entry[0] < self.stats_ttl
+                }
+                # dict는 삽입 순서 = 조회 시각 순서, 최근 항목만 남김
+                if len(self._stats_cache) > self.stats_cache_size:
+                    recent = list(self._stats_cache.items())[-self.stats_cache_size:]
+                    self._stats_cache = dict(recent)
     
-    def _parse_video_item(self, item: Dict, region_code: str = 'KR') -> Optional[Dict]:
+    def _parse_video_items(self, items: List[Dict], region_code: str = 'KR') -> List[Dict]:
+        """응답 한 페이지 파싱 (제목 언어는 페이지 단위로 한 번에 감지)"""
+        languages = detect_languages(item.get('snippet', {}).get('title', '') for item in items)
+        videos = []
+        for item, language in zip(items, languages):
+            video_info = self._parse_video_item(item, region_code, language)
+            if video_info:
+                videos.append(video_info)
+        return videos
+    
+    def _parse_video_item(self, item: Dict, region_code: str = 'KR', language: Optional[str] = None) -> Optional[Dict]:
         """
         YouTube API 응답 아이템을 우리 앱 형식으로 파싱
         
         Args:
             item: YouTube API 응답 아이템
             region_code: 지역 코드
+            language: 미리 감지한 제목 언어 (없으면 여기서 감지)
         
         Returns:
             파싱된 영상 정보
@@ -320,7 +433,8 @@ class YouTubeAPIService:
             
             # 언어 감지 (제목 기반)
             title = snippet['title']
-            language = self.detect_language(title)
+            if language is None:
+                language = detect_language(title)
             
             # 지역
             region = '국내' if region_code == 'KR' else '해외'
@@ -556,29 +670,11 @@ class YouTubeAPIService:
         Returns:
             모든 지역의 영상 정보 리스트
         """
-        all_videos = []
-        
-        for region_code in region_codes:
-            print(f"📡 {region_code} 지역 급상승 영상 수집 중...")
-            videos = self.get_trending_videos(
-                region_code=region_code,
-                max_results=max_results_per_region
-            )
-            all_videos.extend(videos)
-            print(f"✅ {region_code}: {len(videos)}개 수집 완료")
-        
-        # 중복 제거 (video_id 기준)
-        seen_ids = set()
-        unique_videos = []
-        for video in all_videos:
-            if video['video_id'] not in seen_ids:
-                seen_ids.add(video['video_id'])
-                unique_videos.append(video)
-        
-        # 트렌드 점수 기준으로 정렬
-        unique_videos.sort(key=lambda x: x['trend_score'], reverse=True)
-        
-        return unique_videos
+        print(f"📡 {', '.join(region_codes)} 지역 급상승 영상 동시 수집 중...")
+        return self._fetch_charts(
+            [(region_code, None) for region_code in region_codes],
+            max_results=max_results_per_region
+        )
     
     def get_trending_by_categories(
         self,
@@ -595,47 +691,17 @@ class YouTubeAPIService:
         Returns:
             모든 카테고리의 영상 정보 리스트
         """
-        # YouTube API 주요 카테고리 ID
-        main_categories = {
-            '10': '음악',
-            '20': '게임',
-            '28': '과학기술',
-            '27': '교육/학습',
-            '24': '엔터테인먼트',
-            '26': '라이프스타일',
-            '25': '뉴스/정치',
-            '17': '스포츠',
-            '23': '코미디',
-            '22': '사람/블로그'
-        }
-        
-        all_videos = []
-        seen_ids = set()
-        
-        for category_id, category_name in main_categories.items():
-            print(f"📂 [{category_name}] 카테고리 수집 중...")
-            
-            # 카테고리별로 50개씩 수집 (API 최대값)
-            videos = self.get_trending_videos(
-                region_code=region_code,
-                max_results=50,
-                category_id=category_id
-            )
-            
-            # 중복 제거하면서 추가
-            new_videos = 0
-            for video in videos:
-                if video['video_id'] not in seen_ids:
-                    seen_ids.add(video['video_id'])
-                    all_videos.append(video)
-                    new_videos += 1
-            
-            print(f"✅ [{category_name}]: {new_videos}개 신규 수집 (중복 제외)")
+        print(f"📂 {region_code} 카테고리 {len(self.MAIN_CATEGORIES)}개 동시 수집 중...")
         
-        # 트렌드 점수 기준으로 정렬
-        all_videos.sort(key=lambda x: x['trend_score'], reverse=True)
-        
-        return all_videos
+        # 카테고리별로 50개씩 수집 (API 최대값)
+        return self._fetch_charts(
+            [(region_code, category_id) for category_id in self.MAIN_CATEGORIES],
+            max_results=50
+        )
+    
+    def comprehensive_cost(self, region_codes: List[str]) -> int:
+        """get_comprehensive_data 한 번에 드는 차트 요청 수 (videos.list units)"""
+        return len(region_codes) * len(self.MAIN_CATEGORIES)
     
     def get_comprehensive_data(
         self,
@@ -646,38 +712,22 @@ class YouTubeAPIService:
         여러 지역에서 카테고리별로 종합 데이터 수집
         
         Args:
-            region_codes: 지역 코드 리스트
+            region_codes: 지역 코드 리스트 (앞쪽 지역일수록 할당량 우선순위가 높음)
             min_videos_per_category: 카테고리당 최소 영상 수
         
         Returns:
             모든 영상 정보 리스트
         """
-        all_videos = []
-        seen_ids = set()
-        
-        for region_code in region_codes:
-            print(f"\n🌍 {region_code} 지역 데이터 수집 시작...")
-            
-            # 카테고리별로 수집
-            videos = self.get_trending_by_categories(
-                region_code=region_code,
-                min_videos_per_category=min_videos_per_category
-            )
-            
-            # 중복 제거하면서 추가
-            new_videos = 0
-            for video in videos:
-                if video['video_id'] not in seen_ids:
-                    seen_ids.add(video['video_id'])
-                    all_videos.append(video)
-                    new_videos += 1
-            
-            print(f"✅ {region_code}: 총 {new_videos}개 신규 영상 수집")
+        print(f"\n🌍 {', '.join(region_codes)} × 카테고리 {len(self.MAIN_CATEGORIES)}개 동시 수집 시작...")
         
-        # 트렌드 점수 기준으로 정렬
-        all_videos.sort(key=lambda x: x['trend_score'], reverse=True)
+        # 지역 × 카테고리 차트 요청을 한꺼번에 발행 (카테고리별로 50개씩)
+        all_videos = self._fetch_charts(
+            [(region_code, category_id) for region_code in region_codes for category_id in self.MAIN_CATEGORIES],
+            max_results=50
+        )
         
-        print(f"\n🎉 전체 수집 완료: {len(all_videos)}개 영상")
+        print(f"\n🎉 전체 수집 완료: {len(all_videos)}개 영상 "
+              f"({self.last_fetch_stats['requests']}개 요청, {self.last_fetch_stats['wall_time']:.1f}초)")
         
         # 카테고리별 통계 출력
         from collections import Counter
@@ -689,6 +739,86 @@ class YouTubeAPIService:
         return all_videos
 
 
+    def _fetch_charts(
+        self,
+        jobs: List[Tuple[str, Optional[str]]],
+        max_results: int = 50
+    ) -> List[Dict]:
+        """
+        (지역 코드, 카테고리 ID) 차트 요청들을 스레드 풀로 동시에 보내고 병합
+        
+        응답이 오는 대로 video_id 기준으로 중복을 제거하며, 같은 영상이 여러 요청에
+        나오면 jobs 순서상 앞선 요청의 결과를 남긴다 (순차 수집과 같은 결과).
+        jobs는 가치가 높은 순서로 넘기며, 할당량이 모자라면 앞에서부터 가능한 만큼만 보낸다.
+        
+        Args:
+            jobs: (region_code, category_id) 리스트 (category_id가 None이면 전체 차트)
+            max_results: 요청당 최대 결과 수
+        
+        Returns:
+            트렌드 점수 내림차순 영상 리스트
+        """
+        started = time.time()
+        requested = len(jobs)
+        affordable = self.quota.affordable_calls('videos.list', priority='high')
+        if affordable < len(jobs):
+            print(f"⚠️ 할당량 부족: 차트 요청 {len(jobs)}개 중 우선순위 상위 {affordable}개만 수집")
+            jobs = jobs[:affordable]
+        
+        # video_id → ((요청 순서, 응답 내 순서), 영상)
+        best: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+        call_time = 0.0
+        
+        def fetch(region_code: str, category_id: Optional[str]) -> Tuple[List[Dict], float]:
+            call_started = time.time()
+            videos = self.get_trending_videos(
+                region_code=region_code,
+                max_results=max_results,
+                category_id=category_id
+            )
+            return videos, time.time() - call_started
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(len(jobs), 1))) as executor:
+            futures = {
+                executor.submit(fetch, region_code, category_id): rank
+                for rank, (region_code, category_id) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                rank = futures[future]
+                region_code, category_id = jobs[rank]
+                videos, elapsed = future.result()
+                call_time += elapsed
+                
+                new_videos = 0
+                for index, video in enumerate(videos):
+                    order = (rank, index)
+                    current = best.get(video['video_id'])
+                    if current is None:
+                        new_videos += 1
+                    if current is None or order < current[0]:
+                        best[video['video_id']] = (order, video)
+                
+                label = self.MAIN_CATEGORIES.get(category_id, '전체') if category_id else '전체'
+                print(f"✅ [{region_code}/{label}]: {len(videos)}개 중 {new_videos}개 신규 ({elapsed:.2f}초)")
+        
+        # 순차 수집과 같은 순서로 만든 뒤 트렌드 점수 기준으로 정렬
+        all_videos = [video for _, video in sorted(best.values(), key=lambda entry: entry[0])]
+        all_videos.sort(key=lambda x: x['trend_score'], reverse=True)
+        
+        wall_time = time.time() - started
+        self.last_fetch_stats = {
+            'requests': len(jobs),
+            'skipped_for_quota': requested - len(jobs),
+            'max_in_flight': self.max_workers,
+            'wall_time': round(wall_time, 3),
+            'total_call_time': round(call_time, 3),
+            'videos': len(all_videos)
+        }
+        print(f"⏱️ 차트 요청 {len(jobs)}개 완료: {wall_time:.2f}초 "
+              f"(순차 호출 합계 {call_time:.2f}초, 동시 {self.max_workers}개)")
+        return all_videos
+
+
 # 사용 예시
 if __name__ == "__main__":
     # 환경 변수에서 API 키 로드
@@ -42,7 +42,7 @@ function App() {
   });
   const [videoResponse, setVideoResponse] = useState<TrendingVideosResponse | null>(null);
   const [hasMore, setHasMore] = useState(true);
-  const [currentPage, setCurrentPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [selectedCategory, setSelectedCategory] = useState<string>('');
   const [categoryKeywords, setCategoryKeywords] = useState<CategoryKeywordsResponse | null>(null);
@@ -109,7 +109,7 @@ function App() {
 
     window.addEventListener('scroll', handleScroll);
     return () => window.removeEventListener('scroll', handleScroll);
-  }, [hasMore, isLoadingMore]);
+  }, [hasMore, isLoadingMore, nextCursor]);
 
   const loadTrendingVideos = async (reset = true, forceRefresh = false, overrideVideoType?: string) => {
     // overrideVideoType이 제공되면 사용, 아니면 현재 state 사용
@@ -132,7 +132,7 @@ function App() {
     
     if (reset) {
       setIsLoading(true);
-      setCurrentPage(1);
+      setNextCursor(null);
       setHasMore(true);
     } else {
       setIsLoadingMore(true);
@@ -141,11 +141,12 @@ function App() {
     try {
       const pageSize = 20;
       
-      // 백엔드 API 호출 (YouTube Data API v3)
+      // 백엔드 API 호출 (YouTube Data API v3) - 다음 페이지는 커서로 이어 받음
       const response = await getYoutubeTrending(
-        reset ? pageSize : (currentPage * pageSize),
+        pageSize,
         activeFilters,
-        forceRefresh
+        forceRefresh,
+        reset ? undefined : (nextCursor || undefined)
       );
       
       console.log('📋 API 응답:', { 
@@ -164,16 +165,14 @@ function App() {
         setKeywordAnalysis(analysis);
         
         // 더 로드할 데이터 확인
-        setHasMore(response.count >= pageSize && response.count < (response.total_count || 0));
-        setCurrentPage(2);
+        setHasMore(Boolean(response.next_cursor));
+        setNextCursor(response.next_cursor || null);
       } else {
         // 무한 스크롤: 기존 데이터에 추가
-        const startIndex = (currentPage - 1) * pageSize;
-        const newVideos = response.trending_videos.slice(startIndex);
-        setTrendingVideos(prev => [...prev, ...newVideos]);
+        setTrendingVideos(prev => [...prev, ...response.trending_videos]);
         
-        setHasMore(newVideos.length >= pageSize && startIndex + pageSize < (response.total_count || 0));
-        setCurrentPage(prev => prev + 1);
+        setHasMore(Boolean(response.next_cursor));
+        setNextCursor(response.next_cursor || null);
       }
       
     } catch (error) {
@@ -235,6 +235,7 @@ export interface TrendingVideosResponse {
   };
   last_updated: string;
   source: string;
+  next_cursor?: string | null;  // 다음 페이지 커서 (마지막 페이지면 null)
 }
 
 export async function getYoutubeTrending(
@@ -248,7 +249,8 @@ export async function getYoutubeTrending(
     video_type?: string;
     time_filter?: string;
   },
-  forceRefresh: boolean = false
+  forceRefresh: boolean = false,
+  cursor?: string
 ): Promise<TrendingVideosResponse> {
   // forceRefresh가 true면 GitHub Actions 트리거
   if (forceRefresh && import.meta.env.PROD) {
@@ -279,7 +281,8 @@ export async function getYoutubeTrending(
       ...(filters?.language && { language: filters.language }),
       ...(filters?.sort_by && { sort_by: filters.sort_by }),
       ...(filters?.video_type && { video_type: filters.video_type }),
-      ...(forceRefresh && { force_refresh: 'true' })
+      ...(forceRefresh && { force_refresh: 'true' }),
+      ...(cursor && { cursor })
     });
     
     console.log(`🔍 API 호출: ${API_BASE_URL}/api/youtube/trending?${params}`);